@@ -0,0 +1,52 @@
+# batch.py
+"""
+Análise em lote do WebContext Analyzer.
+Execute com: python batch.py urls.txt --workers 4
+             cat urls.txt | python batch.py - --workers 4
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.analyzer.batch import read_urls, run_batch
+from src.analyzer.scraper import SCROLL_QUIET_MS, SCROLL_MAX_WAIT
+from src.analyzer.storage import STORAGE_FORMATS
+from src.analyzer.screenshot import SCREENSHOT_MODES
+
+def main():
+    parser = argparse.ArgumentParser(description="Analisa várias URLs em paralelo.")
+    parser.add_argument("urls", nargs="?", default="-", help="Arquivo com uma URL por linha ('-' para stdin)")
+    parser.add_argument("--workers", type=int, default=None, help="Número de Chromes em paralelo (padrão: núcleos da CPU)")
+    parser.add_argument("--manifest", type=str, default=None, help="Caminho do manifesto de resumo")
+    parser.add_argument("--per-element", action="store_true", help="Usa a extração por elemento (mais lenta)")
+    parser.add_argument("--scroll-quiet-ms", type=int, default=SCROLL_QUIET_MS)
+    parser.add_argument("--scroll-max-wait", type=float, default=SCROLL_MAX_WAIT)
+    parser.add_argument("--format", choices=STORAGE_FORMATS, default=None, help="Formato da estrutura: json, parquet, both ou ndjson")
+    parser.add_argument("--screenshot", choices=SCREENSHOT_MODES, default=None, help="Screenshot da página inteira (full) ou só da janela (viewport)")
+    parser.add_argument("--incremental", action="store_true", default=None, help="Compara com a última análise de cada URL e grava só o que mudou")
+    args = parser.parse_args()
+
+    urls = read_urls(args.urls)
+    if not urls:
+        print("Nenhuma URL informada.")
+        sys.exit(1)
+
+    manifest, manifest_path = run_batch(
+        urls,
+        workers=args.workers,
+        manifest_path=args.manifest,
+        batch=not args.per_element,
+        scroll_quiet_ms=args.scroll_quiet_ms,
+        scroll_max_wait=args.scroll_max_wait,
+        storage_format=args.format,
+        screenshot_mode=args.screenshot,
+        incremental=args.incremental,
+    )
+    print(f"✅ {manifest['succeeded']}/{manifest['total']} URLs analisadas em {manifest['elapsed_ms'] / 1000:.1f}s")
+    print(f"📄 Manifesto: {manifest_path}")
+    sys.exit(0 if manifest["failed"] == 0 else 2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# crawl.py
+"""
+Crawler de mesma origem do WebContext Analyzer.
+Execute com: python crawl.py "https://icaro.eslcloud.com.br/" --depth 2 --max-pages 50
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.analyzer.crawler import Crawler, cookie_session_loader, stored_session_loader
+
+def main():
+    parser = argparse.ArgumentParser(description="Mapeia as páginas de mesma origem a partir de uma URL.")
+    parser.add_argument("url", help="URL semente")
+    parser.add_argument("--depth", type=int, default=2, help="Profundidade máxima de links")
+    parser.add_argument("--max-pages", type=int, default=50, help="Número máximo de páginas analisadas")
+    parser.add_argument("--workers", type=int, default=None, help="Navegadores em paralelo")
+    parser.add_argument("--cookies", type=str, default=None, help="JSON com cookies de uma sessão autenticada")
+    parser.add_argument("--session", type=str, default=None, help="Conta (email) cuja sessão salva será reutilizada")
+    parser.add_argument("--per-element", action="store_true", help="Usa a extração por elemento (mais lenta)")
+    args = parser.parse_args()
+
+    prepare = None
+    if args.session:
+        prepare = stored_session_loader(args.session)
+    elif args.cookies:
+        prepare = cookie_session_loader(args.cookies)
+    crawler = Crawler(
+        args.url,
+        max_depth=args.depth,
+        max_pages=args.max_pages,
+        workers=args.workers,
+        prepare_driver=prepare,
+        batch=not args.per_element,
+    )
+    index, index_path = crawler.run()
+    ok = sum(1 for p in index["pages"] if p["status"] == "ok")
+    print(f"✅ {ok}/{len(index['pages'])} páginas analisadas em {index['elapsed_ms'] / 1000:.1f}s")
+    print(f"📄 Índice: {index_path}")
+
+if __name__ == "__main__":
+    main()
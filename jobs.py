@@ -0,0 +1,55 @@
+# jobs.py
+"""
+Análises pelo motor de jobs assíncrono do WebContext Analyzer.
+A captura (navegador) de uma URL se sobrepõe ao processamento (PNG, anotação, HTML) da anterior.
+Execute com: python jobs.py https://site1.com https://site2.com --browsers 2 --workers 2
+             python jobs.py --file urls.txt
+"""
+
+import argparse
+import json
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.analyzer.batch import read_urls
+from src.analyzer.jobs import run_jobs
+from src.analyzer.storage import STORAGE_FORMATS
+from src.analyzer.screenshot import SCREENSHOT_MODES
+
+STAGE_COLUMNS = ("queued_ms", "capture_ms", "handoff_ms", "process_ms", "total_ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Analisa URLs com captura e processamento sobrepostos.")
+    parser.add_argument("urls", nargs="*", help="URLs a analisar")
+    parser.add_argument("--file", type=str, default=None, help="Arquivo com uma URL por linha ('-' para stdin)")
+    parser.add_argument("--browsers", type=int, default=None, help="Navegadores em paralelo (padrão: BROWSER_POOL_SIZE)")
+    parser.add_argument("--workers", type=int, default=None, help="Threads de processamento (PNG, anotação, HTML)")
+    parser.add_argument("--format", choices=STORAGE_FORMATS, default=None, help="Formato da estrutura: json, parquet, both ou ndjson")
+    parser.add_argument("--screenshot", choices=SCREENSHOT_MODES, default=None, help="Screenshot da página inteira (full) ou só da janela (viewport)")
+    parser.add_argument("--incremental", action="store_true", default=None, help="Compara com a última análise de cada URL e grava só o que mudou")
+    parser.add_argument("--json", type=str, default=None, help="Grava os resumos dos jobs neste arquivo")
+    args = parser.parse_args()
+
+    urls = list(args.urls) + (read_urls(args.file) if args.file else [])
+    if not urls:
+        print("Nenhuma URL informada.")
+        sys.exit(1)
+
+    summaries, elapsed_ms = run_jobs(urls, browsers=args.browsers, workers=args.workers,
+                                     storage_format=args.format, screenshot_mode=args.screenshot,
+                                     incremental=args.incremental)
+    print("job  status  " + "  ".join(c.ljust(10) for c in STAGE_COLUMNS) + "  url")
+    for s in summaries:
+        stages = "  ".join(str(s["timings"].get(c, "-")).ljust(10) for c in STAGE_COLUMNS)
+        print(f"{s['id']:<4} {s['status']:<7} {stages}  {s['url']}" + (f"  ({s['error']})" if s["error"] else ""))
+    done = sum(1 for s in summaries if s["status"] == "done")
+    print(f"✅ {done}/{len(summaries)} análises em {elapsed_ms / 1000:.1f}s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"elapsed_ms": elapsed_ms, "jobs": summaries}, f, ensure_ascii=False, indent=2)
+        print(f"📄 Resumos: {args.json}")
+    sys.exit(0 if done == len(summaries) else 2)
+
+if __name__ == "__main__":
+    main()
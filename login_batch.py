@@ -0,0 +1,45 @@
+# login_batch.py
+"""
+Login em lote do WebContext Analyzer: verifica o login de várias contas, sem interação.
+O CSV tem as colunas email,password e, opcionalmente, domain (ou url).
+Execute com: python login_batch.py contas.csv --workers 4 --per-domain 2
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.automation.login_runner import read_credentials, run_logins
+
+def print_table(results):
+    columns = ("email", "domain", "status", "method", "signal", "login_ms", "error")
+    rows = [[str(r.get(c) if r.get(c) is not None else "-") for c in columns] for r in results]
+    widths = [min(40, max([len(c)] + [len(row[i]) for row in rows])) for i, c in enumerate(columns)]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(v[:w].ljust(w) for v, w in zip(row, widths)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Faz o login adaptativo de várias contas em paralelo.")
+    parser.add_argument("credentials", help="CSV com email,password[,domain]")
+    parser.add_argument("--workers", type=int, default=None, help="Navegadores em paralelo (padrão: BROWSER_POOL_SIZE)")
+    parser.add_argument("--per-domain", type=int, default=None, help="Logins simultâneos no mesmo domínio")
+    parser.add_argument("--no-sessions", action="store_true", help="Ignora as sessões salvas e faz o login completo")
+    parser.add_argument("--show", action="store_true", help="Mostra os navegadores (padrão: headless)")
+    args = parser.parse_args()
+
+    accounts = read_credentials(args.credentials)
+    if not accounts:
+        print("Nenhuma conta informada.")
+        sys.exit(1)
+
+    summary, out_dir = run_logins(accounts, workers=args.workers, per_domain=args.per_domain,
+                                  headless=not args.show, use_sessions=not args.no_sessions)
+    print_table(summary["results"])
+    print(f"✅ {summary['succeeded']}/{summary['total']} logins em {summary['elapsed_ms'] / 1000:.1f}s")
+    print(f"📄 Resultados: {summary['csv']}")
+    sys.exit(0 if summary["failed"] == 0 else 2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# prune.py
+"""
+Limpeza das análises antigas do WebContext Analyzer (e dos blobs órfãos).
+Execute com: python prune.py --keep 5
+             python prune.py --older-than 30 --dry-run
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.analyzer.retention import prune_analyses
+
+def main():
+    parser = argparse.ArgumentParser(description="Apaga análises antigas e recolhe os artefatos sem uso.")
+    parser.add_argument("--keep", type=int, default=None, help="Análises mantidas por URL (as mais recentes)")
+    parser.add_argument("--older-than", type=float, default=None, help="Apaga análises com mais de N dias")
+    parser.add_argument("--domain", type=str, default=None, help="Limita a limpeza a um domínio")
+    parser.add_argument("--dry-run", action="store_true", help="Só lista o que seria apagado")
+    args = parser.parse_args()
+
+    if args.keep is None and args.older_than is None:
+        parser.error("informe --keep e/ou --older-than")
+
+    summary = prune_analyses(keep=args.keep, older_than_days=args.older_than,
+                             domain=args.domain, dry_run=args.dry_run)
+    for path in summary["paths"]:
+        print(f"{'[dry-run] ' if args.dry_run else ''}removida: {path}")
+    print(f"✅ {summary['removed']} análises removidas, {summary['kept']} mantidas; "
+          f"{summary['blobs_removed']} blobs apagados ({summary['bytes_freed'] / 1024 / 1024:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# scripts/bench_bounding_boxes.py
+"""
+Benchmark do desenho de caixas: annotate_legacy (original) x annotate (vetorizado).
+Execute com: python scripts/bench_bounding_boxes.py --elements 5000 --height 8000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src.analyzer.renderer import annotate, annotate_legacy
+
+TAGS = ["div", "span", "a", "input", "button", "td", "tr", "li", "label", "img", "p", "h3"]
+
+def synthetic_page(n_elements, width, height, seed=42):
+    """Screenshot de página inteira com ruído e n elementos em posições aleatórias."""
+    rng = random.Random(seed)
+    img = np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    structure = []
+    for i in range(n_elements):
+        w = rng.choice([rng.uniform(10, 120), rng.uniform(100, width)])
+        h = rng.uniform(8, 60)
+        structure.append({
+            "index": i,
+            "tag": rng.choice(TAGS),
+            "x": round(rng.uniform(-5, width - 5), 2),
+            "y": round(rng.uniform(0, height), 2),
+            "width": round(w, 2),
+            "height": round(h, 2),
+        })
+    structure.sort(key=lambda el: (el["y"], el["x"]))
+    return img, structure
+
+def best_of(fn, img, structure, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        work = img.copy()
+        started = time.perf_counter()
+        result = fn(work, structure)
+        times.append(time.perf_counter() - started)
+    return min(times) * 1000, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--elements", type=int, default=5000)
+    parser.add_argument("--width", type=int, default=1200)
+    parser.add_argument("--height", type=int, default=8000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    img, structure = synthetic_page(args.elements, args.width, args.height)
+    legacy_ms, legacy = best_of(annotate_legacy, img, structure, args.repeat)
+    fast_ms, fast = best_of(annotate, img, structure, args.repeat)
+
+    diff = np.abs(legacy.astype(np.int16) - fast.astype(np.int16))
+    print(f"Página sintética: {args.width}x{args.height}, {args.elements} elementos")
+    print(f"annotate_legacy: {legacy_ms:8.1f} ms")
+    print(f"annotate:        {fast_ms:8.1f} ms  ({legacy_ms / fast_ms:.1f}x)")
+    print(f"Pixels diferentes: {np.count_nonzero(diff.any(axis=2))} (diferença máxima {diff.max()})")
+
+if __name__ == "__main__":
+    main()
@@ -29,7 +29,7 @@ if %errorlevel% neq 0 (
 :: Ativa o ambiente virtual e instala as dependências
 echo ✅ Instalando dependências...
 call venv\Scripts\activate.bat
-pip install selenium webdriver-manager opencv-python pandas openpyxl python-dotenv fpdf2
+pip install selenium webdriver-manager opencv-python pandas pyarrow openpyxl python-dotenv fpdf2
 if %errorlevel% neq 0 (
     echo ❌ Falha ao instalar as dependências.
     pause
@@ -0,0 +1,115 @@
+# src/analyzer/batch.py
+"""Análise em lote: distribui uma lista de URLs entre vários Chromes em processos."""
+import atexit
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from selenium.common.exceptions import WebDriverException
+from src.core.config import Config
+from src.core.logger import logger
+from src.automation.browser_manager import create_driver
+from src.analyzer.scraper import analyze_url, make_output_dir
+
+# Driver do processo trabalhador (um Chrome por processo)
+_driver = None
+_options = {}
+
+def read_urls(source):
+    """Lê URLs de um arquivo (ou stdin com '-'), ignorando linhas vazias e comentários."""
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    urls = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            urls.append(line)
+    return urls
+
+def _quit_driver():
+    global _driver
+    if _driver is not None:
+        try:
+            _driver.quit()
+        except Exception:
+            pass
+        _driver = None
+
+def _init_worker(options):
+    """Inicializa o processo trabalhador; o Chrome é aberto no primeiro uso."""
+    global _options
+    _options = options
+    atexit.register(_quit_driver)
+
+def _analyze_task(url):
+    global _driver
+    started = time.perf_counter()
+    result = {"url": url, "status": "error", "output_dir": None, "elements": 0, "timings": {}, "error": None}
+    try:
+        if _driver is None:
+            _driver = create_driver(headless=True)
+        output_dir = make_output_dir(url)
+        result["output_dir"] = output_dir
+        summary = analyze_url(_driver, url, output_dir, **_options)
+        result.update(status="ok", title=summary["title"], elements=summary["elements"],
+                      change=summary["change"], timings=summary["timings"])
+    except WebDriverException as e:
+        # Chrome travou: descarta para que a próxima URL abra um novo
+        result["error"] = str(e).split("\n")[0]
+        _quit_driver()
+    except Exception as e:
+        result["error"] = str(e).split("\n")[0]
+    result["wall_ms"] = round((time.perf_counter() - started) * 1000)
+    result["worker_pid"] = os.getpid()
+    return result
+
+def run_batch(urls, workers=None, manifest_path=None, batch=True, **analyze_options):
+    """Analisa as URLs em paralelo e grava um manifesto com o resultado de cada uma.
+
+    analyze_options são repassados para analyze_url (rolagem, formato de armazenamento).
+    """
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(workers or cpu_count, cpu_count, len(urls) or 1))
+    options = dict(analyze_options, batch=batch)
+    started_at = datetime.now()
+    started = time.perf_counter()
+    logger.info(f"Lote iniciado: {len(urls)} URLs em {workers} processos")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(options,)) as executor:
+        futures = {executor.submit(_analyze_task, url): url for url in urls}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # Processo trabalhador morreu
+                result = {"url": futures[future], "status": "error", "output_dir": None,
+                          "elements": 0, "timings": {}, "error": str(e)}
+            results.append(result)
+            status = "OK" if result["status"] == "ok" else f"ERRO: {result['error']}"
+            logger.info(f"[{len(results)}/{len(urls)}] {result['url']} - {status}")
+
+    order = {url: i for i, url in enumerate(urls)}
+    results.sort(key=lambda r: order.get(r["url"], 0))
+    manifest = {
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "workers": workers,
+        "total": len(urls),
+        "succeeded": sum(1 for r in results if r["status"] == "ok"),
+        "failed": sum(1 for r in results if r["status"] != "ok"),
+        "unchanged": sum(1 for r in results if r.get("change") == "unchanged"),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000),
+        "results": results,
+    }
+    if manifest_path is None:
+        manifest_path = Config.ANALYSES_DIR / f"batch_{started_at.strftime('%Y-%m-%d_%H-%M-%S')}.json"
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    logger.info(f"Manifesto do lote salvo em: {manifest_path}")
+    return manifest, manifest_path
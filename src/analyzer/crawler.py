@@ -0,0 +1,174 @@
+# src/analyzer/crawler.py
+"""Crawler de mesma origem: analisa a página inicial e segue os hrefs coletados."""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from urllib.parse import urlparse, urlunparse, urljoin, parse_qsl, urlencode
+from src.core.config import Config
+from src.core.logger import logger
+from src.automation.browser_manager import BrowserPool
+from src.automation.session_store import SessionStore, COOKIE_FIELDS
+from src.analyzer.scraper import analyze_url, make_output_dir
+from src.analyzer.storage import load_structure
+
+# Extensões que não são páginas HTML
+SKIPPED_EXTENSIONS = (
+    ".pdf", ".zip", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".css", ".js",
+    ".xls", ".xlsx", ".csv", ".doc", ".docx", ".xml", ".json", ".mp4", ".mp3",
+)
+
+# Links que encerrariam a sessão autenticada
+LOGOUT_KEYWORDS = ("logout", "sign_out", "signout", "sair")
+
+def normalize_url(url, base=None):
+    """Normaliza a URL para deduplicação (sem fragmento, host minúsculo, query ordenada)."""
+    if base:
+        url = urljoin(base, url)
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https"):
+        return None
+    netloc = parsed.netloc.lower()
+    if (parsed.scheme == "http" and netloc.endswith(":80")) or (parsed.scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    path = parsed.path or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((parsed.scheme, netloc, path, "", query, ""))
+
+def origin_of(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+def extract_links(structure, page_url, origin):
+    """Hrefs de mesma origem da estrutura analisada, normalizados e na ordem da página."""
+    links = []
+    for el in structure:
+        href = el.get("attributes", {}).get("href")
+        if not href or href.startswith(("javascript:", "mailto:", "tel:", "#")):
+            continue
+        url = normalize_url(href, base=page_url)
+        if not url or origin_of(url) != origin:
+            continue
+        path = urlparse(url).path.lower()
+        if path.endswith(SKIPPED_EXTENSIONS) or any(kw in path for kw in LOGOUT_KEYWORDS):
+            continue
+        links.append(url)
+    return links
+
+class Crawler:
+    """Percorre uma aplicação a partir de uma URL semente, em largura.
+
+    `prepare_driver(driver, url)` é chamado a cada navegador emprestado antes
+    da análise; use-o para restaurar uma sessão autenticada.
+    """
+    def __init__(self, seed_url, max_depth=2, max_pages=50, workers=None, prepare_driver=None, batch=True):
+        self.seed_url = normalize_url(seed_url)
+        self.origin = origin_of(self.seed_url)
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.workers = workers or Config.BROWSER_POOL_SIZE
+        self.prepare_driver = prepare_driver
+        self.batch = batch
+        self._seen = {self.seed_url}
+        self._lock = threading.Lock()
+        self.pages = []
+
+    def _analyze(self, pool, url, depth):
+        started = time.perf_counter()
+        page = {"url": url, "depth": depth, "status": "error", "output_dir": None,
+                "elements": 0, "links": [], "error": None}
+        try:
+            with pool.browser() as driver:
+                if self.prepare_driver:
+                    self.prepare_driver(driver, url)
+                output_dir = make_output_dir(url)
+                page["output_dir"] = output_dir
+                summary = analyze_url(driver, url, output_dir, batch=self.batch)
+                final_url = normalize_url(driver.current_url) or url
+            structure = load_structure(output_dir)
+            page.update(status="ok", title=summary["title"], elements=summary["elements"],
+                        timings=summary["timings"], final_url=final_url,
+                        links=extract_links(structure, final_url, self.origin))
+        except Exception as e:
+            page["error"] = str(e).split("\n")[0]
+        page["wall_ms"] = round((time.perf_counter() - started) * 1000)
+        return page
+
+    def _enqueue(self, links, depth, frontier):
+        with self._lock:
+            for link in links:
+                if link in self._seen or len(self._seen) >= self.max_pages:
+                    continue
+                self._seen.add(link)
+                frontier.append((link, depth))
+
+    def run(self, index_path=None):
+        """Executa o crawl e grava o índice do crawl; retorna (índice, caminho)."""
+        started_at = datetime.now()
+        started = time.perf_counter()
+        logger.info(f"Crawl iniciado em {self.seed_url} (profundidade {self.max_depth}, até {self.max_pages} páginas)")
+
+        frontier = [(self.seed_url, 0)]
+        with BrowserPool(size=self.workers) as pool, ThreadPoolExecutor(max_workers=self.workers) as executor:
+            running = {}
+            while frontier or running:
+                while frontier and len(running) < self.workers:
+                    url, depth = frontier.pop(0)
+                    running[executor.submit(self._analyze, pool, url, depth)] = depth
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    depth = running.pop(future)
+                    page = future.result()
+                    self.pages.append(page)
+                    status = "OK" if page["status"] == "ok" else f"ERRO: {page['error']}"
+                    logger.info(f"[{len(self.pages)}/{self.max_pages}] (d={depth}) {page['url']} - {status}")
+                    if page["status"] == "ok" and depth < self.max_depth:
+                        self._enqueue(page["links"], depth + 1, frontier)
+
+        index = {
+            "seed_url": self.seed_url,
+            "origin": self.origin,
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "max_depth": self.max_depth,
+            "max_pages": self.max_pages,
+            "workers": self.workers,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000),
+            "pages": self.pages,
+        }
+        if index_path is None:
+            domain = urlparse(self.seed_url).netloc.replace("www.", "")
+            domain_dir = Config.ANALYSES_DIR / domain
+            domain_dir.mkdir(parents=True, exist_ok=True)
+            index_path = domain_dir / f"crawl_{started_at.strftime('%Y-%m-%d_%H-%M-%S')}.json"
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        logger.info(f"Índice do crawl salvo em: {index_path}")
+        return index, index_path
+
+def cookie_session_loader(cookies_path):
+    """prepare_driver que injeta cookies salvos (lista de dicts do Selenium) antes da análise."""
+    with open(cookies_path, "r", encoding="utf-8") as f:
+        cookies = json.load(f)
+
+    def prepare(driver, url):
+        driver.get(origin_of(url) + "/favicon.ico")
+        for cookie in cookies:
+            cookie = {k: v for k, v in cookie.items() if k in COOKIE_FIELDS}
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logger.warning(f"Cookie ignorado ({cookie.get('name')}): {e}")
+    return prepare
+
+def stored_session_loader(account, store=None):
+    """prepare_driver que restaura a sessão salva pelo login adaptativo (SessionStore)."""
+    store = store or SessionStore()
+
+    def prepare(driver, url):
+        if not store.restore(driver, url, account, validate=False):
+            logger.warning(f"Nenhuma sessão salva utilizável para {account}; seguindo sem login.")
+    return prepare
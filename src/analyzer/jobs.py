@@ -0,0 +1,171 @@
+# src/analyzer/jobs.py
+"""Motor de jobs assíncrono (asyncio) sobre o pipeline do Selenium.
+
+Cada análise passa por duas etapas: captura (usa o navegador: carrega a
+página, extrai a estrutura, tira o screenshot) e processamento (PNG,
+anotação, visualizador, gravação da estrutura). As chamadas bloqueantes
+rodam em executores limitados, então o processamento do job N acontece
+enquanto o navegador já carrega a página do job N+1.
+"""
+import asyncio
+import itertools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from selenium.common.exceptions import WebDriverException
+from src.core.config import Config
+from src.core.logger import logger
+from src.automation.browser_manager import BrowserPool
+from src.analyzer.scraper import capture_page, discard_capture, finish_analysis, make_output_dir
+
+JOB_STATES = ("queued", "capturing", "processing", "done", "error")
+
+def _ms(started):
+    return round((time.perf_counter() - started) * 1000)
+
+class Job:
+    """Uma análise submetida ao JobEngine; `future` termina com o resumo do analyze_url."""
+    _ids = itertools.count(1)
+
+    def __init__(self, url, options):
+        self.id = next(Job._ids)
+        self.url = url
+        self.options = options
+        self.status = "queued"
+        self.output_dir = None
+        self.result = None
+        self.error = None
+        self.future = None
+        # queued_ms, capture_ms, handoff_ms, process_ms, total_ms
+        self.timings = {}
+        self._submitted = time.perf_counter()
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "url": self.url,
+            "status": self.status,
+            "output_dir": self.output_dir,
+            "elements": self.result["elements"] if self.result else 0,
+            "change": self.result["change"] if self.result else None,
+            "timings": dict(self.timings),
+            "stages": self.result["timings"] if self.result else {},
+            "error": self.error,
+        }
+
+class JobEngine:
+    """Executa jobs de análise em paralelo com limites de navegadores e de CPU.
+
+    Uso:
+        async with JobEngine(browsers=2, workers=2) as engine:
+            jobs = [engine.submit(url) for url in urls]
+            await engine.wait()
+
+    browsers = navegadores (e threads de captura); workers = threads de
+    processamento; max_pending limita os jobs em andamento (capturas
+    esperando processamento ocupam disco e memória).
+    """
+    def __init__(self, browsers=None, workers=None, max_pending=None, headless=True, pool=None, **analyze_options):
+        self.browsers = max(1, browsers or Config.BROWSER_POOL_SIZE)
+        self.workers = max(1, workers or min(4, os.cpu_count() or 1))
+        self.max_pending = max(self.browsers, max_pending or self.browsers + 2 * self.workers)
+        self.headless = headless
+        self.analyze_options = analyze_options
+        self.jobs = []
+        self._pool = pool
+        self._own_pool = pool is None
+        self._loop = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+        return False
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        if self._pool is None:
+            self._pool = BrowserPool(size=self.browsers, headless=self.headless, prelaunch=False)
+        self._browser_executor = ThreadPoolExecutor(self.browsers, thread_name_prefix="wca-browser")
+        self._process_executor = ThreadPoolExecutor(self.workers, thread_name_prefix="wca-process")
+        self._browser_slots = asyncio.Semaphore(self.browsers)
+        self._in_flight = asyncio.Semaphore(self.max_pending)
+
+    def submit(self, url, **options):
+        """Enfileira a análise de url (opções do analyze_url sobrepõem as do motor)."""
+        if self._loop is None:
+            raise RuntimeError("JobEngine não iniciado (use 'async with JobEngine()').")
+        job = Job(url, dict(self.analyze_options, **options))
+        job.future = self._loop.create_task(self._run(job))
+        self.jobs.append(job)
+        return job
+
+    async def wait(self):
+        """Espera todos os jobs submetidos; retorna os resumos na ordem de submissão."""
+        await asyncio.gather(*(job.future for job in self.jobs), return_exceptions=True)
+        return [job.summary() for job in self.jobs]
+
+    async def close(self):
+        await self.wait()
+        self._browser_executor.shutdown()
+        self._process_executor.shutdown()
+        if self._own_pool:
+            self._pool.close()
+
+    def _capture(self, job):
+        driver = self._pool.acquire()
+        broken = False
+        try:
+            job.output_dir = make_output_dir(job.url)
+            return capture_page(driver, job.url, job.output_dir, **job.options)
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self._pool.release(driver, broken=broken)
+
+    def _process(self, job, capture, captured_at):
+        job.timings["handoff_ms"] = _ms(captured_at)
+        started = time.perf_counter()
+        try:
+            return finish_analysis(capture)
+        finally:
+            discard_capture(capture)
+            job.timings["process_ms"] = _ms(started)
+
+    async def _run(self, job):
+        loop = self._loop
+        async with self._in_flight:
+            try:
+                async with self._browser_slots:
+                    job.timings["queued_ms"] = _ms(job._submitted)
+                    job.status = "capturing"
+                    started = time.perf_counter()
+                    capture = await loop.run_in_executor(self._browser_executor, self._capture, job)
+                    job.timings["capture_ms"] = _ms(started)
+                # Navegador livre: o próximo job já começa a carregar enquanto este é processado
+                job.status = "processing"
+                job.result = await loop.run_in_executor(self._process_executor, self._process,
+                                                        job, capture, time.perf_counter())
+                job.status = "done"
+            except Exception as e:
+                job.status = "error"
+                job.error = str(e).split("\n")[0]
+            job.timings["total_ms"] = _ms(job._submitted)
+        status = "OK" if job.status == "done" else f"ERRO: {job.error}"
+        logger.info(f"Job {job.id} {job.url} - {status} {job.timings}")
+        return job.result
+
+def run_jobs(urls, browsers=None, workers=None, headless=True, **analyze_options):
+    """Versão síncrona: analisa as URLs pelo JobEngine e retorna (resumos, tempo total em ms)."""
+    async def main():
+        async with JobEngine(browsers=browsers, workers=workers, headless=headless, **analyze_options) as engine:
+            for url in urls:
+                engine.submit(url)
+            return await engine.wait()
+
+    started = time.perf_counter()
+    summaries = asyncio.run(main())
+    return summaries, _ms(started)
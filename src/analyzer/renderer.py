@@ -0,0 +1,247 @@
+# src/analyzer/renderer.py
+"""Desenho das caixas e rótulos dos elementos sobre o screenshot."""
+import cv2
+import numpy as np
+
+BOX_COLOR = (100, 100, 255)
+LABEL_ALPHA = 0.6
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+FONT_SCALE = 0.5
+# Folga (px) acima/abaixo da caixa que o rótulo pode ocupar
+LABEL_MARGIN = 32
+# Folga (px) da tela em que cada glifo é rasterizado
+GLYPH_PAD = 3
+# Acima desta fração da imagem em pixels de contorno, misturar faixas inteiras
+# (SIMD do OpenCV) sai mais barato que ler e gravar pixel a pixel
+DENSE_OUTLINE_FRACTION = 1 / 16
+# Linhas por faixa na mistura densa
+BLEND_BAND_ROWS = 256
+
+# Rótulo -> glifo rasterizado (ver _glyph)
+_glyph_cache = {}
+
+def annotate_legacy(img, structure):
+    """Implementação original: um cv2.rectangle e dois cv2.putText por elemento."""
+    overlay = img.copy()
+    for item in structure:
+        x, y, w, h = int(item['x']), int(item['y']), int(item['width']), int(item['height'])
+        cv2.rectangle(img, (x, y), (x + w, y + h), BOX_COLOR, 1)
+        label = f"{item['tag']}"
+        cv2.putText(overlay, label, (x + 2, y - 2), FONT, FONT_SCALE, (0, 0, 0), 2)
+        cv2.putText(overlay, label, (x + 2, y - 2), FONT, FONT_SCALE, (255, 255, 255), 1)
+    return cv2.addWeighted(overlay, LABEL_ALPHA, img, 1 - LABEL_ALPHA, 0)
+
+def _rasterize(label, shape, origin):
+    """putText do contorno preto e do texto branco numa tela shape; (linhas, colunas, white)."""
+    black = np.zeros(shape, np.uint8)
+    cv2.putText(black, label, origin, FONT, FONT_SCALE, 255, 2)
+    white = np.zeros(shape, np.uint8)
+    cv2.putText(white, label, origin, FONT, FONT_SCALE, 255, 1)
+    rows, cols = np.nonzero((black >= 128) | (white >= 128))
+    return rows.astype(np.int64), cols.astype(np.int64), white[rows, cols] >= 128
+
+def _glyph(label):
+    """Rasteriza o rótulo uma única vez (contorno preto + texto branco).
+
+    Retorna (dy, dx, white, extent) dos pixels tocados, relativos à origem do
+    putText; white indica os pixels que terminam brancos (os demais ficam
+    pretos; a fonte Hershey do OpenCV 4 não tem antialiasing com a linha
+    padrão). extent = (topo, base, esquerda, direita) da tela usada, com folga.
+    """
+    cached = _glyph_cache.get(label)
+    if cached is not None:
+        return cached
+    (tw, th), baseline = cv2.getTextSize(label, FONT, FONT_SCALE, 2)
+    extent = (-th - GLYPH_PAD, baseline + GLYPH_PAD, -GLYPH_PAD, tw + GLYPH_PAD)
+    rows, cols, white = _rasterize(label, (extent[1] - extent[0], extent[3] - extent[2]),
+                                   (-extent[2], -extent[0]))
+    glyph = (rows + extent[0], cols + extent[2], white, extent)
+    _glyph_cache[label] = glyph
+    return glyph
+
+def _clipped_glyph(label, oy, ox, first, last, width):
+    """Glifo de um rótulo que sai da imagem, rasterizado com o mesmo recorte do putText.
+
+    O OpenCV recorta as linhas na borda antes de rasterizar, então os pixels
+    junto à borda não são os do glifo em cache; a tela aqui termina nas bordas
+    reais da imagem (linhas first..last, colunas 0..width).
+    """
+    top, bottom, left, right = _glyph(label)[3]
+    r0, r1 = max(oy + top, first), min(oy + bottom, last)
+    c0, c1 = max(ox + left, 0), min(ox + right, width)
+    if r0 >= r1 or c0 >= c1:
+        empty = np.zeros(0, np.int64)
+        return empty, empty, np.zeros(0, bool)
+    rows, cols, white = _rasterize(label, (r1 - r0, c1 - c0), (ox - c0, oy - r0))
+    return rows + (r0 - oy), cols + (c0 - ox), white
+
+def _runs(starts, lengths, step):
+    """Concatena as sequências starts[i] + k * step, k < lengths[i]."""
+    # Posição j da saída pertence ao trecho i: starts[i] + (j - início_i) * step
+    begin = np.cumsum(lengths) - lengths
+    return np.repeat(starts - begin * step, lengths) + np.arange(int(lengths.sum()), dtype=np.int64) * step
+
+def _label_pixels(labels, boxes, height, width, rows):
+    """Pixels de texto de todos os rótulos na ordem dos elementos: (índice linear, white).
+
+    Cada elemento aponta para um glifo (o do rótulo, ou um recortado se o
+    rótulo sai da imagem) e a expansão é feita de uma vez com np.repeat. Um
+    pixel pode aparecer várias vezes; gravando na ordem, vale o do último
+    elemento, como no desenho sequencial original. rows = (primeira, última)
+    linha da imagem real em coordenadas de img (diferente de (0, height) em faixas).
+    """
+    first, last = rows
+    oy = boxes[:, 1] - 2
+    ox = boxes[:, 0] + 2
+    ids, glyphs = {}, []
+    gids = np.empty(len(labels), np.int64)
+    for i, label in enumerate(labels):
+        gid = ids.get(label)
+        if gid is None:
+            gid = ids[label] = len(glyphs)
+            glyphs.append(_glyph(label))
+        gids[i] = gid
+    extent = np.array([g[3] for g in glyphs], np.int64).reshape(-1, 4)[gids]
+    top, bottom = oy + extent[:, 0], oy + extent[:, 1]
+
+    keep = (bottom > 0) & (top < height)
+    clipped = keep & ((top < first) | (bottom > last) | (ox + extent[:, 2] < 0) | (ox + extent[:, 3] > width))
+    for i in np.flatnonzero(clipped):
+        gids[i] = len(glyphs)
+        glyphs.append(_clipped_glyph(labels[i], int(oy[i]), int(ox[i]), first, last, width))
+    members = np.flatnonzero(keep)
+    if not len(members):
+        return np.zeros(0, np.int64), np.zeros(0, bool)
+
+    sizes = np.array([len(g[0]) for g in glyphs], np.int64)
+    offsets = np.cumsum(sizes) - sizes
+    all_dy = np.concatenate([g[0] for g in glyphs])
+    # Deslocamento linear de cada pixel do glifo (a largura da imagem é fixa aqui)
+    all_offset = all_dy * width + np.concatenate([g[1] for g in glyphs])
+    all_white = np.concatenate([g[2] for g in glyphs])
+
+    gids = gids[members]
+    counts = sizes[gids]
+    idx = _runs(offsets[gids], counts, 1)
+    lin = np.repeat(oy[members] * width + ox[members], counts) + all_offset[idx]
+    white = all_white[idx]
+    # Rótulos que atravessam a borda de uma faixa: descarta as linhas de fora
+    if (top[members] < 0).any() or (bottom[members] > height).any():
+        row = np.repeat(oy[members], counts) + all_dy[idx]
+        inside = (row >= 0) & (row < height)
+        lin, white = lin[inside], white[inside]
+    return lin, white
+
+def _element_arrays(structure):
+    # Uma única passada: a estrutura pode ser lida sob demanda (LazyStructure)
+    rects, labels = [], []
+    for item in structure:
+        rects += (int(item['x']), int(item['y']), int(item['width']), int(item['height']))
+        labels.append(f"{item['tag']}")
+    return np.array(rects, np.int64).reshape(-1, 4), labels
+
+def _outline_runs(boxes, height, width):
+    """Contornos (os pixels do cv2.rectangle, espessura 1) recortados à imagem, em trechos.
+
+    Retorna ((inícios, tamanhos) das linhas horizontais, idem das verticais);
+    os pixels são inícios + k (horizontais) ou inícios + k * width (verticais).
+    """
+    x0, y0 = boxes[:, 0], boxes[:, 1]
+    x1, y1 = x0 + boxes[:, 2], y0 + boxes[:, 3]
+    left, right = np.minimum(x0, x1), np.maximum(x0, x1)
+    up, down = np.minimum(y0, y1), np.maximum(y0, y1)
+
+    rows = np.concatenate([y0, y1])
+    col_start = np.tile(np.maximum(left, 0), 2)
+    col_len = np.tile(np.minimum(right, width - 1), 2) - col_start + 1
+    col_len[(rows < 0) | (rows >= height) | (col_len < 0)] = 0
+
+    cols = np.concatenate([x0, x1])
+    row_start = np.tile(np.maximum(up, 0), 2)
+    row_len = np.tile(np.minimum(down, height - 1), 2) - row_start + 1
+    row_len[(cols < 0) | (cols >= width) | (row_len < 0)] = 0
+    return (rows * width + col_start, col_len), (row_start * width + cols, row_len)
+
+def _annotate(img, boxes, labels, rows=None):
+    if not len(boxes):
+        return img
+    height, width = img.shape[:2]
+    channels = img.shape[2]
+    # Um item por pixel (bytes do pixel juntos): take/put copiam o pixel de uma vez
+    pixels = img.reshape(-1).view(f"V{channels}")
+
+    horizontal, vertical = _outline_runs(boxes, height, width)
+    dense = horizontal[1].sum() + vertical[1].sum() > DENSE_OUTLINE_FRACTION * height * width
+    box_flat = None
+    if dense:
+        x0, y0 = boxes[:, 0], boxes[:, 1]
+        x1, y1 = x0 + boxes[:, 2], y0 + boxes[:, 3]
+        corners = np.stack([np.stack([x0, y0], 1), np.stack([x1, y0], 1),
+                            np.stack([x1, y1], 1), np.stack([x0, y1], 1)], 1).astype(np.int32)
+        box_mask = np.zeros((height, width), np.uint8)
+        cv2.polylines(box_mask, list(corners), True, 255, 1)
+        box_flat = box_mask.reshape(-1)
+    else:
+        box_lin = np.concatenate([_runs(*horizontal, 1), _runs(*vertical, width)])
+
+    # Texto: 60% do glifo (preto/branco) sobre a imagem com as caixas; os pixels
+    # de baixo são lidos antes de as caixas serem misturadas
+    text_lin, white = _label_pixels(labels, boxes, height, width, rows or (0, height))
+    if len(text_lin):
+        if box_flat is None:
+            box_flat = np.zeros(height * width, np.uint8)
+            box_flat[box_lin] = 1
+        under = np.take(pixels, text_lin).view(np.uint8).reshape(-1, channels)
+        under[np.flatnonzero(box_flat[text_lin])] = BOX_COLOR
+        glyph = np.repeat(white.view(np.uint8) * np.uint8(255), channels).reshape(-1, channels)
+        text = cv2.addWeighted(glyph, LABEL_ALPHA, under, 1 - LABEL_ALPHA, 0)
+
+    # Caixas: no overlay o pixel continua o original, então basta misturar com a cor
+    if dense:
+        # Contornos cobrem boa parte da imagem: mistura por faixas e copia pela máscara
+        color = np.empty((min(BLEND_BAND_ROWS, height), width, channels), np.uint8)
+        color[:] = BOX_COLOR
+        for top in range(0, height, BLEND_BAND_ROWS):
+            band = img[top:top + BLEND_BAND_ROWS]
+            blended = cv2.addWeighted(band, LABEL_ALPHA, color[:len(band)], 1 - LABEL_ALPHA, 0)
+            cv2.copyTo(blended, box_mask[top:top + BLEND_BAND_ROWS], band)
+    elif len(box_lin):
+        # Só os pixels do contorno são lidos e gravados (um pixel repetido recebe o mesmo valor)
+        under = np.take(pixels, box_lin).view(np.uint8).reshape(-1, channels)
+        color = np.empty_like(under)
+        color[:] = BOX_COLOR
+        blended = cv2.addWeighted(under, LABEL_ALPHA, color, 1 - LABEL_ALPHA, 0)
+        np.put(pixels, box_lin, blended.reshape(-1).view(pixels.dtype))
+
+    if len(text_lin):
+        # np.put grava na ordem: onde rótulos se sobrepõem fica o do último elemento
+        np.put(pixels, text_lin, text.reshape(-1).view(pixels.dtype))
+    return img
+
+def annotate(img, structure):
+    """Versão em lote de annotate_legacy, com o mesmo resultado pixel a pixel.
+
+    Os contornos saem de uma conta sobre as coordenadas: com poucos, só os
+    pixels deles são lidos e misturados; quando passam de
+    DENSE_OUTLINE_FRACTION da imagem, uma máscara do cv2.polylines e a
+    mistura por faixas custam menos. Os rótulos vêm de glifos em cache
+    expandidos com operações de array (rasterizados um a um só quando saem
+    da imagem), sem a cópia do overlay da imagem inteira.
+    """
+    return _annotate(img, *_element_arrays(structure))
+
+def annotate_bands(bands, structure, height):
+    """annotate sobre uma imagem em faixas horizontais [(top, faixa), ...], alterando cada faixa.
+
+    Só os elementos cuja caixa ou rótulo alcançam a faixa são desenhados nela;
+    height (altura da imagem inteira) separa as bordas reais das bordas entre
+    faixas, e o resultado é o mesmo de annotate sobre a imagem inteira.
+    """
+    boxes, labels = _element_arrays(structure)
+    top_edge = np.minimum(boxes[:, 1], boxes[:, 1] + boxes[:, 3]) - LABEL_MARGIN
+    bottom_edge = np.maximum(boxes[:, 1], boxes[:, 1] + boxes[:, 3]) + LABEL_MARGIN
+    for top, band in bands:
+        near = np.flatnonzero((top_edge < top + len(band)) & (bottom_edge >= top))
+        shifted = boxes[near]
+        shifted[:, 1] -= top
+        _annotate(band, shifted, [labels[i] for i in near], rows=(-top, height - top))
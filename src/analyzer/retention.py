@@ -0,0 +1,60 @@
+# src/analyzer/retention.py
+"""Limpeza de análises antigas e coleta dos blobs que deixaram de ser usados."""
+import os
+import shutil
+from datetime import datetime, timedelta
+from src.core.analysis_index import AnalysisIndex
+from src.core.blob_store import BlobStore
+from src.core.logger import logger
+from src.analyzer.storage import structure_base
+
+def _dependencies(path):
+    """Análises das quais path depende (ponteiro -> delta -> completa)."""
+    found = []
+    for _ in range(3):
+        path = structure_base(path)
+        if not path:
+            break
+        found.append(os.path.abspath(path))
+    return found
+
+def prune_analyses(keep=None, older_than_days=None, domain=None, dry_run=False, index=None, store=None):
+    """Apaga análises além das `keep` mais recentes por URL e/ou mais antigas que N dias.
+
+    Análises usadas como base por ponteiros/deltas que ficam são preservadas.
+    Depois da remoção os blobs sem referência são coletados. Retorna um resumo.
+    """
+    index = index or AnalysisIndex()
+    cutoff = None
+    if older_than_days is not None:
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).strftime("%Y-%m-%d_%H-%M-%S")
+
+    seen = {}
+    kept, candidates = [], []
+    for row in index.list_analyses(domain):
+        group = row["url"] or row["domain"]
+        seen[group] = seen.get(group, 0) + 1
+        too_many = keep is not None and seen[group] > keep
+        too_old = cutoff is not None and row["timestamp"] < cutoff
+        (candidates if too_many or too_old else kept).append(row)
+
+    protected = set()
+    for row in kept:
+        protected.update(_dependencies(row["path"]))
+
+    removed = []
+    for row in candidates:
+        if os.path.abspath(row["path"]) in protected:
+            kept.append(row)
+            continue
+        removed.append(row["path"])
+        if dry_run:
+            continue
+        shutil.rmtree(row["path"], ignore_errors=True)
+        index.remove(row["path"])
+
+    summary = {"removed": len(removed), "kept": len(kept), "paths": removed, "blobs_removed": 0, "bytes_freed": 0}
+    if not dry_run:
+        summary["blobs_removed"], summary["bytes_freed"] = (store or BlobStore()).gc()
+    logger.info(f"Limpeza de análises: {len(removed)} removidas, {len(kept)} mantidas")
+    return summary
@@ -4,62 +4,290 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException
 import json
 import cv2
 import numpy as np
 import os
+import sqlite3
 import sys
 from urllib.parse import urlparse
 from datetime import datetime
 import argparse
 import time
 
-parser = argparse.ArgumentParser()
-parser.add_argument("--url", type=str, required=True)
-parser.add_argument("--output-dir", type=str, required=True)
-args = parser.parse_args()
+# Permite importar src/ ao executar este arquivo diretamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.automation.driver_resolver import resolve_chromedriver
+from src.core.config import Config
+from src.core.analysis_index import AnalysisIndex
+from src.core.blob_store import BlobStore
+from src.analyzer.storage import ATTRIBUTE_NAMES, STORAGE_FORMATS, remove_ndjson, save_structure, save_incremental
+from src.analyzer.structure_stream import StructureWriter
+from src.analyzer.viewer import VIEWER_MODES, generate_lazy_viewer
+from src.analyzer.renderer import annotate, annotate_bands
+from src.analyzer.screenshot import SCREENSHOT_MODES, StitchedImage, capture_full_page
 
-URL = args.url
-OUTPUT_DIR = args.output_dir
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# Elementos candidatos à análise
+CANDIDATE_XPATH = """
+    //*[
+        (text() != '' and not(self::script or self::style))
+        or @value
+        or @type
+        or @href
+        or @onclick
+        or @class
+        or @id
+    ]
+"""
 
-def extract_structure(driver, url):
-    try:
-        driver.get(url)
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-    except TimeoutException:
-        print(f"[INFO] Página carregou parcialmente: {url}")
+# Gerador de XPath instalado uma única vez por documento (window.__wcaXPath).
+# Guarda o caminho de cada ancestral e os índices de irmãos em WeakMaps; os
+# índices de todos os filhos de um pai são calculados em uma só passada.
+# O cache é descartado quando o DOM muda (MutationObserver).
+INSTALL_XPATH_SCRIPT = """
+    if (!window.__wcaXPath) {
+        let pathCache = new WeakMap();
+        let indexCache = new WeakMap();
 
-    # Rola até o fim para carregar conteúdo dinâmico
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    while True:
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(1.5)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            break
-        last_height = new_height
+        function indexChildren(parent) {
+            const counters = {};
+            for (const child of parent.children) {
+                const ix = (counters[child.tagName] || 0) + 1;
+                counters[child.tagName] = ix;
+                indexCache.set(child, ix);
+            }
+        }
 
-    try:
-        title = driver.title.strip() or "Página sem título"
-    except:
-        title = "Página não carregada"
+        function getXPath(elt) {
+            const cached = pathCache.get(elt);
+            if (cached !== undefined) return cached;
+            let path;
+            if (elt.id) {
+                path = '//*[@id="' + elt.id + '"]';
+            } else if (elt === document.body) {
+                path = 'body';
+            } else if (!elt.parentNode || elt.parentNode.nodeType !== 1) {
+                path = null;  // Fora do body (html/head): não gera XPath
+            } else {
+                const parent = getXPath(elt.parentNode);
+                if (parent === null) {
+                    path = null;
+                } else {
+                    if (!indexCache.has(elt)) indexChildren(elt.parentNode);
+                    path = parent + '/' + elt.tagName + '[' + indexCache.get(elt) + ']';
+                }
+            }
+            pathCache.set(elt, path);
+            return path;
+        }
+
+        new MutationObserver(() => {
+            pathCache = new WeakMap();
+            indexCache = new WeakMap();
+        }).observe(document, {childList: true, subtree: true, attributes: true, attributeFilter: ['id']});
+
+        window.__wcaXPath = getXPath;
+    }
+"""
+
+# Chamada por elemento (modo de compatibilidade); exige INSTALL_XPATH_SCRIPT antes
+GET_XPATH_SCRIPT = """
+    return window.__wcaXPath(arguments[0]);
+"""
+
+# Script injetado que coleta todos os candidatos em uma única chamada ao WebDriver.
+# Reproduz is_displayed(), get_attribute(), rect, tag_name, text e getXPath.
+BATCH_EXTRACT_SCRIPT = INSTALL_XPATH_SCRIPT + """
+    const candidateXPath = arguments[0];
+    const attrNames = arguments[1];
+    const getXPath = window.__wcaXPath;
+
+    function hasPositiveSize(el) {
+        const r = el.getBoundingClientRect();
+        if (r.width > 0 && r.height > 0) return true;
+        for (const child of el.children) {
+            if (hasPositiveSize(child)) return true;
+        }
+        return false;
+    }
+
+    function isShown(el) {
+        const tag = el.tagName;
+        if (tag === 'BODY') return true;
+        if (tag === 'NOSCRIPT' || tag === 'SCRIPT' || tag === 'STYLE' || tag === 'HEAD') return false;
+        if (tag === 'INPUT' && (el.type || '').toLowerCase() === 'hidden') return false;
+        if (tag === 'OPTION' || tag === 'OPTGROUP') {
+            const select = el.closest('select');
+            return select ? isShown(select) : true;
+        }
+        const style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.visibility === 'collapse') return false;
+        for (let a = el; a && a.nodeType === 1; a = a.parentElement) {
+            const s = a === el ? style : window.getComputedStyle(a);
+            if (s.display === 'none') return false;
+            if (parseFloat(s.opacity) === 0) return false;
+        }
+        return hasPositiveSize(el);
+    }
+
+    // Mesma regra do átomo getAttribute do Selenium: a propriedade do DOM tem
+    // prioridade (type "text"/"submit"/"textarea", class -> className...);
+    // objetos e valores ausentes caem no atributo. href de <a> e src de <img>
+    // só valem se o atributo existir, e aí vêm resolvidos (URL absoluta).
+    const PROPERTY_ALIASES = {'class': 'className', 'readonly': 'readOnly'};
+
+    function getAttr(el, name) {
+        const tag = el.tagName;
+        if ((tag === 'A' && name === 'href') || (tag === 'IMG' && name === 'src')) {
+            const attr = el.getAttribute(name);
+            return attr ? el[name] : attr;
+        }
+        let prop = null;
+        try { prop = el[PROPERTY_ALIASES[name] || name]; } catch (e) {}
+        if (prop === null || prop === undefined || typeof prop === 'object' || typeof prop === 'function') {
+            return el.getAttribute(name);
+        }
+        return String(prop);
+    }
+
+    const snapshot = document.evaluate(candidateXPath, document, null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const scrollX = window.pageXOffset, scrollY = window.pageYOffset;
+    const out = [];
+    for (let idx = 0; idx < snapshot.snapshotLength; idx++) {
+        const el = snapshot.snapshotItem(idx);
+        try {
+            if (!isShown(el)) continue;
+            const xpath = getXPath(el);
+            if (xpath === null) continue;
+            const attributes = {};
+            for (const name of attrNames) {
+                const val = getAttr(el, name);
+                if (val) attributes[name] = val;
+            }
+            const r = el.getBoundingClientRect();
+            out.push({
+                index: idx,
+                tag: el.tagName.toLowerCase(),
+                text: (el.innerText || '').trim(),
+                value: getAttr(el, 'value') || '',
+                attributes: attributes,
+                x: r.left + scrollX,
+                y: r.top + scrollY,
+                width: r.width,
+                height: r.height,
+                xpath: xpath
+            });
+        } catch (e) {
+            // Mesmo comportamento do modo por elemento: ignora e segue
+        }
+    }
+    return JSON.stringify(out);
+"""
+
+# Espera de rolagem: valores padrão da janela de silêncio e do tempo máximo
+SCROLL_QUIET_MS = 300
+SCROLL_MAX_WAIT = 15
+
+# Etapas reportadas ao callback `progress` da análise: etapa -> (percentual, descrição)
+ANALYSIS_STAGES = {
+    "load": (5, "Carregando a página"),
+    "scroll": (20, "Rolando a página (conteúdo dinâmico)"),
+    "extract": (35, "Extraindo elementos"),
+    "compare": (45, "Comparando com a análise anterior"),
+    "screenshot": (50, "Capturando o screenshot"),
+    "save": (65, "Gravando a estrutura"),
+    "encode": (72, "Gravando o PNG"),
+    "annotate": (82, "Desenhando as caixas"),
+    "viewer": (94, "Gerando o visualizador"),
+    "done": (100, "Concluído"),
+}
+
+# Rola até o fim e só retorna quando a página estabiliza: nenhuma mutação do DOM
+# durante a janela de silêncio, nenhum fetch/XHR pendente e scrollHeight estável.
+# Se a altura cresce (rolagem infinita), rola de novo e reinicia a janela.
+SCROLL_STABILIZE_SCRIPT = """
+    const quietMs = arguments[0];
+    const maxWaitMs = arguments[1];
+    const done = arguments[arguments.length - 1];
+
+    if (!window.__wcaNet) {
+        const net = window.__wcaNet = {pending: 0};
+        const origFetch = window.fetch;
+        if (origFetch) {
+            window.fetch = function () {
+                net.pending++;
+                return origFetch.apply(this, arguments).finally(() => { net.pending--; });
+            };
+        }
+        const origSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            net.pending++;
+            this.addEventListener('loadend', () => { net.pending--; }, {once: true});
+            return origSend.apply(this, arguments);
+        };
+    }
+
+    const start = performance.now();
+    let lastChange = start;
+    let lastHeight = document.body.scrollHeight;
+    let scrolls = 1;
+    const observer = new MutationObserver(() => { lastChange = performance.now(); });
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    window.scrollTo(0, lastHeight);
+
+    function check() {
+        const now = performance.now();
+        const height = document.body.scrollHeight;
+        if (height !== lastHeight) {
+            lastHeight = height;
+            lastChange = now;
+            window.scrollTo(0, height);
+            scrolls++;
+        }
+        const pending = Math.max(window.__wcaNet.pending, 0);
+        const stable = now - lastChange >= quietMs && pending === 0;
+        if (stable || now - start >= maxWaitMs) {
+            observer.disconnect();
+            done({waited_ms: Math.round(now - start), stable: stable, scrolls: scrolls,
+                  height: height, pending_requests: pending});
+            return;
+        }
+        setTimeout(check, 50);
+    }
+    setTimeout(check, 50);
+"""
+
+def build_item(idx, tag, text, value, attributes, rect, xpath):
+    """Monta um registro no formato do estrutura.json."""
+    return {
+        "index": idx,
+        "tag": tag,
+        "text": text,
+        "value": value,
+        "attributes": attributes,
+        "x": round(rect['x'], 2),
+        "y": round(rect['y'], 2),
+        "width": round(rect['width'], 2),
+        "height": round(rect['height'], 2),
+        "xpath": xpath
+    }
+
+def _batch_items(raw):
+    """Registros do resultado do BATCH_EXTRACT_SCRIPT, sem xpaths repetidos."""
+    seen_xpaths = set()
+    for el in json.loads(raw or "[]"):
+        if el['xpath'] in seen_xpaths:
+            continue
+        seen_xpaths.add(el['xpath'])
+        yield build_item(el['index'], el['tag'], el['text'], el['value'], el['attributes'], el, el['xpath'])
+
+def iter_elements_per_element(driver):
+    """Modo original: uma chamada ao WebDriver por atributo de cada elemento, registro a registro."""
+    all_elements = driver.find_elements(By.XPATH, CANDIDATE_XPATH)
+    driver.execute_script(INSTALL_XPATH_SCRIPT)
 
-    all_elements = driver.find_elements(By.XPATH, """
-        //*[
-            (text() != '' and not(self::script or self::style))
-            or @value
-            or @type
-            or @href
-            or @onclick
-            or @class
-            or @id
-        ]
-    """)
-
-    structure = []
     seen_xpaths = set()
 
     for idx, el in enumerate(all_elements):
@@ -68,7 +296,7 @@ def extract_structure(driver, url):
                 continue
 
             attributes = {}
-            for attr in ['name', 'id', 'class', 'type', 'placeholder', 'href', 'title', 'alt', 'value', 'src']:
+            for attr in ATTRIBUTE_NAMES:
                 val = el.get_attribute(attr)
                 if val:
                     attributes[attr] = val
@@ -78,69 +306,134 @@ def extract_structure(driver, url):
             text = el.text.strip()
             value = el.get_attribute("value") or ""
 
-            xpath = driver.execute_script("""
-                function getXPath(elt) {
-                    if (elt.id) return '//*[@id="' + elt.id + '"]';
-                    if (elt === document.body) return 'body';
-                    let ix = 0;
-                    for (let s = elt.parentNode?.firstChild; s; s = s.nextSibling) {
-                        if (s === elt) break;
-                        if (s.nodeType === 1 && s.tagName === elt.tagName) ix++;
-                    }
-                    return getXPath(elt.parentNode) + '/' + elt.tagName + '[' + (ix+1) + ']';
-                }
-                return getXPath(arguments[0]);
-            """, el)
+            xpath = driver.execute_script(GET_XPATH_SCRIPT, el)
 
-            if xpath in seen_xpaths:
+            if xpath is None or xpath in seen_xpaths:
                 continue
             seen_xpaths.add(xpath)
 
-            item = {
-                "index": idx,
-                "tag": tag,
-                "text": text,
-                "value": value,
-                "attributes": attributes,
-                "x": round(rect['x'], 2),
-                "y": round(rect['y'], 2),
-                "width": round(rect['width'], 2),
-                "height": round(rect['height'], 2),
-                "xpath": xpath
-            }
-            structure.append(item)
+            item = build_item(idx, tag, text, value, attributes, rect, xpath)
         except StaleElementReferenceException:
             continue
         except Exception as e:
             print(f"[WARN] Ignorando elemento {idx}: {e}")
             continue
+        yield item
+
+def iter_elements(driver, batch=True):
+    """Registros dos elementos na ordem de extração (lote, ou por elemento se o lote falhar)."""
+    if batch:
+        try:
+            raw = driver.execute_script(BATCH_EXTRACT_SCRIPT, CANDIDATE_XPATH, ATTRIBUTE_NAMES)
+        except WebDriverException as e:
+            print(f"[WARN] Extração em lote falhou, usando modo por elemento: {e}")
+        else:
+            yield from _batch_items(raw)
+            return
+    yield from iter_elements_per_element(driver)
+
+def scroll_to_bottom(driver, quiet_ms=SCROLL_QUIET_MS, max_wait=SCROLL_MAX_WAIT):
+    """Rola até o fim esperando por sinais da própria página; retorna quanto esperou."""
+    started = time.perf_counter()
+    previous_timeout = None
+    try:
+        # Timeout só desta espera: o do driver volta ao valor anterior no finally
+        previous_timeout = driver.timeouts.script
+        driver.set_script_timeout(max_wait + 5)
+        result = driver.execute_async_script(SCROLL_STABILIZE_SCRIPT, quiet_ms, int(max_wait * 1000))
+    except WebDriverException as e:
+        print(f"[WARN] Falha ao aguardar estabilização da rolagem: {e}")
+        result = {"waited_ms": None, "stable": False, "scrolls": 0, "height": None, "pending_requests": None}
+    finally:
+        if previous_timeout is not None:
+            try:
+                driver.set_script_timeout(previous_timeout)
+            except WebDriverException:
+                pass
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000)
+
+    status = "estável" if result["stable"] else "tempo máximo atingido"
+    print(f"[INFO] Rolagem: {status} após {result['waited_ms']} ms "
+          f"({result['scrolls']} rolagens, altura {result['height']})")
+    return result
+
+def _report(progress, stage):
+    """Avisa o início de uma etapa (ANALYSIS_STAGES); o callback pode levantar exceção para cancelar."""
+    if progress is not None:
+        progress(stage)
+
+def extract_structure(driver, url, batch=True, scroll_quiet_ms=SCROLL_QUIET_MS,
+                      scroll_max_wait=SCROLL_MAX_WAIT, stats=None, progress=None, writer=None):
+    """Carrega a página, rola até o fim e extrai os elementos; retorna (estrutura, título).
+
+    Com writer (StructureWriter) cada elemento vai para o NDJSON assim que é
+    extraído e a estrutura retornada é a LazyStructure do writer, já na ordem
+    da página; sem writer, é a lista ordenada por (y, x).
+    """
+    _report(progress, "load")
+    try:
+        driver.get(url)
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    except TimeoutException:
+        print(f"[INFO] Página carregou parcialmente: {url}")
+
+    # Rola até o fim para carregar conteúdo dinâmico
+    _report(progress, "scroll")
+    scroll = scroll_to_bottom(driver, scroll_quiet_ms, scroll_max_wait)
+    if stats is not None:
+        stats["scroll"] = scroll
 
+    try:
+        title = driver.title.strip() or "Página sem título"
+    except:
+        title = "Página não carregada"
+
+    _report(progress, "extract")
+    if writer is not None:
+        with writer:
+            for item in iter_elements(driver, batch):
+                writer.write(item)
+        return writer.structure, title
+
+    structure = list(iter_elements(driver, batch))
     structure.sort(key=lambda x: (x['y'], x['x']))
     return structure, title
 
-def draw_bounding_boxes(structure, src_img, dst_img):
+def draw_bounding_boxes(structure, src_img, dst_img, store=None):
+    """src_img: caminho do screenshot ou StitchedImage da captura de página inteira.
+
+    Com store (BlobStore), a imagem anotada é guardada por conteúdo.
+    """
+    if isinstance(src_img, StitchedImage):
+        annotate_bands(src_img.bands(), structure, src_img.height)
+        src_img.save_png(dst_img)
+        if store is not None:
+            store.put_file(dst_img)
+        return
     if not os.path.exists(src_img):
         return
     img = cv2.imread(src_img)
     if img is None:
         return
-    overlay = img.copy()
-    font = cv2.FONT_HERSHEY_SIMPLEX
-    font_scale = 0.5
-    thickness = 1
-
-    for item in structure:
-        x, y, w, h = int(item['x']), int(item['y']), int(item['width']), int(item['height'])
-        cv2.rectangle(img, (x, y), (x + w, y + h), (100, 100, 255), 1)
-        label = f"{item['tag']}"
-        cv2.putText(overlay, label, (x + 2, y - 2), font, font_scale, (0, 0, 0), 2)
-        cv2.putText(overlay, label, (x + 2, y - 2), font, font_scale, (255, 255, 255), 1)
-
-    alpha = 0.6
-    img = cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0)
+    img = annotate(img, structure)
+    if store is not None:
+        store.put_bytes(cv2.imencode(".png", img)[1].tobytes(), dst_img)
+        return
     cv2.imwrite(dst_img, img)
 
-def generate_web_viewer(structure, output_path, page_title, url):
+def generate_web_viewer(structure, output_path, page_title, url, store=None, mode=None):
+    """Gera o visualizador.html.
+
+    mode "inline": a estrutura inteira embutida no HTML; "lazy": página fixa
+    com os dados em partes carregadas sob demanda (src/analyzer/viewer.py).
+    O padrão vem de Config.VIEWER_MODE.
+    """
+    mode = mode or Config.VIEWER_MODE
+    if mode not in VIEWER_MODES:
+        raise ValueError(f"Modo de visualizador inválido: {mode}")
+    if mode == "lazy":
+        generate_lazy_viewer(structure, output_path, page_title, url, store)
+        return
     try:
         with open("templates/visualizador.html", "r", encoding="utf-8") as f:
             html = f.read()
@@ -155,38 +448,272 @@ def generate_web_viewer(structure, output_path, page_title, url):
         <div class="pos">(${i.x},${i.y})</div><div class="xpath">${i.xpath}</div>`; c.appendChild(d); });
         </script></body></html>"""
 
-    json_data = json.dumps(structure, ensure_ascii=False, indent=2)
+    json_data = json.dumps(list(structure), ensure_ascii=False, indent=2)
     html = html.replace("{{title}}", page_title)
     html = html.replace("{{url}}", url)
     html = html.replace("{{json_data}}", json_data)
 
+    if store is not None:
+        store.put_bytes(html.encode("utf-8"), output_path)
+        return
     with open(output_path, "w", encoding="utf-8") as f:
         f.write(html)
 
+def make_output_dir(url, base_dir=None):
+    """Cria analyses/<domínio>/<timestamp> para a URL (com sufixo se já existir)."""
+    domain = urlparse(url).netloc.replace("www.", "")
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    domain_dir = os.path.join(str(base_dir or Config.ANALYSES_DIR), domain)
+    os.makedirs(domain_dir, exist_ok=True)
+    output_dir = os.path.join(domain_dir, timestamp)
+    suffix = 1
+    while True:
+        try:
+            os.mkdir(output_dir)
+            return output_dir
+        except FileExistsError:
+            output_dir = os.path.join(domain_dir, f"{timestamp}_{suffix}")
+            suffix += 1
+
+def capture_page(driver, url, output_dir, batch=True, scroll_quiet_ms=SCROLL_QUIET_MS,
+                 scroll_max_wait=SCROLL_MAX_WAIT, storage_format=None, screenshot_mode=None,
+                 incremental=None, progress=None):
+    """Etapa que usa o navegador: extrai a estrutura e captura o screenshot.
+
+    A codificação do PNG, a anotação, o visualizador e a gravação da estrutura
+    ficam para finish_analysis, que não precisa do driver (e pode rodar em
+    outra thread enquanto o navegador já carrega a próxima página).
+    Com incremental a comparação com a análise anterior é feita aqui, porque
+    decide se o screenshot é necessário. progress(etapa) é chamado no início
+    de cada etapa de ANALYSIS_STAGES. Retorna a captura (dict).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    timings = {}
+    stats = {}
+
+    def lap(name, started):
+        timings[name] = round((time.perf_counter() - started) * 1000)
+        return time.perf_counter()
+
+    storage_format = storage_format or Config.STORAGE_FORMAT
+    # NDJSON: a estrutura é gravada durante a extração
+    writer = StructureWriter(output_dir) if storage_format == "ndjson" else None
+    started = t = time.perf_counter()
+    try:
+        structure, title = extract_structure(
+            driver, url, batch=batch, scroll_quiet_ms=scroll_quiet_ms,
+            scroll_max_wait=scroll_max_wait, stats=stats, progress=progress, writer=writer,
+        )
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    t = lap("extract_ms", t)
+    timings["scroll_wait_ms"] = stats.get("scroll", {}).get("waited_ms")
+
+    capture = {
+        "url": url,
+        "output_dir": output_dir,
+        "title": title,
+        "structure": structure,
+        "storage_format": storage_format,
+        "timings": timings,
+        "started": started,
+        "saved": writer is not None,
+        "change": "full",
+        "changes": None,
+        "previous": None,
+        "page": None,
+        "png": None,
+        "progress": progress,
+    }
+
+    incremental = Config.INCREMENTAL_ANALYSIS if incremental is None else incremental
+    previous = None
+    if incremental:
+        try:
+            previous = AnalysisIndex().latest_for_url(url)
+        except sqlite3.Error as e:
+            print(f"[WARN] Falha ao consultar o índice de análises: {e}")
+    if previous:
+        _report(progress, "compare")
+        try:
+            current = list(structure)
+            # O NDJSON do writer já é a estrutura completa: "full" não deve regravá-lo
+            # (o índice está aberto pela LazyStructure)
+            change, _, changes = save_incremental(current, output_dir, previous["path"],
+                                                  None if writer is not None else capture["storage_format"])
+            if writer is not None and change != "full":
+                # Ponteiro/delta substituem o NDJSON gravado durante a extração; o resto
+                # da análise usa a lista já lida, pois o arquivo deixa de existir
+                structure.close()
+                structure = capture["structure"] = current
+                remove_ndjson(output_dir)
+            capture.update(saved=True, change=change, changes=changes, previous=previous)
+            t = lap("save_ms", t)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARN] Comparação com a análise anterior falhou, gravando completa: {e}")
+    if capture["change"] == "unchanged":
+        return capture
+
+    _report(progress, "screenshot")
+    if (screenshot_mode or Config.SCREENSHOT_MODE) == "full":
+        try:
+            capture["page"] = capture_full_page(driver, max_height=Config.SCREENSHOT_MAX_HEIGHT, work_dir=output_dir)
+        except (WebDriverException, ValueError) as e:
+            print(f"[WARN] Falha no screenshot da página inteira, usando a viewport: {e}")
+    if capture["page"] is None:
+        capture["png"] = driver.get_screenshot_as_png()
+    lap("screenshot_ms", t)
+    return capture
+
+def discard_capture(capture):
+    """Libera o arquivo temporário de uma captura que não vai ser processada."""
+    if capture.get("page") is not None:
+        capture["page"].close()
+
+def finish_analysis(capture):
+    """Etapa sem navegador: grava a estrutura, o PNG, a imagem anotada e o visualizador.
+
+    Retorna um resumo com título, número de elementos e tempos por etapa (ms).
+    """
+    timings = capture["timings"]
+    output_dir = capture["output_dir"]
+    structure, title, url = capture["structure"], capture["title"], capture["url"]
+    progress = capture.get("progress")
+
+    def lap(name, started):
+        timings[name] = round((time.perf_counter() - started) * 1000)
+        return time.perf_counter()
+
+    t = time.perf_counter()
+    if not capture["saved"]:
+        _report(progress, "save")
+        save_structure(structure, output_dir, capture["storage_format"])
+        t = lap("save_ms", t)
+
+    summary = {
+        "url": url,
+        "output_dir": output_dir,
+        "title": title,
+        "elements": len(structure),
+        "change": capture["change"],
+        "changes": capture["changes"],
+        "timings": timings,
+    }
+    if capture["change"] == "unchanged":
+        # Nada mudou: reaproveita screenshot, anotação e visualizador da análise anterior
+        previous = capture["previous"]
+        print(f"[INFO] Estrutura idêntica à análise de {previous['timestamp']}; só o ponteiro foi gravado.")
+        timings["total_ms"] = round((time.perf_counter() - capture["started"]) * 1000)
+        try:
+            AnalysisIndex().record(output_dir, url=url, title=title, element_count=len(structure),
+                                   screenshot=previous["screenshot"], annotated=previous["annotated"],
+                                   viewer=previous["viewer"])
+        except sqlite3.Error as e:
+            print(f"[WARN] Falha ao registrar análise no índice: {e}")
+        _report(progress, "done")
+        return summary
+
+    # Artefatos iguais aos de execuções anteriores são guardados uma única vez
+    store = BlobStore() if Config.BLOB_STORE else None
+    screenshot = os.path.join(output_dir, "pagina.png")
+    annotated = os.path.join(output_dir, "pagina_anotada.png")
+    page = capture["page"]
+    _report(progress, "encode")
+    if page is not None:
+        with page:
+            page.save_png(screenshot)
+            if store is not None:
+                store.put_file(screenshot)
+            t = lap("encode_ms", t)
+            _report(progress, "annotate")
+            draw_bounding_boxes(structure, page, annotated, store)
+            t = lap("annotate_ms", t)
+    else:
+        if store is not None:
+            store.put_bytes(capture["png"], screenshot)
+        else:
+            with open(screenshot, "wb") as f:
+                f.write(capture["png"])
+        t = lap("encode_ms", t)
+        _report(progress, "annotate")
+        draw_bounding_boxes(structure, screenshot, annotated, store)
+        t = lap("annotate_ms", t)
+
+    _report(progress, "viewer")
+    generate_web_viewer(structure, os.path.join(output_dir, "visualizador.html"), title, url, store)
+    lap("viewer_ms", t)
+    timings["total_ms"] = round((time.perf_counter() - capture["started"]) * 1000)
+
+    try:
+        AnalysisIndex().record(output_dir, url=url, title=title, element_count=len(structure))
+    except sqlite3.Error as e:
+        print(f"[WARN] Falha ao registrar análise no índice: {e}")
+    _report(progress, "done")
+    return summary
+
+def analyze_url(driver, url, output_dir, batch=True, scroll_quiet_ms=SCROLL_QUIET_MS,
+                scroll_max_wait=SCROLL_MAX_WAIT, storage_format=None, screenshot_mode=None,
+                incremental=None, progress=None):
+    """Executa a análise completa de uma URL e grava os artefatos em output_dir.
+
+    storage_format: "json" (estrutura.json), "parquet" (colunar), "both" ou
+    "ndjson" (gravado elemento a elemento durante a extração, com índice
+    ordenado à parte); o padrão vem de Config.STORAGE_FORMAT.
+    screenshot_mode: "full" (página inteira) ou "viewport"; o padrão vem de
+    Config.SCREENSHOT_MODE.
+    incremental: compara com a última análise da mesma URL e grava só um
+    ponteiro (nada mudou, sem screenshot/anotação/HTML) ou um delta; o padrão
+    vem de Config.INCREMENTAL_ANALYSIS.
+    progress: callback progress(etapa) chamado no início de cada etapa de
+    ANALYSIS_STAGES; se levantar exceção, a análise para ali.
+
+    Equivale a capture_page seguida de finish_analysis. Retorna um resumo com
+    título, número de elementos e tempos por etapa (ms).
+    """
+    capture = capture_page(driver, url, output_dir, batch=batch, scroll_quiet_ms=scroll_quiet_ms,
+                           scroll_max_wait=scroll_max_wait, storage_format=storage_format,
+                           screenshot_mode=screenshot_mode, incremental=incremental, progress=progress)
+    try:
+        return finish_analysis(capture)
+    finally:
+        discard_capture(capture)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", type=str, required=True)
+    parser.add_argument("--output-dir", type=str, required=True)
+    parser.add_argument("--per-element", action="store_true", help="Usa a extração por elemento (mais lenta)")
+    parser.add_argument("--scroll-quiet-ms", type=int, default=SCROLL_QUIET_MS, help="Janela sem mutações/requisições para considerar a rolagem estável")
+    parser.add_argument("--scroll-max-wait", type=float, default=SCROLL_MAX_WAIT, help="Tempo máximo (s) aguardando a rolagem estabilizar")
+    parser.add_argument("--format", choices=STORAGE_FORMATS, default=None, help="Formato da estrutura: json, parquet, both ou ndjson")
+    parser.add_argument("--screenshot", choices=SCREENSHOT_MODES, default=None, help="Screenshot da página inteira (full) ou só da janela (viewport)")
+    parser.add_argument("--incremental", action="store_true", default=None, help="Compara com a última análise da URL e grava só o que mudou")
+    return parser.parse_args(argv)
+
 def main():
-    print(f"[INFO] Analisando: {URL}")
+    args = parse_args()
+    print(f"[INFO] Analisando: {args.url}")
     options = webdriver.ChromeOptions()
     options.add_argument("--headless=new")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--window-size=1200,800")
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    driver = webdriver.Chrome(service=Service(resolve_chromedriver()), options=options)
 
     try:
-        structure, title = extract_structure(driver, URL)
-
-        with open(os.path.join(OUTPUT_DIR, "estrutura.json"), "w", encoding="utf-8") as f:
-            json.dump(structure, f, ensure_ascii=False, indent=2)
-
-        screenshot = os.path.join(OUTPUT_DIR, "pagina.png")
-        annotated = os.path.join(OUTPUT_DIR, "pagina_anotada.png")
-        driver.save_screenshot(screenshot)
-        draw_bounding_boxes(structure, screenshot, annotated)
-
-        generate_web_viewer(structure, os.path.join(OUTPUT_DIR, "visualizador.html"), title, URL)
-
-        print(f"[OK] Análise concluída: {OUTPUT_DIR}")
+        analyze_url(
+            driver, args.url, args.output_dir,
+            batch=not args.per_element,
+            scroll_quiet_ms=args.scroll_quiet_ms,
+            scroll_max_wait=args.scroll_max_wait,
+            storage_format=args.format,
+            screenshot_mode=args.screenshot,
+            incremental=args.incremental,
+        )
+        print(f"[OK] Análise concluída: {args.output_dir}")
 
     except Exception as e:
         print(f"[ERRO] Falha na análise: {e}")
@@ -195,4 +722,4 @@ def main():
         driver.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,181 @@
+# src/analyzer/screenshot.py
+"""Screenshot da página inteira: captura em faixas e costura em disco (np.memmap)."""
+import base64
+import os
+import struct
+import tempfile
+import zlib
+import cv2
+import numpy as np
+from selenium.common.exceptions import WebDriverException
+
+SCREENSHOT_MODES = ("full", "viewport")
+
+# Altura (px) de cada faixa capturada e de cada faixa processada depois
+TILE_HEIGHT = 2048
+BAND_HEIGHT = 1024
+# Páginas mais largas que isso são cortadas à direita
+MAX_PAGE_WIDTH = 4096
+
+PAGE_METRICS_SCRIPT = """
+    const d = document.documentElement, b = document.body || d;
+    return {
+        width: Math.max(d.scrollWidth, b.scrollWidth, d.clientWidth),
+        height: Math.max(d.scrollHeight, b.scrollHeight, d.clientHeight),
+        viewport_width: d.clientWidth || window.innerWidth,
+        viewport_height: window.innerHeight,
+        dpr: window.devicePixelRatio || 1,
+        scroll_x: window.pageXOffset,
+        scroll_y: window.pageYOffset
+    };
+"""
+
+def _decode(png_bytes, width, height, dpr=1):
+    """PNG -> BGR no tamanho (CSS) esperado da faixa."""
+    tile = cv2.imdecode(np.frombuffer(png_bytes, np.uint8), cv2.IMREAD_COLOR)
+    if tile is None:
+        raise ValueError("Faixa do screenshot não pôde ser decodificada")
+    # Descarta a barra de rolagem e converte pixels físicos em CSS
+    tile = tile[:round(height * dpr), :round(width * dpr)]
+    if tile.shape[1] != width or tile.shape[0] != height:
+        tile = cv2.resize(tile, (width, height), interpolation=cv2.INTER_AREA)
+    return tile
+
+def _png_chunk(f, kind, data):
+    f.write(struct.pack(">I", len(data)))
+    f.write(kind)
+    f.write(data)
+    f.write(struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+def write_png(path, bands, width, height, level=3):
+    """Grava um PNG RGB a partir de faixas BGR, sem montar a imagem inteira na memória."""
+    compressor = zlib.compressobj(level)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        _png_chunk(f, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        for _, band in bands:
+            rgb = np.ascontiguousarray(band[:, :, ::-1])
+            # Filtro Sub (tipo 1): cada byte menos o do pixel à esquerda
+            sub = rgb.copy()
+            sub[:, 1:] -= rgb[:, :-1]
+            rows = np.empty((len(sub), 1 + width * 3), np.uint8)
+            rows[:, 0] = 1
+            rows[:, 1:] = sub.reshape(len(sub), -1)
+            data = compressor.compress(rows.tobytes())
+            if data:
+                _png_chunk(f, b"IDAT", data)
+        _png_chunk(f, b"IDAT", compressor.flush())
+        _png_chunk(f, b"IEND", b"")
+
+class StitchedImage:
+    """Imagem BGR (altura x largura x 3) guardada em um arquivo bruto no disco.
+
+    As faixas são mapeadas sob demanda (np.memmap) e liberadas em seguida, de
+    modo que a memória residente fica limitada a uma faixa por vez.
+    """
+    def __init__(self, width, height, work_dir=None):
+        self.width = width
+        self.height = height
+        fd, self.path = tempfile.mkstemp(prefix=".pagina_", suffix=".raw", dir=work_dir)
+        os.close(fd)
+        with open(self.path, "r+b") as f:
+            f.truncate(width * height * 3)
+
+    def band(self, top, bottom):
+        """Linhas [top, bottom) mapeadas para leitura e escrita."""
+        return np.memmap(self.path, np.uint8, "r+", offset=top * self.width * 3,
+                         shape=(bottom - top, self.width, 3))
+
+    def bands(self, rows=BAND_HEIGHT):
+        """Percorre a imagem em faixas (top, memmap); alterações são gravadas no arquivo."""
+        for top in range(0, self.height, rows):
+            band = self.band(top, min(top + rows, self.height))
+            yield top, band
+            band.flush()
+            del band
+
+    def write(self, top, tile):
+        """Copia uma faixa capturada para as linhas a partir de top."""
+        bottom = min(top + len(tile), self.height)
+        if bottom <= top:
+            return
+        band = self.band(top, bottom)
+        band[:] = tile[:bottom - top, :self.width]
+        band.flush()
+        del band
+
+    def save_png(self, path):
+        write_png(path, self.bands(), self.width, self.height)
+
+    def close(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def _cdp_tiles(driver, width, height, dpr, tile_height):
+    """Faixas via CDP Page.captureScreenshot (captureBeyondViewport), sem rolar a página."""
+    for top in range(0, height, tile_height):
+        rows = min(tile_height, height - top)
+        result = driver.execute_cdp_cmd("Page.captureScreenshot", {
+            "format": "png",
+            "captureBeyondViewport": True,
+            "fromSurface": True,
+            "clip": {"x": 0, "y": top, "width": width, "height": rows, "scale": 1 / dpr},
+        })
+        yield top, _decode(base64.b64decode(result["data"]), width, rows)
+
+def _scroll_tiles(driver, width, height, viewport_height, dpr):
+    """Faixas rolando a janela, uma viewport por vez (elementos fixos se repetem)."""
+    for top in range(0, height, viewport_height):
+        driver.execute_script("window.scrollTo(0, arguments[0]);", top)
+        scroll_y = int(driver.execute_script("return window.pageYOffset;"))
+        tile = _decode(driver.get_screenshot_as_png(), width, viewport_height, dpr)
+        # Na última faixa a janela para antes de top: descarta o que já foi capturado
+        yield top, tile[max(0, top - scroll_y):]
+
+def capture_full_page(driver, max_height=None, tile_height=TILE_HEIGHT, use_cdp=True, work_dir=None):
+    """Captura a página inteira em faixas e as costura em um StitchedImage.
+
+    Usa o CDP quando disponível (Chrome); senão rola a janela e junta as
+    viewports. Páginas mais altas que max_height são cortadas.
+    """
+    metrics = driver.execute_script(PAGE_METRICS_SCRIPT)
+    dpr = float(metrics["dpr"] or 1)
+    height = max(1, int(metrics["height"]))
+    if max_height and height > max_height:
+        print(f"[WARN] Página com {height}px de altura; screenshot limitado a {max_height}px")
+        height = int(max_height)
+
+    image = None
+    try:
+        if use_cdp and hasattr(driver, "execute_cdp_cmd"):
+            try:
+                width = min(int(metrics["width"]), MAX_PAGE_WIDTH)
+                image = StitchedImage(width, height, work_dir)
+                for top, tile in _cdp_tiles(driver, width, height, dpr, tile_height):
+                    image.write(top, tile)
+                return image
+            except WebDriverException as e:
+                print(f"[WARN] Captura via CDP indisponível, rolando a página: {e}")
+                image.close()
+                image = None
+
+        width = int(metrics["viewport_width"])
+        image = StitchedImage(width, height, work_dir)
+        for top, tile in _scroll_tiles(driver, width, height, int(metrics["viewport_height"]), dpr):
+            image.write(top, tile)
+        driver.execute_script("window.scrollTo(arguments[0], arguments[1]);",
+                              metrics["scroll_x"], metrics["scroll_y"])
+        return image
+    except Exception:
+        if image is not None:
+            image.close()
+        raise
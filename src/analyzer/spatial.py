@@ -0,0 +1,169 @@
+# src/analyzer/spatial.py
+"""Índice espacial (grade uniforme) sobre os retângulos do estrutura.json.
+
+Cada elemento é registrado nas células da grade que sua caixa cobre; as
+consultas só olham as células da região pedida. Elementos enormes (body,
+contêineres da página inteira) ficam numa lista à parte, verificada
+sempre, para não ocupar centenas de células.
+
+As consultas retornam posições na lista `structure` (o ID de linha usado
+pelo dashboard); use `index.structure[i]` para o elemento.
+"""
+import math
+from collections import defaultdict
+
+DEFAULT_CELL_SIZE = 256
+# Acima disso o elemento vai para a lista de elementos grandes
+MAX_CELLS_PER_ELEMENT = 64
+
+def element_rect(el):
+    """(x, y, largura, altura) do elemento em float, ou None se faltar coordenada."""
+    try:
+        return (float(el["x"]), float(el["y"]), float(el.get("width") or 0), float(el.get("height") or 0))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def _rects(structure):
+    """element_rect de cada elemento; de uma estrutura colunar (.frame) lê as colunas direto."""
+    frame = getattr(structure, "frame", None)
+    if frame is None:
+        return (element_rect(el) for el in structure)
+    return zip(*(frame[col].to_numpy(float).tolist() for col in ("x", "y", "width", "height")))
+
+class SpatialIndex:
+    """Grade de células cell_size x cell_size com as caixas e os centros dos elementos."""
+    def __init__(self, structure, cell_size=DEFAULT_CELL_SIZE):
+        self.structure = structure
+        self.cell_size = cell_size
+        self.rects = {}
+        self.centers = {}
+        self._cells = defaultdict(list)
+        self._center_cells = defaultdict(list)
+        self._large = []
+        for i, rect in enumerate(_rects(structure)):
+            if rect is None:
+                continue
+            x, y, w, h = rect
+            # Larguras negativas (raras) viram caixas normalizadas
+            x0, x1 = sorted((x, x + w))
+            y0, y1 = sorted((y, y + h))
+            self.rects[i] = (x0, y0, x1, y1)
+            center = ((x0 + x1) / 2, (y0 + y1) / 2)
+            self.centers[i] = center
+            self._center_cells[self._cell(*center)].append(i)
+            (ci0, cj0), (ci1, cj1) = self._cell(x0, y0), self._cell(x1, y1)
+            if (ci1 - ci0 + 1) * (cj1 - cj0 + 1) > MAX_CELLS_PER_ELEMENT:
+                self._large.append(i)
+                continue
+            for ci in range(ci0, ci1 + 1):
+                for cj in range(cj0, cj1 + 1):
+                    self._cells[(ci, cj)].append(i)
+        if self._center_cells:
+            cols = [c[0] for c in self._center_cells]
+            rows = [c[1] for c in self._center_cells]
+            self._bounds = (min(cols), min(rows), max(cols), max(rows))
+        else:
+            self._bounds = None
+
+    def __len__(self):
+        return len(self.rects)
+
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def _area(self, i):
+        x0, y0, x1, y1 = self.rects[i]
+        return (x1 - x0) * (y1 - y0)
+
+    def at_point(self, x, y):
+        """Elementos cuja caixa contém (x, y), do menor (mais específico) ao maior."""
+        found = [i for i in self._cells.get(self._cell(x, y), []) + self._large
+                 if self._contains(i, x, y)]
+        return sorted(found, key=lambda i: (self._area(i), i))
+
+    def _contains(self, i, x, y):
+        x0, y0, x1, y1 = self.rects[i]
+        return x0 <= x <= x1 and y0 <= y <= y1
+
+    def in_rect(self, x, y, width, height, contained=False):
+        """Elementos que cruzam o retângulo (ou, com contained, que estão dentro dele), na ordem do documento."""
+        qx0, qx1 = sorted((x, x + width))
+        qy0, qy1 = sorted((y, y + height))
+        (ci0, cj0), (ci1, cj1) = self._cell(qx0, qy0), self._cell(qx1, qy1)
+        candidates = set(self._large)
+        if self._bounds is not None:
+            # Não percorre células fora da área ocupada pela página
+            ci0, cj0 = max(ci0, self._bounds[0] - MAX_CELLS_PER_ELEMENT), max(cj0, self._bounds[1] - MAX_CELLS_PER_ELEMENT)
+            ci1, cj1 = min(ci1, self._bounds[2] + MAX_CELLS_PER_ELEMENT), min(cj1, self._bounds[3] + MAX_CELLS_PER_ELEMENT)
+        for ci in range(ci0, ci1 + 1):
+            for cj in range(cj0, cj1 + 1):
+                candidates.update(self._cells.get((ci, cj), ()))
+        found = []
+        for i in candidates:
+            x0, y0, x1, y1 = self.rects[i]
+            if contained:
+                hit = qx0 <= x0 and x1 <= qx1 and qy0 <= y0 and y1 <= qy1
+            else:
+                hit = x0 <= qx1 and qx0 <= x1 and y0 <= qy1 and qy0 <= y1
+            if hit:
+                found.append(i)
+        return sorted(found)
+
+    def nearest(self, target, n=5, max_distance=None):
+        """Os n elementos com centro mais próximo do alvo: [(distância, posição), ...].
+
+        target é a posição de um elemento da estrutura (excluído do resultado)
+        ou um ponto (x, y). Com n=None retorna todos até max_distance.
+        """
+        if isinstance(target, tuple):
+            (tx, ty), skip = target, None
+        else:
+            if target not in self.centers:
+                return []
+            (tx, ty), skip = self.centers[target], target
+        if n is None and max_distance is None:
+            raise ValueError("nearest sem n exige max_distance")
+        if self._bounds is None:
+            return []
+
+        ci, cj = self._cell(tx, ty)
+        min_i, min_j, max_i, max_j = self._bounds
+        # Anéis de células em volta do alvo, do primeiro que toca a área ocupada ao último
+        first_ring = max(min_i - ci, ci - max_i, min_j - cj, cj - max_j, 0)
+        last_ring = max(abs(ci - min_i), abs(ci - max_i), abs(cj - min_j), abs(cj - max_j))
+        found = []
+        for ring in range(first_ring, last_ring + 1):
+            # Qualquer centro neste anel está a pelo menos (ring - 1) células do alvo
+            bound = (ring - 1) * self.cell_size
+            if max_distance is not None and bound > max_distance:
+                break
+            if n is not None and len(found) >= n and bound > found[n - 1][0]:
+                break
+            for cell in self._ring(ci, cj, ring, self._bounds):
+                for i in self._center_cells.get(cell, ()):
+                    if i == skip:
+                        continue
+                    cx, cy = self.centers[i]
+                    distance = math.hypot(cx - tx, cy - ty)
+                    if max_distance is None or distance <= max_distance:
+                        found.append((distance, i))
+            found.sort()
+        return found if n is None else found[:n]
+
+    @staticmethod
+    def _ring(ci, cj, ring, bounds):
+        """Células do anel `ring` em volta de (ci, cj), recortadas aos limites da grade."""
+        min_i, min_j, max_i, max_j = bounds
+        if ring == 0:
+            yield (ci, cj)
+            return
+        cols = range(max(ci - ring, min_i), min(ci + ring, max_i) + 1)
+        rows = range(max(cj - ring + 1, min_j), min(cj + ring - 1, max_j) + 1)
+        for j in (cj - ring, cj + ring):
+            if min_j <= j <= max_j:
+                for i in cols:
+                    yield (i, j)
+        for i in (ci - ring, ci + ring):
+            if min_i <= i <= max_i:
+                for j in rows:
+                    yield (i, j)
@@ -0,0 +1,347 @@
+# src/analyzer/storage.py
+"""Gravação e leitura do estrutura.json, do formato colunar estrutura.parquet, do NDJSON e dos deltas."""
+import hashlib
+import json
+import os
+from collections import Counter, defaultdict
+import pandas as pd
+from src.analyzer.structure_stream import STRUCTURE_INDEX, STRUCTURE_NDJSON, LazyStructure, StructureWriter
+
+# Atributos coletados de cada elemento (mesma ordem do estrutura.json)
+ATTRIBUTE_NAMES = ['name', 'id', 'class', 'type', 'placeholder', 'href', 'title', 'alt', 'value', 'src']
+
+STRUCTURE_JSON = "estrutura.json"
+STRUCTURE_PARQUET = "estrutura.parquet"
+STRUCTURE_DELTA = "estrutura.delta.json"
+STORAGE_FORMATS = ("json", "parquet", "both", "ndjson")
+
+# Delta maior que esta fração da estrutura completa: grava a estrutura inteira
+MAX_DELTA_RATIO = 0.5
+
+# Colunas com poucos valores distintos, gravadas com codificação de dicionário
+CATEGORICAL_COLUMNS = ["tag", "attr_class", "attr_type", "attr_name"]
+RECT_COLUMNS = ["x", "y", "width", "height"]
+
+def structure_to_frame(structure):
+    """Converte a lista de elementos em um DataFrame (um atributo por coluna)."""
+    columns = {
+        "index": [el["index"] for el in structure],
+        "tag": [el["tag"] for el in structure],
+        "text": [el["text"] for el in structure],
+        "value": [el["value"] for el in structure],
+    }
+    for col in RECT_COLUMNS:
+        columns[col] = [float(el[col]) for el in structure]
+    columns["xpath"] = [el["xpath"] for el in structure]
+    for name in ATTRIBUTE_NAMES:
+        columns[f"attr_{name}"] = [(el.get("attributes") or {}).get(name) for el in structure]
+    # Análises antigas trazem "type" (classificação) em vez de "attributes"
+    if any("type" in el for el in structure):
+        columns["type"] = pd.Categorical([el.get("type") for el in structure])
+
+    df = pd.DataFrame(columns)
+    df["index"] = df["index"].astype("int32")
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype("category")
+    return df
+
+def _number(value):
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+def _frame_columns(df):
+    """Colunas do DataFrame como listas Python (uma conversão por coluna)."""
+    names = ["index", "tag", "text", "value", *RECT_COLUMNS, "xpath"] + [f"attr_{name}" for name in ATTRIBUTE_NAMES]
+    columns = {name: df[name].tolist() for name in names}
+    if "type" in df.columns:
+        columns["type"] = df["type"].tolist()
+    return columns
+
+def _frame_record(columns, i):
+    """Linha i das colunas no formato do estrutura.json."""
+    attributes = {}
+    for name in ATTRIBUTE_NAMES:
+        val = columns[f"attr_{name}"][i]
+        if isinstance(val, str) and val:
+            attributes[name] = val
+    el = {
+        "index": int(columns["index"][i]),
+        "tag": columns["tag"][i],
+        "text": columns["text"][i],
+        "value": columns["value"][i],
+        "attributes": attributes,
+        "x": _number(columns["x"][i]),
+        "y": _number(columns["y"][i]),
+        "width": _number(columns["width"][i]),
+        "height": _number(columns["height"][i]),
+        "xpath": columns["xpath"][i],
+    }
+    if "type" in columns and isinstance(columns["type"][i], str):
+        el["type"] = columns["type"][i]
+    return el
+
+def frame_to_structure(df):
+    """Reconstrói a lista de dicts no formato do estrutura.json."""
+    columns = _frame_columns(df)
+    return [_frame_record(columns, i) for i in range(len(df))]
+
+class ColumnarStructure:
+    """Sequência somente leitura sobre o DataFrame do estrutura.parquet.
+
+    Quem trabalha por coluna usa `frame` direto; o dict de um elemento só é
+    montado quando ele é acessado.
+    """
+    def __init__(self, frame):
+        self.frame = frame.reset_index(drop=True)
+        self._columns = None
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _record(self, i):
+        if self._columns is None:
+            self._columns = _frame_columns(self.frame)
+        return _frame_record(self._columns, i)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._record(i) for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return self._record(position)
+
+    def __iter__(self):
+        return (self._record(i) for i in range(len(self)))
+
+    def __eq__(self, other):
+        if isinstance(other, (list, ColumnarStructure, LazyStructure)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+def save_structure(structure, output_dir, fmt="json"):
+    """Grava a estrutura no formato escolhido; retorna os caminhos gravados."""
+    if fmt not in STORAGE_FORMATS:
+        raise ValueError(f"Formato de armazenamento inválido: {fmt}")
+    paths = []
+    if fmt in ("json", "both"):
+        path = os.path.join(output_dir, STRUCTURE_JSON)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(structure, f, ensure_ascii=False, indent=2)
+        paths.append(path)
+    if fmt in ("parquet", "both"):
+        path = os.path.join(output_dir, STRUCTURE_PARQUET)
+        structure_to_frame(structure).to_parquet(path, index=False, compression="zstd")
+        paths.append(path)
+    if fmt == "ndjson":
+        with StructureWriter(output_dir) as writer:
+            for el in structure:
+                writer.write(el)
+        paths += [writer.path, writer.index_path]
+    return paths
+
+def remove_ndjson(output_dir):
+    """Apaga estrutura.ndjson e o índice (quando a análise fica só com ponteiro/delta)."""
+    for name in (STRUCTURE_NDJSON, STRUCTURE_INDEX):
+        path = os.path.join(output_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+def find_structure_file(analysis_dir):
+    """Arquivo de estrutura da análise (prefere o colunar; o delta por último), ou None."""
+    for name in (STRUCTURE_PARQUET, STRUCTURE_JSON, STRUCTURE_NDJSON, STRUCTURE_DELTA):
+        path = os.path.join(analysis_dir, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+def load_structure(analysis_dir, as_dataframe=False, tags=None):
+    """Carrega a estrutura de uma análise como sequência de dicts ou DataFrame.
+
+    Do estrutura.parquet vem uma ColumnarStructure (colunas em .frame, dicts
+    montados sob demanda); do estrutura.ndjson, uma LazyStructure (lida pelo
+    índice). tags: só os elementos com essas tags, na ordem da página.
+    """
+    path = find_structure_file(analysis_dir)
+    if path is None:
+        raise FileNotFoundError(f"Nenhum {STRUCTURE_JSON}/{STRUCTURE_PARQUET} em {analysis_dir}")
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+        if tags is not None:
+            df = df[df["tag"].isin(tags)]
+        return df.reset_index(drop=True) if as_dataframe else ColumnarStructure(df)
+    if path.endswith(STRUCTURE_NDJSON):
+        structure = LazyStructure(path)
+    elif path.endswith(STRUCTURE_DELTA):
+        structure = _resolve_delta(analysis_dir)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            structure = json.load(f)
+    if tags is not None:
+        structure = [el for el in structure if el.get("tag") in tags]
+    return structure_to_frame(list(structure)) if as_dataframe else structure
+
+# ---------------------------------------------------------------------------
+# Reanálise incremental: ponteiro (nada mudou) ou delta contra uma análise completa
+# ---------------------------------------------------------------------------
+
+def _content_key(el):
+    attributes = sorted((el.get("attributes") or {}).items())
+    return json.dumps([el.get("tag"), el.get("text"), el.get("value"), attributes],
+                      ensure_ascii=False, separators=(",", ":"))
+
+def element_hash(el):
+    """Hash do registro do elemento (tag, atributos, texto, retângulo e xpath)."""
+    rect = [float(el[col]) for col in RECT_COLUMNS]
+    payload = json.dumps([_content_key(el), rect, el.get("xpath")], separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+def diff_structures(base, structure):
+    """Delta de structure em relação a base: elementos adicionados, removidos e movidos.
+
+    "Movido" é o elemento com o mesmo conteúdo (tag, atributos, texto) cujo
+    retângulo ou xpath mudou. `order` e `index` permitem reconstruir a lista
+    exatamente como foi extraída.
+    """
+    base_hashes = [element_hash(el) for el in base]
+    hashes = [element_hash(el) for el in structure]
+
+    available = Counter(base_hashes)
+    new = []
+    for el, h in zip(structure, hashes):
+        if available[h] > 0:
+            available[h] -= 1
+        else:
+            new.append((el, h))
+    gone = defaultdict(list)
+    for el, h in zip(base, base_hashes):
+        if available[h] > 0:
+            available[h] -= 1
+            gone[_content_key(el)].append(h)
+
+    added, moved = {}, {}
+    for el, h in new:
+        candidates = gone.get(_content_key(el))
+        if candidates:
+            moved[h] = {"from": candidates.pop(0), "x": el["x"], "y": el["y"], "width": el["width"],
+                        "height": el["height"], "xpath": el["xpath"]}
+        else:
+            added[h] = el
+    return {
+        "order": hashes,
+        "index": [el["index"] for el in structure],
+        "added": added,
+        "moved": moved,
+        "removed": [h for remaining in gone.values() for h in remaining],
+    }
+
+def apply_delta(base, delta):
+    """Reconstrói a estrutura a partir da base e de um delta de diff_structures."""
+    by_hash = {}
+    for el in base:
+        by_hash.setdefault(element_hash(el), el)
+    structure = []
+    for h, index in zip(delta["order"], delta["index"]):
+        if h in delta["added"]:
+            el = dict(delta["added"][h])
+        elif h in delta["moved"]:
+            change = delta["moved"][h]
+            el = dict(by_hash[change["from"]], **{k: v for k, v in change.items() if k != "from"})
+        else:
+            el = dict(by_hash[h])
+        el["index"] = index
+        structure.append(el)
+    return structure
+
+def _read_delta(analysis_dir):
+    path = os.path.join(analysis_dir, STRUCTURE_DELTA)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _base_dir(analysis_dir, delta):
+    return os.path.normpath(os.path.join(analysis_dir, delta["base"]))
+
+def _has_full_structure(analysis_dir):
+    return any(os.path.exists(os.path.join(analysis_dir, name))
+               for name in (STRUCTURE_PARQUET, STRUCTURE_JSON, STRUCTURE_NDJSON))
+
+def _resolve_delta(analysis_dir):
+    delta = _read_delta(analysis_dir)
+    base_dir = _base_dir(analysis_dir, delta)
+    if not os.path.isdir(base_dir):
+        raise FileNotFoundError(f"Análise base de {analysis_dir} não existe mais: {base_dir}")
+    base = load_structure(base_dir)
+    return base if delta.get("unchanged") else apply_delta(base, delta)
+
+def _stored_dir(analysis_dir):
+    """Diretório que guarda os dados da análise (segue o ponteiro de uma análise inalterada)."""
+    delta = _read_delta(analysis_dir)
+    if delta is not None and delta.get("unchanged") and not _has_full_structure(analysis_dir):
+        return _base_dir(analysis_dir, delta)
+    return analysis_dir
+
+def _full_dir(analysis_dir):
+    """Diretório com a estrutura completa da qual a análise depende."""
+    for _ in range(3):
+        if _has_full_structure(analysis_dir):
+            return analysis_dir
+        delta = _read_delta(analysis_dir)
+        if delta is None:
+            break
+        analysis_dir = _base_dir(analysis_dir, delta)
+    raise FileNotFoundError(f"Nenhuma estrutura completa encontrada a partir de {analysis_dir}")
+
+def _write_delta(output_dir, delta):
+    path = os.path.join(output_dir, STRUCTURE_DELTA)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(delta, f, ensure_ascii=False, separators=(",", ":"))
+    return path
+
+def save_incremental(structure, output_dir, previous_dir, fmt="json"):
+    """Grava a estrutura comparando com a análise anterior da mesma URL.
+
+    Retorna (status, caminhos, resumo), com status "unchanged" (só um
+    ponteiro para a análise anterior), "delta" (adicionados/removidos/movidos
+    contra a última análise completa) ou "full" (delta não compensa).
+    Com fmt=None a estrutura completa já está no disco (NDJSON gravado na
+    extração) e o caso "full" não grava nada. Apagar a análise base invalida os ponteiros e deltas que dependem dela.
+    """
+    previous = load_structure(previous_dir)
+    if previous == structure:
+        target = _stored_dir(previous_dir)
+        path = _write_delta(output_dir, {
+            "base": os.path.relpath(target, output_dir),
+            "unchanged": True,
+            "elements": len(structure),
+        })
+        return "unchanged", [path], {"added": 0, "removed": 0, "moved": 0}
+
+    full_dir = _full_dir(previous_dir)
+    base = previous if full_dir == previous_dir else load_structure(full_dir)
+    delta = diff_structures(base, structure)
+    summary = {"added": len(delta["added"]), "removed": len(delta["removed"]), "moved": len(delta["moved"])}
+    delta_size = len(json.dumps(delta, ensure_ascii=False, separators=(",", ":")))
+    full_size = len(json.dumps(structure, ensure_ascii=False, separators=(",", ":")))
+    if delta_size > MAX_DELTA_RATIO * full_size:
+        return "full", save_structure(structure, output_dir, fmt) if fmt else [], summary
+
+    delta.update(base=os.path.relpath(full_dir, output_dir), unchanged=False, elements=len(structure))
+    return "delta", [_write_delta(output_dir, delta)], summary
+
+def structure_base(analysis_dir):
+    """Análise da qual esta depende (ponteiro ou delta), ou None se é completa."""
+    delta = _read_delta(analysis_dir)
+    if delta is None or _has_full_structure(analysis_dir):
+        return None
+    return _base_dir(analysis_dir, delta)
+
+def resolve_artifact(analysis_dir, name):
+    """Caminho de um artefato (p.ex. pagina_anotada.png), seguindo o ponteiro de análises inalteradas."""
+    for directory in (analysis_dir, _stored_dir(analysis_dir)):
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            return path
+    return None
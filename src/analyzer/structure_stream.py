@@ -0,0 +1,237 @@
+# src/analyzer/structure_stream.py
+"""Estrutura em NDJSON gravada durante a extração, com índice ordenado à parte.
+
+estrutura.ndjson recebe um elemento por linha, na ordem em que a extração os
+entrega, com flush periódico: se a análise cair no meio, o que já foi
+extraído está no disco. Ao fechar, estrutura.ndjson.idx guarda a ordem da
+página (y, x, ordem de extração) com o deslocamento de cada linha; ele é
+montado por intercalação externa (blocos ordenados de RUN_SIZE chaves
+intercalados com heapq.merge), sem a lista inteira em memória.
+
+LazyStructure lê a estrutura pelo índice sob demanda: len(), iteração e
+estrutura[i] funcionam como na lista, decodificando só as linhas usadas.
+"""
+import heapq
+import json
+import os
+import tempfile
+import time
+import numpy as np
+
+STRUCTURE_NDJSON = "estrutura.ndjson"
+STRUCTURE_INDEX = "estrutura.ndjson.idx"
+
+# Flush a cada N elementos ou T segundos, o que vier primeiro
+FLUSH_EVERY = 500
+FLUSH_INTERVAL = 1.0
+# Chaves por bloco ordenado da intercalação externa
+RUN_SIZE = 100_000
+# Registros lidos por vez de cada bloco durante a intercalação
+MERGE_BLOCK = 8192
+
+INDEX_DTYPE = np.dtype([("y", "<f8"), ("x", "<f8"), ("seq", "<i8"), ("offset", "<i8")])
+
+def _key(el, seq, offset):
+    try:
+        y, x = float(el.get("y")), float(el.get("x"))
+    except (TypeError, ValueError):
+        y = x = float("inf")
+    return (y, x, seq, offset)
+
+class _IndexBuilder:
+    """Acumula chaves e grava o índice ordenado, derramando blocos ordenados em disco."""
+    def __init__(self, directory):
+        self.directory = directory
+        self.keys = []
+        self.runs = []
+
+    def add(self, key):
+        self.keys.append(key)
+        if len(self.keys) >= RUN_SIZE:
+            self._spill()
+
+    def _sorted_keys(self):
+        run = np.array(self.keys, dtype=INDEX_DTYPE)
+        self.keys = []
+        run.sort(order=("y", "x", "seq"))
+        return run
+
+    def _spill(self):
+        fd, path = tempfile.mkstemp(prefix="estrutura_run_", suffix=".bin", dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            self._sorted_keys().tofile(f)
+        self.runs.append(path)
+
+    @staticmethod
+    def _read_run(path):
+        run = np.memmap(path, dtype=INDEX_DTYPE, mode="r") if os.path.getsize(path) else []
+        for start in range(0, len(run), MERGE_BLOCK):
+            yield from run[start:start + MERGE_BLOCK].tolist()
+
+    def write(self, path):
+        tmp_path = path + ".tmp"
+        try:
+            if not self.runs:
+                with open(tmp_path, "wb") as f:
+                    self._sorted_keys().tofile(f)
+            else:
+                if self.keys:
+                    self._spill()
+                merged = heapq.merge(*(self._read_run(run) for run in self.runs))
+                with open(tmp_path, "wb") as f:
+                    block = []
+                    for key in merged:
+                        block.append(key)
+                        if len(block) >= MERGE_BLOCK:
+                            np.array(block, dtype=INDEX_DTYPE).tofile(f)
+                            block = []
+                    np.array(block, dtype=INDEX_DTYPE).tofile(f)
+            os.replace(tmp_path, path)
+        finally:
+            self.discard()
+
+    def discard(self):
+        for run in self.runs:
+            try:
+                os.remove(run)
+            except OSError:
+                pass
+        self.runs = []
+        self.keys = []
+
+class StructureWriter:
+    """Grava elementos em estrutura.ndjson conforme chegam; close() monta o índice.
+
+    Uso:
+        with StructureWriter(output_dir) as writer:
+            for el in elementos:
+                writer.write(el)
+        estrutura = writer.structure   # LazyStructure na ordem da página
+    """
+    def __init__(self, output_dir, flush_every=FLUSH_EVERY, flush_interval=FLUSH_INTERVAL):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, STRUCTURE_NDJSON)
+        self.index_path = os.path.join(output_dir, STRUCTURE_INDEX)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.count = 0
+        self.structure = None
+        self._offset = 0
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        self._index = _IndexBuilder(output_dir)
+        # Um índice antigo não pode descrever o arquivo novo
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+        self._file = open(self.path, "wb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def write(self, el):
+        line = (json.dumps(el, ensure_ascii=False) + "\n").encode("utf-8")
+        self._file.write(line)
+        self._index.add(_key(el, self.count, self._offset))
+        self._offset += len(line)
+        self.count += 1
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Fecha o NDJSON, grava o índice ordenado e retorna a LazyStructure."""
+        if self.structure is None:
+            self._file.close()
+            self._index.write(self.index_path)
+            self.structure = LazyStructure(self.path, self.index_path)
+        return self.structure
+
+    def abort(self):
+        """Fecha o arquivo sem índice (o que já foi gravado continua legível)."""
+        if not self._file.closed:
+            self._file.close()
+        self._index.discard()
+
+def build_index(path, index_path=None):
+    """(Re)monta o índice de um estrutura.ndjson (p.ex. de uma análise interrompida).
+
+    Uma última linha incompleta é ignorada.
+    """
+    index_path = index_path or os.path.join(os.path.dirname(path), STRUCTURE_INDEX)
+    builder = _IndexBuilder(os.path.dirname(path) or ".")
+    offset = seq = 0
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                el = json.loads(line)
+            except ValueError:
+                break
+            builder.add(_key(el, seq, offset))
+            offset += len(line)
+            seq += 1
+    builder.write(index_path)
+    return index_path
+
+def count_elements(path):
+    """Número de elementos de um estrutura.ndjson (pelo índice, se houver)."""
+    index_path = os.path.join(os.path.dirname(path), STRUCTURE_INDEX)
+    if os.path.exists(index_path):
+        return os.path.getsize(index_path) // INDEX_DTYPE.itemsize
+    with open(path, "rb") as f:
+        return sum(1 for line in f if line.endswith(b"\n"))
+
+class LazyStructure:
+    """Sequência somente leitura sobre estrutura.ndjson, na ordem do índice."""
+    def __init__(self, path, index_path=None):
+        self.path = path
+        index_path = index_path or os.path.join(os.path.dirname(path), STRUCTURE_INDEX)
+        if not os.path.exists(index_path):
+            build_index(path, index_path)
+        if os.path.getsize(index_path):
+            self._offsets = np.memmap(index_path, dtype=INDEX_DTYPE, mode="r")["offset"]
+        else:
+            self._offsets = np.zeros(0, dtype=np.int64)
+        self._file = None
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _read(self, offset):
+        if self._file is None:
+            self._file = open(self.path, "rb")
+        self._file.seek(int(offset))
+        return json.loads(self._file.readline())
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._read(offset) for offset in self._offsets[position]]
+        return self._read(self._offsets[position])
+
+    def __iter__(self):
+        # Arquivo próprio: iterações simultâneas não disputam a posição de leitura
+        with open(self.path, "rb") as f:
+            for offset in self._offsets:
+                f.seek(int(offset))
+                yield json.loads(f.readline())
+
+    def __eq__(self, other):
+        if isinstance(other, (list, LazyStructure)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,72 @@
+# src/analyzer/viewer.py
+"""Visualizador HTML com os dados em partes carregadas sob demanda.
+
+O visualizador.html é sempre o mesmo arquivo (templates/visualizador_lazy.html):
+título, URL e elementos ficam em visualizador_dados/, como scripts
+(manifest.js e parte_NNNN.js) que chamam window.wcaViewer — assim a página
+funciona aberta direto do disco (file://), onde fetch() de JSON é bloqueado.
+Cada parte guarda CHUNK_SIZE elementos como listas compactas na ordem de
+COLUMNS; a página só pede as partes que a rolagem ou a busca alcançam.
+"""
+import json
+import os
+from src.core.config import Config
+
+VIEWER_DATA_DIR = "visualizador_dados"
+VIEWER_TEMPLATE = "visualizador_lazy.html"
+CHUNK_SIZE = 500
+COLUMNS = ("index", "tag", "type", "text", "value", "x", "y", "width", "height", "xpath")
+VIEWER_MODES = ("lazy", "inline")
+
+def _script(call, *args):
+    payload = ",".join(json.dumps(a, ensure_ascii=False, separators=(",", ":")) for a in args)
+    return f"window.wcaViewer.{call}({payload});\n".encode("utf-8")
+
+def _write(path, data, store=None):
+    if store is not None:
+        store.put_bytes(data, path)
+        return
+    with open(path, "wb") as f:
+        f.write(data)
+
+def write_viewer_data(structure, data_dir, page_title, url):
+    """Grava as partes e o manifest.js em data_dir lendo a estrutura uma única vez.
+
+    As partes são arquivos comuns (não passam pelo BlobStore): mudam a cada
+    análise, então não há o que deduplicar.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    for name in os.listdir(data_dir):
+        if name.startswith("parte_") and name.endswith(".js"):
+            os.remove(os.path.join(data_dir, name))
+
+    chunks, rows = [], []
+
+    def flush():
+        name = f"parte_{len(chunks):04d}.js"
+        _write(os.path.join(data_dir, name), _script("chunk", len(chunks), rows))
+        chunks.append(name)
+
+    total = 0
+    for el in structure:
+        rows.append([el.get(column) for column in COLUMNS])
+        total += 1
+        if len(rows) == CHUNK_SIZE:
+            flush()
+            rows = []
+    if rows:
+        flush()
+
+    manifest = {"title": page_title, "url": url, "total": total, "chunk_size": CHUNK_SIZE,
+                "columns": list(COLUMNS), "chunks": chunks}
+    _write(os.path.join(data_dir, "manifest.js"), _script("manifest", manifest))
+    return total
+
+def generate_lazy_viewer(structure, output_path, page_title, url, store=None):
+    """visualizador.html fixo + visualizador_dados/ ao lado dele."""
+    data_dir = os.path.join(os.path.dirname(output_path), VIEWER_DATA_DIR)
+    write_viewer_data(structure, data_dir, page_title, url)
+    with open(os.path.join(Config.TEMPLATES_DIR, VIEWER_TEMPLATE), "rb") as f:
+        html = f.read()
+    # Página idêntica em todas as análises: no BlobStore vira um único blob
+    _write(output_path, html, store)
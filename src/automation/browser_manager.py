@@ -1,21 +1,238 @@
 ﻿# src/automation/browser_manager.py
+import atexit
+import queue
+import threading
+import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import WebDriverException
 from src.core.config import Config
+from src.core.logger import logger
+from src.automation.driver_resolver import resolve_chromedriver
+
+# Limpa o armazenamento da origem atual antes de voltar para about:blank
+CLEAR_STORAGE_SCRIPT = """
+    try { window.localStorage.clear(); } catch (e) {}
+    try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+# Espera máxima por vez na fila de ociosos antes de tentar reservar uma vaga de novo
+ACQUIRE_POLL_INTERVAL = 0.5
+
+def create_driver(headless=None):
+    """Inicia um Chrome com as opções padrão do projeto."""
+    if headless is None:
+        headless = Config.CHROME_HEADLESS
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1200,800")
+    return webdriver.Chrome(service=Service(resolve_chromedriver()), options=options)
+
+def reset_driver(driver):
+    """Remove cookies e storage e deixa o navegador em about:blank."""
+    driver.execute_script(CLEAR_STORAGE_SCRIPT)
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    except Exception:
+        driver.delete_all_cookies()
+    driver.get("about:blank")
+
+class BrowserPool:
+    """Mantém N navegadores já iniciados e os empresta via context manager.
+
+    Uso:
+        pool = BrowserPool(size=2)
+        with pool.browser() as driver:       # ou: with BrowserManager(pool=pool)
+            driver.get(url)
+        pool.close()
+
+    Na devolução o navegador é limpo (cookies, storage, about:blank). Ele é
+    descartado e substituído após `max_uses` empréstimos ou quando trava.
+    headless=None segue Config.CHROME_HEADLESS.
+    """
+    def __init__(self, size=None, max_uses=None, headless=None, prelaunch=True):
+        self.size = size or Config.BROWSER_POOL_SIZE
+        self.max_uses = max_uses or Config.BROWSER_MAX_USES
+        self.headless = Config.CHROME_HEADLESS if headless is None else headless
+        self._idle = queue.LifoQueue()
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._total = 0
+        self._closed = False
+        if prelaunch:
+            self.warm()
+
+    def warm(self):
+        """Completa o pool até `size` navegadores, iniciando-os em paralelo."""
+        threads = [threading.Thread(target=self._launch_idle, daemon=True)
+                   for _ in range(self._reserve(self.size))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def _reserve(self, wanted):
+        """Reserva vagas para novos navegadores sem ultrapassar `size`."""
+        with self._lock:
+            free = max(0, min(wanted, self.size - self._total))
+            self._total += free
+            return free
+
+    def _release_slot(self):
+        with self._lock:
+            self._total -= 1
+
+    def _launch(self):
+        try:
+            driver = create_driver(headless=self.headless)
+        except Exception:
+            self._release_slot()
+            raise
+        with self._lock:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _launch_idle(self):
+        try:
+            driver = self._launch()
+        except Exception as e:
+            logger.error(f"Falha ao iniciar navegador do pool: {e}")
+            return
+        if self._closed:
+            # Reposição que terminou depois do close(): ninguém mais vai buscá-la
+            self._discard(driver, replace=False)
+            return
+        self._idle.put(driver)
+
+    def _discard(self, driver, replace=True):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        self._release_slot()
+        # Repõe o navegador em segundo plano para o próximo empréstimo já sair quente
+        if replace and not self._closed and self._reserve(1):
+            threading.Thread(target=self._launch_idle, daemon=True).start()
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def acquire(self, timeout=None):
+        """Retira um navegador do pool (bloqueia se todos estiverem em uso).
+
+        A espera é feita em fatias de ACQUIRE_POLL_INTERVAL: se o navegador de
+        reposição não subir, a vaga dele volta e é reservada aqui mesmo.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._closed:
+                raise RuntimeError("BrowserPool já foi encerrado.")
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                if self._reserve(1):
+                    return self._launch()
+                wait = ACQUIRE_POLL_INTERVAL
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                    if wait <= 0:
+                        raise TimeoutError("Nenhum navegador disponível no pool.")
+                try:
+                    driver = self._idle.get(timeout=wait)
+                except queue.Empty:
+                    continue
+            if self._is_alive(driver):
+                return driver
+            logger.warning("Navegador do pool não responde; substituindo.")
+            self._discard(driver)
+
+    def release(self, driver, broken=False):
+        """Devolve um navegador ao pool, limpando-o ou reciclando-o."""
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+        if self._closed:
+            self._discard(driver, replace=False)
+            return
+        if broken or uses >= self.max_uses:
+            self._discard(driver)
+            return
+        try:
+            reset_driver(driver)
+        except WebDriverException as e:
+            logger.warning(f"Falha ao limpar navegador do pool; reciclando: {e}")
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    def browser(self, timeout=None):
+        """Context manager equivalente a `with BrowserManager() as driver`."""
+        return BrowserManager(pool=self, timeout=timeout)
+
+    def close(self):
+        """Encerra todos os navegadores ociosos; os emprestados fecham ao voltar."""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver, replace=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+def get_shared_pool():
+    """Pool único por processo, encerrado automaticamente na saída.
+
+    Os navegadores sobem no primeiro empréstimo (sem prelaunch) e ficam
+    abertos para os seguintes.
+    """
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None or _shared_pool._closed:
+            _shared_pool = BrowserPool(prelaunch=False)
+            atexit.register(_shared_pool.close)
+        return _shared_pool
 
 class BrowserManager:
-    """Gerenciador de navegador com suporte a contexto (with statement)."""
+    """Gerenciador de navegador com suporte a contexto (with statement).
+
+    Empresta um navegador do pool compartilhado (get_shared_pool), ou de
+    `pool`; com pool=False inicia um navegador só para este bloco.
+    """
+    def __init__(self, pool=None, timeout=None):
+        self.pool = get_shared_pool() if pool is None else pool or None
+        self.timeout = timeout
+
     def __enter__(self):
-        options = webdriver.ChromeOptions()
-        if Config.CHROME_HEADLESS:
-            options.add_argument("--headless=new")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--window-size=1200,800")
-        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        if self.pool is not None:
+            self.driver = self.pool.acquire(timeout=self.timeout)
+        else:
+            self.driver = create_driver()
         return self.driver
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if hasattr(self, 'driver'):
+        if not hasattr(self, 'driver'):
+            return
+        if self.pool is not None:
+            broken = exc_type is not None and issubclass(exc_type, WebDriverException)
+            self.pool.release(self.driver, broken=broken)
+        else:
             self.driver.quit()
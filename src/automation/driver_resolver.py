@@ -0,0 +1,119 @@
+# src/automation/driver_resolver.py
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from webdriver_manager.chrome import ChromeDriverManager
+from src.core.config import Config
+from src.core.logger import logger
+
+# Registro do chromedriver resolvido (caminho + versão do Chrome)
+DRIVER_CACHE_FILE = Config.DATA_DIR / "chromedriver.json"
+
+# Executáveis consultados com --version fora do Windows
+CHROME_BINARIES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+_VERSION_RE = re.compile(r"(\d+\.\d+\.\d+\.\d+)")
+_resolved_path = None
+_lock = threading.Lock()
+
+def _chrome_version_windows():
+    import winreg
+    keys = [
+        (winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon"),
+        (winreg.HKEY_LOCAL_MACHINE, r"Software\Google\Chrome\BLBeacon"),
+        (winreg.HKEY_LOCAL_MACHINE, r"Software\WOW6432Node\Google\Chrome\BLBeacon"),
+    ]
+    for hive, path in keys:
+        try:
+            with winreg.OpenKey(hive, path) as key:
+                return winreg.QueryValueEx(key, "version")[0]
+        except OSError:
+            continue
+    return None
+
+def _chrome_version_unix():
+    for binary in CHROME_BINARIES:
+        try:
+            output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = _VERSION_RE.search(output)
+        if match:
+            return match.group(1)
+    return None
+
+def detect_chrome_version():
+    """Versão do Chrome instalado, lida localmente (registro ou --version)."""
+    try:
+        if sys.platform.startswith("win"):
+            return _chrome_version_windows()
+        return _chrome_version_unix()
+    except Exception as e:
+        logger.warning(f"Não foi possível detectar a versão do Chrome: {e}")
+        return None
+
+def _load_cache():
+    try:
+        with open(DRIVER_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_cache(driver_path, chrome_version):
+    data = {
+        "driver_path": str(driver_path),
+        "chrome_version": chrome_version,
+        "resolved_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    with open(DRIVER_CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def resolve_chromedriver(force=False):
+    """Caminho do chromedriver, reutilizando o registro salvo em DATA_DIR.
+
+    Só chama o webdriver-manager quando não há registro, quando o executável
+    sumiu ou quando a versão do Chrome instalado mudou. Sem rede, mantém o
+    driver registrado. CHROMEDRIVER_PATH no .env tem prioridade sobre tudo.
+    """
+    global _resolved_path
+    env_path = os.getenv("CHROMEDRIVER_PATH")
+    if env_path:
+        return env_path
+
+    with _lock:
+        if _resolved_path and not force:
+            return _resolved_path
+
+        chrome_version = detect_chrome_version()
+        cache = _load_cache()
+        cached_path = cache.get("driver_path") if cache else None
+        cached_exists = bool(cached_path) and Path(cached_path).is_file()
+
+        if not force and cached_exists and (chrome_version is None or cache.get("chrome_version") == chrome_version):
+            _resolved_path = cached_path
+            return _resolved_path
+
+        try:
+            driver_path = ChromeDriverManager().install()
+        except Exception as e:
+            if cached_exists:
+                logger.warning(f"Falha ao resolver chromedriver ({e}); usando o registrado: {cached_path}")
+                _resolved_path = cached_path
+                return _resolved_path
+            raise
+
+        _save_cache(driver_path, chrome_version)
+        logger.info(f"chromedriver resolvido para Chrome {chrome_version}: {driver_path}")
+        _resolved_path = driver_path
+        return _resolved_path
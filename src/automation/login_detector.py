@@ -0,0 +1,228 @@
+# src/automation/login_detector.py
+"""Detecção do formulário de login a partir do estrutura.json.
+
+Todas as palavras-chave ficam em uma única regex compilada; cada elemento é
+lido uma vez, recebe uma pontuação por papel (email, senha, botão, lembrar)
+e os candidatos são agrupados pelo <form> que os contém ou, sem form, pela
+distância até o campo de senha (consultada no índice espacial dos candidatos).
+"""
+import math
+import re
+from src.analyzer.spatial import SpatialIndex, element_rect
+
+ROLES = ("email", "password", "submit", "remember")
+
+# Palavra-chave -> pesos por papel. Pesos negativos afastam o papel (caixa de busca).
+KEYWORDS = {
+    "email": {"email": 3},
+    "e-mail": {"email": 3},
+    "usuario": {"email": 2},
+    "usuário": {"email": 2},
+    "nome de usuário": {"email": 2},
+    "username": {"email": 2},
+    "user": {"email": 1},
+    "login": {"email": 1, "submit": 2},
+    "cpf": {"email": 1},
+    "senha": {"password": 3},
+    "password": {"password": 3},
+    "pass": {"password": 1},
+    "entrar": {"submit": 3},
+    "sign in": {"submit": 3},
+    "log in": {"submit": 3},
+    "acessar": {"submit": 2},
+    "logar": {"submit": 2},
+    "continuar": {"submit": 1},
+    "lembrar": {"remember": 3},
+    "remember": {"remember": 3},
+    "manter conectado": {"remember": 3},
+    "search": {"email": -6, "submit": -4},
+    "busca": {"email": -6, "submit": -4},
+    "buscar": {"email": -6, "submit": -4},
+    "pesquisa": {"email": -6, "submit": -4},
+    "pesquisar": {"email": -6, "submit": -4},
+    "query": {"email": -4},
+    "newsletter": {"email": -3, "submit": -2},
+    "cadastr": {"submit": -2},
+    "sign up": {"submit": -2},
+    "register": {"submit": -2},
+    "esqueci": {"password": -4, "submit": -3},
+    "forgot": {"password": -4, "submit": -3},
+}
+
+# Campos do elemento lidos pelo detector e o peso de uma palavra encontrada em cada um
+FIELD_WEIGHTS = (("name", 1.0), ("id", 1.0), ("placeholder", 1.0), ("title", 0.8),
+                 ("text", 0.8), ("value", 0.6), ("class", 0.4))
+
+# Uma única regex para todas as palavras; as mais longas primeiro ("e-mail" antes de "email")
+KEYWORD_RE = re.compile("|".join(re.escape(k) for k in sorted(KEYWORDS, key=len, reverse=True)))
+
+# Pontuação pelo type do elemento, antes das palavras-chave
+TYPE_SCORES = {
+    ("input", "email"): {"email": 4},
+    ("input", "text"): {"email": 0.5},
+    ("input", "tel"): {"email": 0.5},
+    ("input", ""): {"email": 0.5},
+    ("input", "password"): {"password": 6},
+    ("input", "submit"): {"submit": 2},
+    ("input", "image"): {"submit": 1},
+    ("input", "checkbox"): {"remember": 1},
+    ("input", "search"): {"email": -8, "submit": -4},
+    ("button", "submit"): {"submit": 2},
+    ("button", ""): {"submit": 1},
+    ("button", "button"): {"submit": 0.5},
+}
+
+# Papéis que cada (tag, type) pode assumir; o resto é ignorado
+ALLOWED_ROLES = {
+    "input": {"": ("email", "password", "submit"), "text": ("email", "password"),
+              "email": ("email",), "tel": ("email",), "password": ("password",),
+              "submit": ("submit",), "image": ("submit",), "button": ("submit",),
+              "checkbox": ("remember",), "search": ("email",)},
+    "button": {"": ("submit",), "submit": ("submit",), "button": ("submit",)},
+}
+
+# Tags que detect_login_form lê (candidatos e forms); quem carrega a estrutura pode filtrar por elas
+DETECTOR_TAGS = ("form", *ALLOWED_ROLES)
+
+# Bônus de grupo: mesmo <form> que a senha, ou proximidade (px) sem form
+SAME_FORM_BONUS = 3.0
+OTHER_FORM_PENALTY = -2.0
+PROXIMITY_BONUS = 2.0
+PROXIMITY_RADIUS = 600.0
+# Quantos candidatos a senha são testados como âncora do formulário
+MAX_ANCHORS = 5
+
+FORM_RE = re.compile(r"^(.*?/form\[\d+\])", re.IGNORECASE)
+
+ID_XPATH_PREFIX = '//*[@id="'
+
+def _forms(structure):
+    """(xpath, chave, retângulo) de cada <form>; a chave é a que _form_key dá aos seus campos."""
+    forms = []
+    for el in structure:
+        xpath = el.get("xpath")
+        if el.get("tag") != "form" or not xpath:
+            continue
+        match = FORM_RE.match(xpath)
+        forms.append((xpath, (match.group(1) if match else xpath).lower(), element_rect(el)))
+    return forms
+
+def _form_key(el, forms):
+    """Chave do <form> que contém o elemento (ou None)."""
+    xpath = el.get("xpath")
+    if not xpath:
+        return None
+    match = FORM_RE.match(xpath)
+    if match:
+        return match.group(1).lower()
+    # Forms com id aparecem como //*[@id="..."]: procura pelo prefixo
+    for form_xpath, key, _ in forms:
+        if xpath.startswith(form_xpath + "/"):
+            return key
+    if not xpath.startswith(ID_XPATH_PREFIX):
+        return None
+    # O XPath começa no id do próprio elemento (ou de um ancestral) e perde o caminho
+    # até o form: vale o menor form cujo retângulo contém o centro do elemento
+    rect = element_rect(el)
+    if rect is None:
+        return None
+    cx, cy = rect[0] + rect[2] / 2, rect[1] + rect[3] / 2
+    containing = [(box[2] * box[3], key) for _, key, box in forms
+                  if box is not None and box[0] <= cx <= box[0] + box[2] and box[1] <= cy <= box[1] + box[3]]
+    return min(containing)[1] if containing else None
+
+def _score(el):
+    """Pontuação do elemento em cada papel permitido pela tag/type ({} se nenhum)."""
+    tag = el.get("tag")
+    attrs = el.get("attributes") or {}
+    kind = (attrs.get("type") or "").lower()
+    allowed = ALLOWED_ROLES.get(tag, {}).get(kind)
+    if not allowed:
+        return {}
+
+    scores = dict.fromkeys(allowed, 0.0)
+    for role, points in TYPE_SCORES.get((tag, kind), {}).items():
+        if role in scores:
+            scores[role] += points
+
+    hits = False
+    for field, weight in FIELD_WEIGHTS:
+        source = el.get(field) if field in ("text", "value") else attrs.get(field)
+        if not source:
+            continue
+        for match in KEYWORD_RE.finditer(str(source).lower()):
+            for role, points in KEYWORDS[match.group(0)].items():
+                if role in scores:
+                    scores[role] += points * weight
+                    hits = hits or points > 0
+    # Input de texto sem nenhuma pista não é candidato a email
+    if "email" in scores and kind in ("", "text", "tel") and not hits:
+        scores["email"] = 0.0
+    return {role: s for role, s in scores.items() if s > 0}
+
+def _affinity(candidate, anchor):
+    """Bônus do candidato em relação ao campo de senha escolhido."""
+    if anchor is None:
+        return 0.0
+    if candidate is anchor:
+        return SAME_FORM_BONUS
+    if candidate["form"] is not None and anchor["form"] is not None:
+        return SAME_FORM_BONUS if candidate["form"] == anchor["form"] else OTHER_FORM_PENALTY
+    distance = anchor["near"].get(candidate["slot"])
+    if distance is None:
+        return 0.0
+    return PROXIMITY_BONUS * max(0.0, 1 - distance / PROXIMITY_RADIUS)
+
+def _confidence(score):
+    return round(1 - math.exp(-max(score, 0) / 4), 3)
+
+def _ranked(candidates, anchor, role, limit):
+    ranked = []
+    for c in candidates:
+        if c is anchor and role != "password":
+            continue
+        total = c["scores"][role] + _affinity(c, anchor)
+        if total > 0:
+            ranked.append((total, c))
+    ranked.sort(key=lambda item: (-item[0], item[1]["order"]))
+    return [{"element": c["element"], "score": round(total, 2), "confidence": _confidence(total),
+             "form": c["form"]} for total, c in ranked[:limit]]
+
+def detect_login_form(structure, limit=5):
+    """Candidatos de cada papel, do mais provável ao menos provável.
+
+    Retorna {"email": [...], "password": [...], "submit": [...], "remember": [...],
+    "form": xpath do form escolhido ou None}; cada candidato é
+    {"element", "score", "confidence" (0-1), "form"}.
+    """
+    forms = _forms(structure)
+    by_role = {role: [] for role in ROLES}
+    candidates = []
+    for order, el in enumerate(structure):
+        scores = _score(el)
+        if not scores:
+            continue
+        candidate = {"element": el, "scores": scores, "order": order, "slot": len(candidates),
+                     "form": _form_key(el, forms), "near": {}}
+        candidates.append(candidate)
+        for role in scores:
+            by_role[role].append(candidate)
+
+    # Âncora: a senha cujo grupo (form ou vizinhança) forma o melhor conjunto email + senha + botão
+    passwords = sorted(by_role["password"], key=lambda c: (-c["scores"]["password"], c["order"]))
+    index = SpatialIndex([c["element"] for c in candidates], cell_size=PROXIMITY_RADIUS / 2)
+    for p in passwords[:MAX_ANCHORS]:
+        # Vizinhos da senha dentro do raio de proximidade: {slot: distância}
+        p["near"] = {slot: distance for distance, slot in
+                     index.nearest(p["slot"], n=None, max_distance=PROXIMITY_RADIUS)}
+    anchor, best = None, None
+    for p in passwords[:MAX_ANCHORS]:
+        total = p["scores"]["password"]
+        for role in ("email", "submit"):
+            total += max((c["scores"][role] + _affinity(c, p) for c in by_role[role] if c is not p), default=0)
+        if best is None or total > best:
+            anchor, best = p, total
+
+    result = {role: _ranked(by_role[role], anchor, role, limit) for role in ROLES}
+    result["form"] = anchor["form"] if anchor else None
+    return result
@@ -1,15 +1,8 @@
 # autologin.py
 import os
-import json
-import time
 import sys
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import load_dotenv
 import logging
 
@@ -24,6 +17,15 @@ logging.basicConfig(
     ]
 )
 
+# Permite importar src/ ao executar este arquivo diretamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.automation.driver_resolver import resolve_chromedriver
+from src.automation.session_store import SessionStore
+from src.automation.login_detector import ROLES, detect_login_form
+from src.automation.login_plan import LoginPlanStore, execute_plan
+from src.core.analysis_index import AnalysisIndex
+from urllib.parse import urlparse
+
 # --- CARREGA CREDENCIAIS ---
 load_dotenv()
 EMAIL = os.getenv("EMAIL")
@@ -35,174 +37,93 @@ if not EMAIL or not PASSWORD:
 EMAIL = str(EMAIL)
 PASSWORD = str(PASSWORD)
 
-def get_latest_analysis_path(base_dir="analyses"):
-    if not os.path.exists(base_dir):
-        logging.error(f"Pasta '{base_dir}' não encontrada.")
-        return None, None
-
-    all_paths = []
-    for domain in os.listdir(base_dir):
-        domain_path = os.path.join(base_dir, domain)
-        if os.path.isdir(domain_path):
-            for timestamp in os.listdir(domain_path):
-                ts_path = os.path.join(domain_path, timestamp)
-                if os.path.isdir(ts_path):
-                    all_paths.append(ts_path)
-
-    if not all_paths:
+def _base_url(analysis):
+    url = analysis["url"]
+    if not url:
+        return f"https://{analysis['domain']}"
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+def get_latest_analysis(base_dir="analyses", domain=None):
+    """Linha do índice SQLite com a análise mais recente (importa base_dir se o índice estiver vazio)."""
+    index = AnalysisIndex()
+    index.ensure_populated(base_dir)
+    latest = index.latest(domain)
+    if not latest:
         logging.error("Nenhuma análise encontrada.")
-        return None, None
+    return latest
 
-    latest_analysis = max(all_paths, key=os.path.getctime)
-    domain = os.path.basename(os.path.dirname(latest_analysis))
-    url = f"https://{domain}"
-    return latest_analysis, url
+def get_latest_analysis_path(base_dir="analyses", domain=None):
+    """Análise mais recente segundo o índice SQLite (importa base_dir se o índice estiver vazio)."""
+    latest = get_latest_analysis(base_dir, domain)
+    if not latest:
+        return None, None
+    return latest["path"], _base_url(latest)
 
 def find_login_form(structure):
-    email_field = None
-    password_field = None
-    submit_button = None
-    remember_checkbox = None
-
-    email_keywords = ['email', 'usuario', 'user', 'login', 'nome de usuário']
-    password_keywords = ['senha', 'password', 'pass']
-    login_keywords = ['entrar', 'login', 'sign in', 'acessar']
-    remember_keywords = ['lembrar', 'remember', 'manter conectado']
-
-    for el in structure:
-        tag = el['tag']
-        text = (el['text'] or '').lower()
-        value = (el['value'] or '').lower()
-        attrs = el['attributes']
-        full_text = f"{text} {value} {attrs.get('placeholder', '')} {attrs.get('name', '')} {attrs.get('id', '')}".lower()
-
-        if tag == 'input' and not email_field:
-            for kw in email_keywords:
-                if kw in full_text:
-                    email_field = el
-                    break
-
-        if tag == 'input' and not password_field:
-            if attrs.get('type') == 'password':
-                password_field = el
-            else:
-                for kw in password_keywords:
-                    if kw in full_text:
-                        password_field = el
-                        break
-
-        if (tag == 'input' or tag == 'button') and not submit_button:
-            for kw in login_keywords:
-                if kw in full_text:
-                    submit_button = el
-                    break
-
-        if tag == 'input' and not remember_checkbox:
-            if attrs.get('type') == 'checkbox':
-                for kw in remember_keywords:
-                    if kw in full_text:
-                        remember_checkbox = el
-                        break
-
-    return {
-        "email": email_field,
-        "password": password_field,
-        "submit": submit_button,
-        "remember": remember_checkbox
-    }
-
-def perform_adaptive_login():
+    """Melhor candidato de cada papel segundo o login_detector (None se não houver)."""
+    detected = detect_login_form(structure, limit=1)
+    form = {}
+    for role in ROLES:
+        best = detected[role][0] if detected[role] else None
+        form[role] = best["element"] if best else None
+        if best:
+            logging.info(f"🔎 {role}: {best['element']['xpath']} (confiança {best['confidence']:.0%})")
+    return form
+
+def perform_adaptive_login(domain=None, interactive=True):
+    """Login com o plano do domínio; interactive=False não espera o ENTER para fechar o navegador."""
     logging.info("🔍 Procurando a análise mais recente...")
-    analysis_path, base_url = get_latest_analysis_path()
-
-    if not analysis_path or not base_url:
+    analysis = get_latest_analysis(domain=domain)
+    if not analysis:
         return
+    base_url = _base_url(analysis)
 
-    logging.info(f"📂 Análise encontrada: {analysis_path}")
+    logging.info(f"📂 Análise encontrada: {analysis['path']}")
     logging.info(f"🌐 URL alvo: {base_url}")
 
-    json_path = os.path.join(analysis_path, "estrutura.json")
-    if not os.path.exists(json_path):
-        logging.error(f"❌ Arquivo estrutura.json não encontrado: {json_path}")
+    plans = LoginPlanStore()
+    try:
+        plan = plans.resolve(analysis, base_url)
+    except FileNotFoundError:
+        logging.error(f"❌ Arquivo estrutura.json/estrutura.parquet não encontrado em: {analysis['path']}")
         return
-
-    with open(json_path, "r", encoding="utf-8") as f:
-        structure = json.load(f)
-
-    form = find_login_form(structure)
-
-    if not form["email"]:
-        logging.warning("⚠️ Campo de email não identificado no contexto.")
-    if not form["password"]:
+    if not plan:
         logging.error("❌ Campo de senha não identificado. Login não pode continuar.")
         return
-    if not form["submit"]:
+    roles = {step["role"] for step in plan["steps"]}
+    if "email" not in roles:
+        logging.warning("⚠️ Campo de email não identificado no contexto.")
+    if not plan["submit"]:
         logging.warning("⚠️ Botão de login não identificado.")
 
     options = webdriver.ChromeOptions()
     options.add_argument("--start-maximized")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    driver = webdriver.Chrome(service=Service(resolve_chromedriver()), options=options)
+
+    sessions = SessionStore()
+    domain = analysis["domain"]
 
     try:
-        driver.get(base_url)
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-
-        if form["email"]:
-            try:
-                field = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, form["email"]["xpath"]))
-                )
-                driver.execute_script("arguments[0].scrollIntoView(true);", field)
-                field.send_keys(EMAIL)
-                logging.info("📧 Email preenchido.")
-            except Exception as e:
-                logging.warning(f"⚠️ Falha ao preencher email: {e}")
-
-        try:
-            field = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, form["password"]["xpath"]))
-            )
-            driver.execute_script("arguments[0].scrollIntoView(true);", field)
-            field.send_keys(PASSWORD)
-            logging.info("🔒 Senha preenchida.")
-        except Exception as e:
-            logging.error(f"❌ Falha ao preencher senha: {e}")
+        # Reaproveita a sessão salva, se ainda for válida
+        if sessions.restore(driver, base_url, EMAIL):
+            logging.info(f"♻️ Sessão restaurada, login dispensado. URL: {driver.current_url}")
+            if interactive:
+                input("\nPressione ENTER para fechar o navegador...")
             return
 
-        if form["remember"]:
-            try:
-                checkbox = driver.find_element(By.XPATH, form["remember"]["xpath"])
-                if not checkbox.is_selected():
-                    checkbox.click()
-                logging.info("✅ 'Lembre-se de mim' marcado.")
-            except Exception as e:
-                logging.warning(f"⚠️ Erro ao marcar checkbox: {e}")
-
-        if form["submit"]:
-            try:
-                button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, form["submit"]["xpath"]))
-                )
-                driver.execute_script("arguments[0].scrollIntoView(true);", button)
-                button.click()
-                logging.info("🚀 Botão de login clicado.")
-            except Exception as e:
-                logging.warning(f"⚠️ Falha ao clicar no botão de login: {e}")
-        else:
-            try:
-                field.send_keys("\n")
-                logging.info("⌨️ Enviado com Enter.")
-            except:
-                logging.error("❌ Não foi possível enviar o formulário.")
-                return
-
-        logging.info("⏳ Aguardando login...")
-        WebDriverWait(driver, 20).until(
-            lambda d: d.current_url != base_url
-        )
-        logging.info(f"🎉 Login bem-sucedido! Nova URL: {driver.current_url}")
-
-        input("\nPressione ENTER para fechar o navegador...")
+        logging.info("⏳ Preenchendo o formulário e aguardando login...")
+        result = execute_plan(driver, plan, {"email": EMAIL, "password": PASSWORD})
+        if not result["ok"]:
+            if result["missing"]:
+                # Os localizadores não batem mais com a página: recompila na próxima análise
+                plans.delete(domain)
+            raise Exception(result["error"])
+        logging.info(f"🎉 Login bem-sucedido em {result['latency_ms']} ms ({result['signal']})! Nova URL: {result['url']}")
+        sessions.save(driver, base_url, EMAIL)
+
+        if interactive:
+            input("\nPressione ENTER para fechar o navegador...")
     except Exception as e:
         logging.error(f"❌ Erro durante o login: {e}")
         driver.save_screenshot("erro_login.png")
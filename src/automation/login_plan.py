@@ -0,0 +1,222 @@
+# src/automation/login_plan.py
+"""Plano de login pré-compilado por domínio (LOGIN_PLANS_DIR/<domínio>.json).
+
+O plano guarda os localizadores resolvidos a partir de uma análise, a ordem
+de preenchimento e o critério de sucesso. Enquanto a análise mais recente do
+domínio não mudar esses elementos, o estrutura.json não é relido.
+"""
+import hashlib
+import json
+import re
+from datetime import datetime
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from src.core.config import Config
+from src.core.logger import logger
+from src.analyzer.storage import load_structure
+from src.automation.login_detector import DETECTOR_TAGS, detect_login_form
+from src.automation.login_watcher import watch_login
+
+PLAN_VERSION = 1
+
+# Ordem de preenchimento e ação de cada papel; o botão vem por último
+FILL_ORDER = (("email", "fill"), ("password", "fill"), ("remember", "check"))
+
+# Verdadeiro quando todos os XPaths já existem no documento
+READY_SCRIPT = """
+    return arguments[0].every(xp => document.evaluate(xp, document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue !== null);
+"""
+
+# Preenche todos os campos e envia em uma única chamada.
+# O valor entra pelo setter nativo + eventos input/change (React, Vue, Angular).
+FILL_SCRIPT = """
+    const steps = arguments[0], submitXPath = arguments[1];
+    const byXPath = xp => document.evaluate(xp, document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    const missing = [];
+    let last = null;
+    for (const step of steps) {
+        const el = byXPath(step.xpath);
+        if (!el) { missing.push(step.role); continue; }
+        el.scrollIntoView({block: 'center'});
+        if (step.action === 'check') {
+            if (!el.checked) el.click();
+            continue;
+        }
+        el.focus();
+        const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, step.value);
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+        last = el;
+    }
+    let submitted = null;
+    if (!missing.includes('password')) {
+        const button = submitXPath ? byXPath(submitXPath) : null;
+        if (button) {
+            button.scrollIntoView({block: 'center'});
+            button.click();
+            submitted = 'click';
+        } else if (last && last.form) {
+            last.form.requestSubmit ? last.form.requestSubmit() : last.form.submit();
+            submitted = 'form';
+        }
+    }
+    return {missing: missing, submitted: submitted};
+"""
+
+def _slug(domain):
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", domain or "default")
+
+def element_fingerprint(el):
+    """Identidade do elemento para o plano: tag, atributos, texto e xpath (sem o retângulo)."""
+    payload = json.dumps([el.get("tag"), el.get("attributes") or {}, el.get("text") or "", el.get("xpath")],
+                         sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+def _locator(role, el, action=None):
+    locator = {"role": role, "xpath": el["xpath"], "fingerprint": element_fingerprint(el)}
+    if action:
+        locator["action"] = action
+    return locator
+
+def build_plan(structure, domain, url, analysis):
+    """Plano a partir do estrutura de uma análise ({"path", "timestamp"}); None sem campo de senha."""
+    detected = detect_login_form(structure, limit=1)
+    if not detected["password"]:
+        return None
+    steps = [_locator(role, detected[role][0]["element"], action)
+             for role, action in FILL_ORDER if detected[role]]
+    submit = _locator("submit", detected["submit"][0]["element"]) if detected["submit"] else None
+    return {
+        "version": PLAN_VERSION,
+        "domain": domain,
+        "url": url,
+        "analysis": analysis["path"],
+        "analysis_timestamp": analysis["timestamp"],
+        "form": detected["form"],
+        "steps": steps,
+        "submit": submit,
+        "confidence": {role: detected[role][0]["confidence"] for role in detected if role != "form" and detected[role]},
+        # Sucesso: a URL sai da página de login ou o campo de senha some
+        "success": {"url_changes": True, "password_hidden": True},
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+def plan_matches(plan, structure):
+    """Verdadeiro se todos os elementos do plano continuam iguais em structure."""
+    locators = plan["steps"] + ([plan["submit"]] if plan.get("submit") else [])
+    by_xpath = {el.get("xpath"): el for el in structure}
+    for locator in locators:
+        el = by_xpath.get(locator["xpath"])
+        if el is None or element_fingerprint(el) != locator["fingerprint"]:
+            return False
+    return True
+
+class LoginPlanStore:
+    """Planos de login em LOGIN_PLANS_DIR, um por domínio."""
+    def __init__(self, base_dir=None):
+        self.base_dir = base_dir or Config.LOGIN_PLANS_DIR
+
+    def path_for(self, domain):
+        return self.base_dir / f"{_slug(domain)}.json"
+
+    def load(self, domain):
+        try:
+            with open(self.path_for(domain), "r", encoding="utf-8") as f:
+                plan = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return plan if plan.get("version") == PLAN_VERSION else None
+
+    def save(self, plan):
+        path = self.path_for(plan["domain"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(plan, f, ensure_ascii=False, indent=2)
+        return path
+
+    def delete(self, domain):
+        self.path_for(domain).unlink(missing_ok=True)
+
+    def resolve(self, analysis, url=None):
+        """Plano válido para a análise mais recente do domínio (linha do AnalysisIndex).
+
+        Reaproveita o plano salvo; com uma análise mais nova, só o recompila
+        se os elementos usados por ele mudaram. Retorna None sem formulário.
+        """
+        domain = analysis["domain"]
+        url = url or analysis.get("url") or f"https://{domain}"
+        plan = self.load(domain)
+        if plan and (plan["analysis"] == analysis["path"] or plan["analysis_timestamp"] >= analysis["timestamp"]):
+            return plan
+
+        structure = load_structure(analysis["path"], tags=DETECTOR_TAGS)
+        if plan and plan_matches(plan, structure):
+            plan["analysis"], plan["analysis_timestamp"] = analysis["path"], analysis["timestamp"]
+            self.save(plan)
+            logger.info(f"Plano de login de {domain} continua válido na análise {analysis['timestamp']}")
+            return plan
+
+        if plan:
+            logger.info(f"Formulário de login de {domain} mudou; recompilando o plano")
+        plan = build_plan(structure, domain, url, analysis)
+        if plan:
+            path = self.save(plan)
+            logger.info(f"Plano de login salvo: {path}")
+        return plan
+
+def execute_plan(driver, plan, credentials, ready_timeout=10, success_timeout=20, use_cdp=True):
+    """Executa o plano: uma espera por todos os campos, um script que preenche e envia.
+
+    O resultado vem do login_watcher (primeiro sinal de sucesso ou de erro).
+    credentials = {"email": ..., "password": ...}. Retorna {"ok", "url", "missing",
+    "submitted", "error", "signal", "latency_ms"}.
+    """
+    steps = [dict(step, value=credentials.get(step["role"], "")) for step in plan["steps"]]
+    required = [step["xpath"] for step in steps if step["action"] == "fill"]
+    result = {"ok": False, "url": None, "missing": [], "submitted": None, "error": None,
+              "signal": None, "latency_ms": None}
+
+    driver.get(plan["url"])
+    try:
+        WebDriverWait(driver, ready_timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script(READY_SCRIPT, required))
+    except TimeoutException:
+        result["error"] = "campos do plano não apareceram na página"
+        result["missing"] = [step["role"] for step in steps if step["action"] == "fill"]
+        return result
+
+    submit_xpath = plan["submit"]["xpath"] if plan.get("submit") else None
+
+    def fill_and_submit():
+        filled = driver.execute_script(FILL_SCRIPT, steps, submit_xpath) or {}
+        result["missing"] = filled.get("missing", [])
+        result["submitted"] = filled.get("submitted")
+        if "password" in result["missing"]:
+            return False
+        if not result["submitted"]:
+            # Sem botão nem <form>: Enter no campo de senha
+            password_xpath = next(step["xpath"] for step in steps if step["role"] == "password")
+            driver.find_element(By.XPATH, password_xpath).send_keys(Keys.ENTER)
+            result["submitted"] = "enter"
+        return True
+
+    try:
+        watched = watch_login(driver, fill_and_submit, driver.current_url, plan.get("success"),
+                              timeout=success_timeout, use_cdp=use_cdp)
+    except WebDriverException as e:
+        result["error"] = str(e)
+        return result
+    result.update(ok=watched["ok"], url=watched["url"], signal=watched["signal"],
+                  latency_ms=watched["latency_ms"])
+    if watched["signal"] == "aborted":
+        result["error"] = "campo de senha não encontrado"
+    elif watched["signal"] == "error_banner":
+        result["error"] = f"a página mostrou um erro: {watched['detail']}"
+    elif not watched["ok"]:
+        result["error"] = "login não confirmado (a página de login continua aberta)"
+    return result
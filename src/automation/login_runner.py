@@ -0,0 +1,185 @@
+# src/automation/login_runner.py
+"""Login em lote: várias contas em paralelo sobre um BrowserPool, sem interação.
+
+Cada conta usa o plano de login do seu domínio (login_plan). As contas ficam
+em uma fila por domínio que alimenta o executor, com no máximo per_domain
+logins do mesmo site em andamento, sem worker parado esperando vaga; o
+resultado de cada conta (tempos, sinal, screenshot da falha) vai para uma
+tabela CSV/JSON.
+"""
+import csv
+import json
+import re
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from selenium.common.exceptions import WebDriverException
+from src.core.config import Config
+from src.core.logger import logger
+from src.core.analysis_index import AnalysisIndex
+from src.automation.browser_manager import BrowserPool
+from src.automation.login_plan import LoginPlanStore, execute_plan
+from src.automation.session_store import SessionStore, session_domain
+
+RESULT_COLUMNS = ("email", "domain", "status", "method", "signal", "queued_ms", "login_ms",
+                  "latency_ms", "wall_ms", "url", "screenshot", "error")
+
+def _slug(value):
+    return re.sub(r"[^A-Za-z0-9_.@-]", "_", value or "conta")
+
+def read_credentials(path):
+    """Lê o CSV de contas (colunas email, password e, opcionalmente, domain ou url).
+
+    O domínio fica sem "www.", como nos diretórios das análises. Linhas vazias ou começando com # são ignoradas; o separador (, ou ;) é detectado.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        lines = [line for line in f if line.strip() and not line.lstrip().startswith("#")]
+    if not lines:
+        return []
+    delimiter = ";" if lines[0].count(";") > lines[0].count(",") else ","
+    accounts = []
+    for row in csv.DictReader(lines, delimiter=delimiter):
+        row = {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+        if not row.get("email") or not row.get("password"):
+            logger.warning(f"Linha sem email/senha ignorada: {row.get('email') or '(sem email)'}")
+            continue
+        target = row.get("domain") or row.get("url") or ""
+        accounts.append({"email": row["email"], "password": row["password"], "domain": session_domain(target)})
+    return accounts
+
+def _resolve_plans(domains, plans, index):
+    """Plano de cada domínio a partir da análise mais recente; None se não houver."""
+    resolved = {}
+    for domain in domains:
+        analysis = index.latest(domain or None)
+        if not analysis:
+            resolved[domain] = (None, "nenhuma análise do domínio")
+            continue
+        try:
+            plan = plans.resolve(analysis)
+        except FileNotFoundError:
+            plan = None
+        resolved[domain] = (plan, None if plan else "formulário de login não identificado")
+    return resolved
+
+def _login_account(account, plan, pool, sessions, out_dir, use_sessions, queued_at):
+    """Login de uma conta; queued_at é o perf_counter de quando ela entrou na fila."""
+    result = dict.fromkeys(RESULT_COLUMNS)
+    result.update(email=account["email"], domain=plan["domain"], status="error")
+    result["queued_ms"] = round((time.perf_counter() - queued_at) * 1000)
+    driver = pool.acquire()
+    broken = False
+    login_started = time.perf_counter()
+    try:
+        if use_sessions and sessions.restore(driver, plan["url"], account["email"]):
+            result.update(status="ok", method="session", url=driver.current_url)
+        else:
+            outcome = execute_plan(driver, plan, account)
+            result.update(method="login", signal=outcome["signal"], latency_ms=outcome["latency_ms"],
+                          url=outcome["url"], error=outcome["error"])
+            if outcome["ok"]:
+                result["status"] = "ok"
+                sessions.save(driver, plan["url"], account["email"])
+    except WebDriverException as e:
+        result["error"] = str(e).split("\n")[0]
+        broken = True
+    except Exception as e:
+        result["error"] = str(e).split("\n")[0]
+    result["login_ms"] = round((time.perf_counter() - login_started) * 1000)
+    if result["status"] != "ok":
+        path = out_dir / f"erro_{_slug(plan['domain'])}_{_slug(account['email'])}.png"
+        try:
+            if driver.save_screenshot(str(path)):
+                result["screenshot"] = str(path)
+        except WebDriverException:
+            broken = True
+    pool.release(driver, broken=broken)
+    result["wall_ms"] = round((time.perf_counter() - queued_at) * 1000)
+    return result
+
+def write_results(results, out_dir):
+    """Grava resultados.csv e resultados.json em out_dir; retorna os dois caminhos."""
+    csv_path = out_dir / "resultados.csv"
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(results)
+    json_path = out_dir / "resultados.json"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return csv_path, json_path
+
+def run_logins(accounts, workers=None, per_domain=None, out_dir=None, headless=True, use_sessions=True):
+    """Faz o login de todas as contas em paralelo e grava a tabela de resultados.
+
+    workers = navegadores do pool; per_domain = logins simultâneos por domínio.
+    Contas sem domínio usam o da análise mais recente. Retorna (resumo, out_dir).
+    """
+    workers = max(1, min(workers or Config.BROWSER_POOL_SIZE, len(accounts) or 1))
+    per_domain = max(1, per_domain or Config.LOGIN_CONCURRENCY_PER_DOMAIN)
+    started_at = datetime.now()
+    out_dir = out_dir or Config.LOGIN_RUNS_DIR / started_at.strftime("%Y-%m-%d_%H-%M-%S")
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    index = AnalysisIndex()
+    index.ensure_populated(Config.ANALYSES_DIR)
+    plans = _resolve_plans({a["domain"] for a in accounts}, LoginPlanStore(), index)
+
+    started = time.perf_counter()
+    logger.info(f"Login em lote: {len(accounts)} contas, {workers} navegadores, até {per_domain} por domínio")
+    results = [None] * len(accounts)
+    # Uma fila por domínio do plano; o executor só recebe contas com vaga no seu domínio
+    queues = defaultdict(deque)
+    for i, account in enumerate(accounts):
+        plan, reason = plans[account["domain"]]
+        if not plan:
+            results[i] = dict(dict.fromkeys(RESULT_COLUMNS), email=account["email"],
+                              domain=account["domain"], status="error", error=reason)
+            continue
+        queues[plan["domain"]].append((i, plan))
+    total = sum(len(queue) for queue in queues.values())
+    running = {}
+    sessions = SessionStore()
+    with BrowserPool(size=workers, headless=headless, prelaunch=False) as pool, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        def submit(domain):
+            i, plan = queues[domain].popleft()
+            future = executor.submit(_login_account, accounts[i], plan, pool, sessions, out_dir,
+                                     use_sessions, started)
+            running[future] = (i, domain)
+
+        # Rodízio entre os domínios até per_domain contas de cada um
+        for _ in range(per_domain):
+            for domain, queue in queues.items():
+                if queue:
+                    submit(domain)
+        done = 0
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                i, domain = running.pop(future)
+                if queues[domain]:
+                    submit(domain)
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    results[i] = dict(dict.fromkeys(RESULT_COLUMNS), email=accounts[i]["email"],
+                                      domain=accounts[i]["domain"], status="error", error=str(e))
+                done += 1
+                status = "OK" if results[i]["status"] == "ok" else f"ERRO: {results[i]['error']}"
+                logger.info(f"[{done}/{total}] {results[i]['email']} @ {results[i]['domain']} - {status}")
+
+    csv_path, json_path = write_results(results, out_dir)
+    summary = {
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "total": len(results),
+        "succeeded": sum(1 for r in results if r["status"] == "ok"),
+        "failed": sum(1 for r in results if r["status"] != "ok"),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000),
+        "results": results,
+        "csv": str(csv_path),
+        "json": str(json_path),
+    }
+    logger.info(f"Resultados do login em lote: {csv_path}")
+    return summary, out_dir
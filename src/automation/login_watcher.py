@@ -0,0 +1,257 @@
+# src/automation/login_watcher.py
+"""Detecção do resultado do login por eventos do Chrome DevTools (CDP).
+
+Em vez de consultar driver.current_url a cada 500 ms, a sessão CDP escuta
+navegações, respostas com Set-Cookie e um MutationObserver injetado na
+página, e termina no primeiro sinal: mudança de URL, marcador pós-login no
+DOM, cookie de autenticação ou banner de erro. Sem CDP (outro navegador,
+versão sem devtools) cai em uma verificação periódica dos mesmos sinais.
+"""
+import json
+import re
+import time
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+from src.core.logger import logger
+
+SUCCESS_SIGNALS = ("url", "dom_marker", "auth_cookie")
+FAILURE_SIGNALS = ("error_banner",)
+
+DEFAULT_SIGNALS = {
+    "url_changes": True,
+    # Campo de senha visível antes do envio e ausente depois (SPA que não muda a URL)
+    "password_hidden": True,
+    "success_selectors": [],
+    "error_selectors": ['[role="alert"]', ".alert-danger", ".alert-error", ".error-message",
+                        ".invalid-feedback", ".flash-error", ".notice-error"],
+    # Regex dos nomes de cookie que indicam sessão autenticada
+    "auth_cookies": r"sess|auth|token|jwt|sid|logged",
+}
+
+BINDING = "__wcaLoginSignal"
+
+# Instala o observador dos sinais no documento (uma vez por documento).
+# Os banners de erro já visíveis na instalação são ignorados quando ignoreExisting.
+WATCH_SCRIPT = """
+(function(cfg) {
+    if (window.__wcaLoginWatch) return;
+    window.__wcaLoginWatch = true;
+    const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const passwordShown = () => Array.from(document.querySelectorAll('input[type="password"]')).some(visible);
+    const existing = new WeakSet();
+    const hadPassword = cfg.ignoreExisting && passwordShown();
+    if (cfg.ignoreExisting) {
+        for (const sel of cfg.errors) document.querySelectorAll(sel).forEach(el => { if (visible(el)) existing.add(el); });
+    }
+    const report = (signal, detail) => {
+        if (window.__wcaLoginFired) return;
+        window.__wcaLoginFired = {signal: signal, detail: detail};
+        if (typeof window[cfg.binding] === 'function') window[cfg.binding](JSON.stringify(window.__wcaLoginFired));
+    };
+    const check = () => {
+        for (const sel of cfg.success) {
+            const el = document.querySelector(sel);
+            if (el && visible(el)) return report('dom_marker', sel);
+        }
+        for (const sel of cfg.errors) {
+            for (const el of document.querySelectorAll(sel)) {
+                const text = (el.innerText || '').trim();
+                if (!existing.has(el) && text && visible(el)) return report('error_banner', text.slice(0, 200));
+            }
+        }
+        if (cfg.passwordHidden && hadPassword && !passwordShown()) return report('dom_marker', 'password_hidden');
+    };
+    let pending = false;
+    new MutationObserver(() => {
+        if (pending) return;
+        pending = true;
+        requestAnimationFrame(() => { pending = false; check(); });
+    }).observe(document, {childList: true, subtree: true, attributes: true,
+                          attributeFilter: ['class', 'style', 'hidden']});
+    if (document.readyState !== 'loading') check();
+    else document.addEventListener('DOMContentLoaded', check);
+})(%s);
+"""
+
+READ_FIRED_SCRIPT = "return window.__wcaLoginFired || null;"
+
+def _signals(signals):
+    merged = dict(DEFAULT_SIGNALS)
+    merged.update({k: v for k, v in (signals or {}).items() if v is not None})
+    return merged
+
+def _watch_script(signals, ignore_existing):
+    cfg = {"binding": BINDING, "success": list(signals["success_selectors"]),
+           "errors": list(signals["error_selectors"]), "passwordHidden": bool(signals["password_hidden"]),
+           "ignoreExisting": ignore_existing}
+    return WATCH_SCRIPT % json.dumps(cfg)
+
+def _set_cookie_names(headers):
+    """Nomes dos cookies de um cabeçalho Set-Cookie (várias linhas separadas por \\n)."""
+    raw = next((v for k, v in headers.items() if k.lower() == "set-cookie"), "")
+    return [line.split("=", 1)[0].strip() for line in raw.split("\n") if "=" in line]
+
+def _result(signal, detail, started, submitted_at, url, mode):
+    now = time.perf_counter()
+    return {
+        "ok": signal in SUCCESS_SIGNALS,
+        "signal": signal,
+        "detail": detail,
+        "latency_ms": round((now - started) * 1000, 1),
+        "submit_ms": round(((submitted_at or now) - started) * 1000, 1),
+        "url": url,
+        "mode": mode,
+    }
+
+async def _watch_cdp(driver, action, login_url, signals, timeout):
+    import trio
+
+    cookie_re = re.compile(signals["auth_cookies"], re.IGNORECASE) if signals["auth_cookies"] else None
+    async with driver.bidi_connection() as conn:
+        session, devtools = conn.session, conn.devtools
+        await session.execute(devtools.page.enable())
+        await session.execute(devtools.network.enable())
+        await session.execute(devtools.runtime.enable())
+        await session.execute(devtools.runtime.add_binding(BINDING))
+        script_id = await session.execute(devtools.page.add_script_to_evaluate_on_new_document(
+            source=_watch_script(signals, False)))
+        await session.execute(devtools.runtime.evaluate(expression=_watch_script(signals, True)))
+
+        fired = {}
+        state = {"started": False, "submitted_at": None, "aborted": False, "error": None}
+        done = trio.Event()
+
+        def fire(signal, detail, url=None):
+            if not fired:
+                fired.update(signal=signal, detail=detail, at=time.perf_counter(), url=url)
+                done.set()
+
+        async def listen():
+            events = session.listen(devtools.page.FrameNavigated, devtools.page.NavigatedWithinDocument,
+                                    devtools.network.ResponseReceivedExtraInfo, devtools.runtime.BindingCalled,
+                                    buffer_size=100)
+            async for event in events:
+                if isinstance(event, devtools.page.FrameNavigated):
+                    if event.frame.parent_id is None and signals["url_changes"] and event.frame.url != login_url:
+                        fire("url", event.frame.url, event.frame.url)
+                elif isinstance(event, devtools.page.NavigatedWithinDocument):
+                    if signals["url_changes"] and event.url != login_url:
+                        fire("url", event.url, event.url)
+                elif isinstance(event, devtools.network.ResponseReceivedExtraInfo):
+                    if cookie_re and state["started"]:
+                        names = [n for n in _set_cookie_names(event.headers) if cookie_re.search(n)]
+                        if names:
+                            fire("auth_cookie", names[0])
+                elif event.name == BINDING:
+                    payload = json.loads(event.payload)
+                    fire(payload["signal"], payload["detail"])
+
+        async def run_action():
+            state["started"] = True
+            try:
+                ok = await trio.to_thread.run_sync(action)
+            except Exception as e:
+                state["error"] = e
+                ok = False
+            state["submitted_at"] = time.perf_counter()
+            if ok is False:
+                state["aborted"] = True
+                done.set()
+
+        started = time.perf_counter()
+        async with trio.open_nursery() as nursery:
+            nursery.start_soon(listen)
+            nursery.start_soon(run_action)
+            with trio.move_on_after(timeout):
+                await done.wait()
+            nursery.cancel_scope.cancel()
+
+        try:
+            await session.execute(devtools.page.remove_script_to_evaluate_on_new_document(script_id))
+            await session.execute(devtools.runtime.remove_binding(BINDING))
+        except Exception:
+            pass
+
+    if state["error"] is not None:
+        raise state["error"]
+    if state["aborted"]:
+        return _result("aborted", None, started, state["submitted_at"], None, "cdp")
+    if not fired:
+        return _result(None, "nenhum sinal dentro do tempo limite", started, state["submitted_at"], None, "cdp")
+    result = _result(fired["signal"], fired["detail"], started, state["submitted_at"], fired["url"], "cdp")
+    result["latency_ms"] = round((fired["at"] - started) * 1000, 1)
+    return result
+
+def _watch_polling(driver, action, login_url, signals, timeout):
+    """Mesmos sinais por verificação periódica (navegadores sem CDP)."""
+    cookie_re = re.compile(signals["auth_cookies"], re.IGNORECASE) if signals["auth_cookies"] else None
+    driver.execute_script(_watch_script(signals, True))
+    baseline = {c["name"]: c.get("value") for c in driver.get_cookies()}
+
+    started = time.perf_counter()
+    if action() is False:
+        return _result("aborted", None, started, time.perf_counter(), None, "polling")
+    submitted_at = time.perf_counter()
+    poll_script = _watch_script(signals, False) + READ_FIRED_SCRIPT
+    found = {}
+
+    def check(d):
+        url = d.current_url
+        if signals["url_changes"] and url != login_url:
+            found.update(signal="url", detail=url)
+            return True
+        fired = d.execute_script(poll_script)
+        if fired:
+            found.update(fired)
+            return True
+        if cookie_re:
+            for c in d.get_cookies():
+                if cookie_re.search(c["name"]) and baseline.get(c["name"]) != c.get("value"):
+                    found.update(signal="auth_cookie", detail=c["name"])
+                    return True
+        return False
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(check)
+    except TimeoutException:
+        return _result(None, "nenhum sinal dentro do tempo limite", started, submitted_at,
+                       driver.current_url, "polling")
+    return _result(found["signal"], found["detail"], started, submitted_at, driver.current_url, "polling")
+
+def watch_login(driver, action, login_url=None, signals=None, timeout=20, use_cdp=True):
+    """Executa action (preenche e envia o formulário) e espera o primeiro sinal de resultado.
+
+    signals complementa DEFAULT_SIGNALS. action pode retornar False para
+    abortar (formulário incompleto). Retorna {"ok", "signal", "detail",
+    "latency_ms" (do início da ação ao sinal), "submit_ms", "url", "mode"};
+    sem sinal no tempo limite, ok=False e signal=None.
+    """
+    signals = _signals(signals)
+    login_url = login_url or driver.current_url
+    started = []
+
+    def guarded():
+        started.append(True)
+        return action()
+
+    result = None
+    if use_cdp and hasattr(driver, "bidi_connection"):
+        try:
+            import trio
+            result = trio.run(_watch_cdp, driver, guarded, login_url, signals, timeout)
+        except ImportError as e:
+            logger.warning(f"CDP indisponível ({e}); verificando o login por consulta periódica")
+        except Exception as e:
+            if started:
+                raise
+            logger.warning(f"Falha na sessão CDP ({e}); verificando o login por consulta periódica")
+    if result is None:
+        result = _watch_polling(driver, guarded, login_url, signals, timeout)
+    if result["url"] is None:
+        try:
+            result["url"] = driver.current_url
+        except WebDriverException:
+            pass
+    level = logger.info if result["ok"] else logger.warning
+    level(f"Login: sinal={result['signal']} ({result['detail']}) em {result['latency_ms']} ms [{result['mode']}]")
+    return result
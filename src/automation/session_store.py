@@ -0,0 +1,149 @@
+# src/automation/session_store.py
+import json
+import re
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+from selenium.common.exceptions import WebDriverException
+from src.core.config import Config
+from src.core.logger import logger
+
+# Lê todo o localStorage da origem atual
+READ_STORAGE_SCRIPT = """
+    const data = {};
+    for (let i = 0; i < window.localStorage.length; i++) {
+        const key = window.localStorage.key(i);
+        data[key] = window.localStorage.getItem(key);
+    }
+    return data;
+"""
+
+WRITE_STORAGE_SCRIPT = """
+    const data = arguments[0];
+    for (const key in data) window.localStorage.setItem(key, data[key]);
+"""
+
+# Sessão válida = nenhum campo de senha visível e URL fora das rotas de login
+LOGGED_IN_SCRIPT = """
+    const path = window.location.pathname.toLowerCase();
+    if (/sign_in|login|entrar/.test(path)) return false;
+    for (const input of document.querySelectorAll('input[type="password"]')) {
+        if (input.offsetWidth > 0 || input.offsetHeight > 0) return false;
+    }
+    return true;
+"""
+
+COOKIE_FIELDS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")
+
+def _slug(account):
+    return re.sub(r"[^A-Za-z0-9_.@-]", "_", account or "default")
+
+def session_domain(url_or_domain):
+    """Chave das sessões: host sem "www." (mesma regra do diretório das análises)."""
+    netloc = urlparse(url_or_domain).netloc if "://" in url_or_domain else url_or_domain
+    return netloc.replace("www.", "")
+
+def _origin(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+def is_logged_in(driver):
+    """Verificação barata da sessão na página atual."""
+    try:
+        return bool(driver.execute_script(LOGGED_IN_SCRIPT))
+    except WebDriverException:
+        return False
+
+class SessionStore:
+    """Guarda cookies e localStorage em SESSIONS_DIR/<domínio>/<conta>.json.
+
+    Os métodos aceitam o domínio ou uma URL do site; a chave é session_domain().
+    """
+    def __init__(self, base_dir=None, max_age_hours=None):
+        self.base_dir = base_dir or Config.SESSIONS_DIR
+        self.max_age_hours = max_age_hours if max_age_hours is not None else Config.SESSION_MAX_AGE_HOURS
+
+    def path_for(self, domain, account):
+        return self.base_dir / session_domain(domain) / f"{_slug(account)}.json"
+
+    def save(self, driver, domain, account):
+        """Salva a sessão do navegador (que deve estar em uma página do domínio)."""
+        try:
+            storage = driver.execute_script(READ_STORAGE_SCRIPT) or {}
+        except WebDriverException:
+            storage = {}
+        data = {
+            "domain": session_domain(domain),
+            "account": account,
+            "url": driver.current_url,
+            "saved_at": time.time(),
+            "saved_at_iso": datetime.now().isoformat(timespec="seconds"),
+            "cookies": driver.get_cookies(),
+            "local_storage": storage,
+        }
+        path = self.path_for(domain, account)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        logger.info(f"Sessão salva: {path}")
+        return path
+
+    def load(self, domain, account):
+        """Retorna a sessão salva, ou None se não existir ou estiver expirada."""
+        path = self.path_for(domain, account)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self.max_age_hours and time.time() - data.get("saved_at", 0) > self.max_age_hours * 3600:
+            logger.info(f"Sessão expirada por idade: {path}")
+            return None
+        now = time.time()
+        cookies = [c for c in data.get("cookies", []) if not c.get("expiry") or c["expiry"] > now]
+        if not cookies:
+            return None
+        data["cookies"] = cookies
+        return data
+
+    def delete(self, domain, account):
+        self.path_for(domain, account).unlink(missing_ok=True)
+
+    def apply(self, driver, url, data):
+        """Injeta cookies e localStorage na origem da URL (uma navegação leve)."""
+        driver.get(_origin(url) + "/favicon.ico")
+        for cookie in data["cookies"]:
+            cookie = {k: v for k, v in cookie.items() if k in COOKIE_FIELDS}
+            try:
+                driver.add_cookie(cookie)
+            except WebDriverException as e:
+                logger.warning(f"Cookie ignorado ({cookie.get('name')}): {e}")
+        if data.get("local_storage"):
+            try:
+                driver.execute_script(WRITE_STORAGE_SCRIPT, data["local_storage"])
+            except WebDriverException as e:
+                logger.warning(f"Falha ao restaurar localStorage: {e}")
+
+    def restore(self, driver, url, account, validate=True):
+        """Restaura a sessão salva; com validate, abre a URL e confirma o login.
+
+        Retorna False quando não há sessão utilizável (faça o login completo).
+        """
+        domain = session_domain(url)
+        data = self.load(domain, account)
+        if not data:
+            return False
+        try:
+            self.apply(driver, url, data)
+            if not validate:
+                return True
+            driver.get(url)
+        except WebDriverException as e:
+            logger.warning(f"Falha ao restaurar sessão de {domain}: {e}")
+            return False
+        if is_logged_in(driver):
+            logger.info(f"Sessão restaurada para {account} em {domain}")
+            return True
+        logger.info(f"Sessão salva de {account} em {domain} não é mais válida.")
+        self.delete(domain, account)
+        return False
@@ -0,0 +1,185 @@
+# src/core/analysis_index.py
+"""Catálogo SQLite das análises gravadas (substitui a varredura de diretórios)."""
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from .config import Config
+from .logger import logger
+
+INDEX_DB = Config.DATA_DIR / "analyses.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    domain TEXT NOT NULL,
+    url TEXT,
+    timestamp TEXT NOT NULL,
+    title TEXT,
+    element_count INTEGER,
+    path TEXT NOT NULL UNIQUE,
+    structure_file TEXT,
+    screenshot TEXT,
+    annotated TEXT,
+    viewer TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_domain_ts ON analyses (domain, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_analyses_url_ts ON analyses (url, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_analyses_ts ON analyses (timestamp DESC);
+CREATE TABLE IF NOT EXISTS imported_roots (
+    path TEXT PRIMARY KEY,
+    imported_at REAL NOT NULL
+);
+"""
+
+# Arquivos conhecidos de uma análise, por coluna
+ARTIFACTS = {
+    "structure_file": ("estrutura.parquet", "estrutura.json", "estrutura.ndjson", "estrutura.delta.json"),
+    "screenshot": ("pagina.png",),
+    "annotated": ("pagina_anotada.png",),
+    "viewer": ("visualizador.html", "visualizer.html"),
+}
+
+def _find_artifacts(path):
+    found = {}
+    for column, names in ARTIFACTS.items():
+        found[column] = next((os.path.join(path, n) for n in names if os.path.exists(os.path.join(path, n))), None)
+    return found
+
+def _count_elements(structure_file):
+    """Conta elementos de uma análise antiga (usado só na reconstrução do índice)."""
+    if not structure_file:
+        return None
+    try:
+        if structure_file.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            return pq.ParquetFile(structure_file).metadata.num_rows
+        if structure_file.endswith(".ndjson"):
+            from src.analyzer.structure_stream import count_elements
+            return count_elements(structure_file)
+        with open(structure_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        # Delta/ponteiro da reanálise incremental guarda o total de elementos
+        return data["elements"] if isinstance(data, dict) else len(data)
+    except Exception:
+        return None
+
+class AnalysisIndex:
+    """Registra cada análise no momento da gravação e responde consultas indexadas."""
+    def __init__(self, db_path=None):
+        self.db_path = str(db_path or INDEX_DB)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record(self, path, url=None, title=None, element_count=None, domain=None, timestamp=None, **files):
+        """Registra (ou atualiza) a análise gravada em path (analyses/<domínio>/<timestamp>)."""
+        path = os.path.abspath(str(path))
+        domain = domain or os.path.basename(os.path.dirname(path))
+        timestamp = timestamp or os.path.basename(path)
+        artifacts = _find_artifacts(path)
+        artifacts.update({k: (str(v) if v else None) for k, v in files.items() if k in ARTIFACTS})
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT INTO analyses (domain, url, timestamp, title, element_count, path,
+                                         structure_file, screenshot, annotated, viewer, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(path) DO UPDATE SET
+                       url=excluded.url, title=excluded.title, element_count=excluded.element_count,
+                       structure_file=excluded.structure_file, screenshot=excluded.screenshot,
+                       annotated=excluded.annotated, viewer=excluded.viewer""",
+                (domain, url, timestamp, title, element_count, path,
+                 artifacts["structure_file"], artifacts["screenshot"], artifacts["annotated"],
+                 artifacts["viewer"], time.time()),
+            )
+
+    def remove(self, path):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM analyses WHERE path = ?", (os.path.abspath(str(path)),))
+
+    def _first_existing(self, query, params):
+        """Primeira linha cujo diretório ainda existe; remove as linhas órfãs."""
+        found = None
+        orphans = []
+        with self._connect() as conn:
+            for row in conn.execute(query, params):
+                if os.path.isdir(row["path"]):
+                    found = dict(row)
+                    break
+                orphans.append((row["id"],))
+            if orphans:
+                conn.executemany("DELETE FROM analyses WHERE id = ?", orphans)
+        return found
+
+    def latest(self, domain=None):
+        """Análise mais recente (de um domínio, ou de todos)."""
+        if domain:
+            return self._first_existing(
+                "SELECT * FROM analyses WHERE domain = ? ORDER BY timestamp DESC", (domain,))
+        return self._first_existing("SELECT * FROM analyses ORDER BY timestamp DESC", ())
+
+    def latest_for_url(self, url):
+        return self._first_existing(
+            "SELECT * FROM analyses WHERE url = ? ORDER BY timestamp DESC", (url,))
+
+    def list_analyses(self, domain=None, limit=None):
+        """Análises ordenadas por domínio e timestamp decrescente."""
+        query = "SELECT * FROM analyses"
+        params = []
+        if domain:
+            query += " WHERE domain = ?"
+            params.append(domain)
+        query += " ORDER BY domain, timestamp DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(query, params)]
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def rebuild(self, base_dir=None):
+        """Importa análises já existentes em disco (migração única; não apaga registros)."""
+        base_dir = Path(base_dir or Config.ANALYSES_DIR)
+        if not base_dir.is_dir():
+            return 0
+        with self._connect() as conn:
+            known = {row[0] for row in conn.execute("SELECT path FROM analyses")}
+        imported = 0
+        for domain_dir in base_dir.iterdir():
+            if not domain_dir.is_dir():
+                continue
+            for ts_dir in domain_dir.iterdir():
+                if not ts_dir.is_dir() or os.path.abspath(str(ts_dir)) in known:
+                    continue
+                artifacts = _find_artifacts(str(ts_dir))
+                self.record(ts_dir, element_count=_count_elements(artifacts["structure_file"]))
+                imported += 1
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO imported_roots (path, imported_at) VALUES (?, ?)",
+                         (os.path.abspath(str(base_dir)), time.time()))
+        logger.info(f"Índice de análises reconstruído a partir de {base_dir}: {imported} análises")
+        return imported
+
+    def ensure_populated(self, base_dir=None):
+        """Importa base_dir do disco uma única vez; depois disso só o índice é consultado."""
+        root = os.path.abspath(str(base_dir or Config.ANALYSES_DIR))
+        with self._connect() as conn:
+            done = conn.execute("SELECT 1 FROM imported_roots WHERE path = ?", (root,)).fetchone()
+        if not done:
+            self.rebuild(root)
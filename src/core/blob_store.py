@@ -0,0 +1,142 @@
+# src/core/blob_store.py
+"""Armazenamento endereçado por conteúdo dos artefatos das análises (PNG, HTML)."""
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from .config import Config
+from .logger import logger
+
+CHUNK_SIZE = 1024 * 1024
+# gc() não apaga blobs (nem temporários) modificados há menos que isso: um
+# put_* em andamento pode estar entre gravar/reaproveitar o blob e criar o hardlink
+GC_GRACE_SECONDS = 600
+
+class BlobStore:
+    """Guarda cada conteúdo uma única vez em blobs/<aa>/<sha256>.
+
+    O diretório da análise recebe um hardlink para o blob, então os caminhos
+    de sempre (pagina.png, visualizador.html...) continuam funcionando; se o
+    hardlink não for possível, o conteúdo é copiado para o destino (sem
+    deduplicação, mas o arquivo fica onde os leitores esperam, p.ex. o
+    visualizador.html ao lado de visualizador_dados/).
+    Um blob sem nenhum hardlink é lixo e sai no gc(); reaproveitar um blob
+    atualiza o mtime dele, o que o protege durante GC_GRACE_SECONDS.
+    """
+    def __init__(self, root=None):
+        self.root = str(root or Config.BLOBS_DIR)
+        os.makedirs(self.root, exist_ok=True)
+
+    def blob_path(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+
+    def _store_temp(self, temp_path, digest):
+        """Move o arquivo temporário para o blob (ou descarta, se o blob já existe)."""
+        blob = self.blob_path(digest)
+        if os.path.exists(blob):
+            os.remove(temp_path)
+            return False
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        try:
+            os.replace(temp_path, blob)
+        except FileNotFoundError:
+            # O gc removeu o diretório vazio do prefixo nesse meio-tempo
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            os.replace(temp_path, blob)
+        return True
+
+    def _write_blob(self, data, digest):
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self._store_temp(temp_path, digest)
+
+    def _reuse(self, digest):
+        """Renova o mtime de um blob existente (ver GC_GRACE_SECONDS); False se ele não existe."""
+        try:
+            os.utime(self.blob_path(digest))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _link(self, digest, dest):
+        """Troca dest por um hardlink para o blob; False se o blob sumiu (dest fica intacto)."""
+        blob = self.blob_path(digest)
+        temp_path = f"{dest}.{os.getpid()}.tmp"
+        try:
+            os.link(blob, temp_path)
+        except FileNotFoundError:
+            return False
+        except OSError:
+            # Sem hardlink (outro volume, FAT...): cópia comum no destino
+            try:
+                shutil.copyfile(blob, temp_path)
+            except FileNotFoundError:
+                return False
+        os.replace(temp_path, dest)
+        return True
+
+    def put_bytes(self, data, dest):
+        """Grava data em dest; conteúdo já conhecido não é escrito de novo. Retorna o hash."""
+        digest = hashlib.sha256(data).hexdigest()
+        if not self._reuse(digest):
+            self._write_blob(data, digest)
+        if not self._link(digest, dest):
+            # Coletado pelo gc entre a verificação e o hardlink: grava de novo
+            self._write_blob(data, digest)
+            self._link(digest, dest)
+        return digest
+
+    def put_file(self, path):
+        """Troca o arquivo já gravado por um hardlink para o blob. Retorna o hash."""
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        blob = self.blob_path(digest)
+        if os.path.exists(blob) and os.path.samefile(blob, path):
+            return digest
+        if self._reuse(digest) and self._link(digest, path):
+            return digest
+        # Conteúdo novo (ou blob coletado nesse meio-tempo): o próprio arquivo vira o blob
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        try:
+            os.link(path, blob)
+        except OSError:
+            # Sem hardlink o arquivo já está no lugar: um blob seria só uma cópia a mais
+            pass
+        return digest
+
+    def gc(self):
+        """Apaga blobs sem hardlink fora do store. Retorna (blobs apagados, bytes liberados).
+
+        Blobs e temporários mais novos que GC_GRACE_SECONDS ficam: podem ser
+        de um put_* que ainda vai criar o hardlink.
+        """
+        removed = freed = 0
+        recent = time.time() - GC_GRACE_SECONDS
+        for prefix in os.listdir(self.root):
+            directory = os.path.join(self.root, prefix)
+            if prefix.endswith(".tmp"):
+                if os.stat(directory).st_mtime < recent:
+                    os.remove(directory)
+                continue
+            if not os.path.isdir(directory):
+                continue
+            for digest in os.listdir(directory):
+                path = os.path.join(directory, digest)
+                st = os.stat(path)
+                if st.st_nlink > 1 or st.st_mtime >= recent:
+                    continue
+                os.remove(path)
+                removed += 1
+                freed += st.st_size
+            if not os.listdir(directory):
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    pass
+        logger.info(f"Coleta de blobs: {removed} removidos, {freed / 1024 / 1024:.1f} MB liberados")
+        return removed, freed
@@ -12,6 +12,9 @@ class Config:
     LOGS_DIR = DATA_DIR / "logs"
     ANALYSES_DIR = DATA_DIR / "analyses"
     SESSIONS_DIR = DATA_DIR / "sessions"
+    BLOBS_DIR = DATA_DIR / "blobs"
+    LOGIN_PLANS_DIR = DATA_DIR / "login_plans"
+    LOGIN_RUNS_DIR = DATA_DIR / "login_runs"
     TEMPLATES_DIR = PROJECT_ROOT / "templates"
 
     # Cria os diretórios necessários
@@ -24,3 +27,29 @@ class Config:
 
     # Configurações do navegador
     CHROME_HEADLESS = os.getenv("CHROME_HEADLESS", "true").lower() == "true"
+
+    # Pool de navegadores (BrowserPool)
+    BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+    BROWSER_MAX_USES = int(os.getenv("BROWSER_MAX_USES", "50"))
+
+    # Sessões salvas (SessionStore); 0 desativa o limite de idade
+    SESSION_MAX_AGE_HOURS = float(os.getenv("SESSION_MAX_AGE_HOURS", "12"))
+
+    # Login em lote: logins simultâneos no mesmo domínio
+    LOGIN_CONCURRENCY_PER_DOMAIN = int(os.getenv("LOGIN_CONCURRENCY_PER_DOMAIN", "2"))
+
+    # Formato do arquivo de estrutura: json, parquet, both ou ndjson (gravado durante a extração)
+    STORAGE_FORMAT = os.getenv("STORAGE_FORMAT", "json").lower()
+
+    # Visualizador HTML: inline (JSON embutido) ou lazy (dados em partes sob demanda)
+    VIEWER_MODE = os.getenv("VIEWER_MODE", "inline").lower()
+
+    # Screenshot: viewport (só a janela) ou full (página inteira, em faixas)
+    SCREENSHOT_MODE = os.getenv("SCREENSHOT_MODE", "viewport").lower()
+    SCREENSHOT_MAX_HEIGHT = int(os.getenv("SCREENSHOT_MAX_HEIGHT", "30000"))
+
+    # Reanálise incremental: grava só ponteiro/delta contra a análise anterior da URL
+    INCREMENTAL_ANALYSIS = os.getenv("INCREMENTAL_ANALYSIS", "false").lower() == "true"
+
+    # Artefatos (PNG/HTML) guardados por conteúdo em BLOBS_DIR, com hardlink na análise
+    BLOB_STORE = os.getenv("BLOB_STORE", "false").lower() == "true"
@@ -1,12 +1,16 @@
 # visualizador_localizacao.py
 import os
-import json
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from PIL import Image, ImageTk
+from PIL import Image
 import cv2
 import numpy as np
 import csv
+from src.analyzer.storage import find_structure_file, load_structure, resolve_artifact
+from src.core.analysis_index import AnalysisIndex
+from src.analyzer.spatial import SpatialIndex
+from src.gui.element_table import ElementTableModel, VirtualTable, element_type
+from src.gui.image_view import ImageCanvas
 
 ANALYSES_DIR = "analyses"
 
@@ -19,8 +23,10 @@ class LocalizacaoDashboard:
 
         self.selected_analysis = None
         self.original_image = None
-        self.image_tk = None
         self.current_elements = []
+        self.table_model = ElementTableModel([])
+        self.spatial_index = SpatialIndex([])
+        self.analysis_index = AnalysisIndex()
 
         self.setup_widgets()
         self.load_analyses()
@@ -59,60 +65,41 @@ class LocalizacaoDashboard:
         table_top.pack(fill="x", pady=5)
         ttk.Button(table_top, text="📤 Exportar Tabela para CSV", command=self.export_table).pack(side="left", padx=5)
 
-        table_container = ttk.Frame(self.tab_table)
-        table_container.pack(fill="both", expand=True)
+        ttk.Label(table_top, text="🔎 Filtrar:").pack(side="left", padx=(15, 5))
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *_: self.element_table.filter(self.filter_var.get()))
+        ttk.Entry(table_top, textvariable=self.filter_var, width=40).pack(side="left")
 
-        columns = ("index", "type", "text", "x", "y", "width", "height", "xpath")
-        self.element_table = ttk.Treeview(table_container, columns=columns, show="headings", height=25)
-        self.element_table.heading("index", text="ID")
-        self.element_table.heading("type", text="Tipo")
-        self.element_table.heading("text", text="Texto/Valor")
-        self.element_table.heading("x", text="X")
-        self.element_table.heading("y", text="Y")
-        self.element_table.heading("width", text="Largura")
-        self.element_table.heading("height", text="Altura")
-        self.element_table.heading("xpath", text="XPath")
-
-        for col, width in zip(columns, [50, 100, 180, 60, 60, 80, 80, 300]):
-            self.element_table.column(col, width=width, anchor="center" if col in ["index", "x", "y", "width", "height"] else "w")
-
-        v_scroll = ttk.Scrollbar(table_container, orient="vertical", command=self.element_table.yview)
-        h_scroll = ttk.Scrollbar(table_container, orient="horizontal", command=self.element_table.xview)
-        self.element_table.configure(yscrollcommand=v_scroll.set, xscrollcommand=h_scroll.set)
-
-        self.element_table.grid(row=0, column=0, sticky="nsew")
-        v_scroll.grid(row=0, column=1, sticky="ns")
-        h_scroll.grid(row=1, column=0, sticky="ew")
-        table_container.grid_rowconfigure(0, weight=1)
-        table_container.grid_columnconfigure(0, weight=1)
-
-        # Destaque ao clicar
-        self.element_table.bind("<ButtonRelease-1>", self.on_table_click)
+        # Tabela virtualizada: só as linhas visíveis existem no Treeview
+        self.element_table = VirtualTable(self.tab_table, on_select=self.on_element_selected)
+        self.element_table.pack(fill="both", expand=True)
 
         # --- Aba da Imagem ---
         self.canvas_frame = ttk.Frame(self.tab_image)
         self.canvas_frame.pack(fill="both", expand=True)
 
-        self.canvas = tk.Canvas(self.canvas_frame, bg="lightgray")
+        # Pirâmide de escalas + destaque sobreposto (não redesenha a imagem ao selecionar)
+        self.canvas = ImageCanvas(self.canvas_frame, bg="lightgray")
         self.canvas.pack(fill="both", expand=True)
-        self.canvas.bind("<Configure>", self.resize_image)
+        self.canvas.bind("<Button-1>", self.on_canvas_click)
 
     def load_analyses(self):
         for item in self.tree.get_children():
             self.tree.delete(item)
 
-        if not os.path.exists(ANALYSES_DIR):
-            messagebox.showwarning("Aviso", f"Pasta '{ANALYSES_DIR}' não encontrada.")
+        self.analysis_index.ensure_populated(ANALYSES_DIR)
+        rows = self.analysis_index.list_analyses()
+        if not rows:
+            messagebox.showwarning("Aviso", f"Nenhuma análise encontrada em '{ANALYSES_DIR}'.")
             return
 
-        for domain in os.listdir(ANALYSES_DIR):
-            domain_path = os.path.join(ANALYSES_DIR, domain)
-            if os.path.isdir(domain_path):
-                parent = self.tree.insert("", "end", text=domain, open=False)
-                timestamps = sorted([t for t in os.listdir(domain_path) if os.path.isdir(os.path.join(domain_path, t))], reverse=True)
-                for ts in timestamps:
-                    ts_display = ts.replace("_", " ").replace("-", ":")
-                    self.tree.insert(parent, "end", text="", values=(ts_display,), tags=(os.path.join(domain_path, ts),))
+        parents = {}
+        for row in rows:
+            domain = row["domain"]
+            if domain not in parents:
+                parents[domain] = self.tree.insert("", "end", text=domain, open=False)
+            ts_display = row["timestamp"].replace("_", " ").replace("-", ":")
+            self.tree.insert(parents[domain], "end", text="", values=(ts_display,), tags=(row["path"],))
 
     def on_select_analysis(self, event):
         selection = self.tree.selection()
@@ -124,16 +111,14 @@ class LocalizacaoDashboard:
             return
         analysis_path = tags[0]
 
-        json_path = os.path.join(analysis_path, "estrutura.json")
-        image_path = os.path.join(analysis_path, "pagina_anotada.png")
+        image_path = resolve_artifact(analysis_path, "pagina_anotada.png") or os.path.join(analysis_path, "pagina_anotada.png")
 
-        if not os.path.exists(json_path):
+        if not find_structure_file(analysis_path):
             messagebox.showerror("Erro", "Arquivo estrutura.json não encontrado.")
             return
 
         try:
-            with open(json_path, "r", encoding="utf-8") as f:
-                elements = json.load(f)
+            elements = load_structure(analysis_path)
             self.current_elements = elements
             self.load_elements_to_table(elements)
             self.load_image(image_path)
@@ -141,102 +126,52 @@ class LocalizacaoDashboard:
             messagebox.showerror("Erro", f"Falha ao carregar análise: {e}")
 
     def load_elements_to_table(self, elements):
-        for row in self.element_table.get_children():
-            self.element_table.delete(row)
-        for el in elements:
-            self.element_table.insert("", "end", values=(
-                el.get("index", ""),
-                el.get("type", "unknown"),
-                (el.get("text", "") or el.get("value", ""))[:50],
-                el.get("x", ""),
-                el.get("y", ""),
-                el.get("width", ""),
-                el.get("height", ""),
-                el.get("xpath", "")
-            ), tags=(el,))
+        """Monta o modelo colunar; a tabela materializa só as linhas visíveis."""
+        self.table_model = ElementTableModel(elements)
+        self.table_model.filter(self.filter_var.get())
+        self.element_table.set_model(self.table_model)
+        self.spatial_index = SpatialIndex(elements)
 
     def load_image(self, image_path):
-        self.canvas.delete("all")
         self.original_image = None
-        self.image_tk = None
 
         if not image_path or not os.path.exists(image_path):
-            self.canvas.create_text(100, 50, text="Imagem não disponível", fill="red", anchor="nw")
+            self.canvas.show_message("Imagem não disponível")
             return
 
         try:
             img_cv = cv2.imread(image_path)
             img_rgb = cv2.cvtColor(img_cv, cv2.COLOR_BGR2RGB)
             self.original_image = Image.fromarray(img_rgb)
-            self.display_image()
+            self.canvas.set_image(self.original_image)
         except Exception as e:
-            self.canvas.create_text(100, 50, text=f"Erro ao carregar imagem: {e}", fill="red", anchor="nw")
+            self.canvas.show_message(f"Erro ao carregar imagem: {e}")
 
-    def display_image(self):
-        self.canvas.delete("all")
+    def on_element_selected(self, row_id):
+        """Destaca na imagem o elemento selecionado na tabela"""
         if not self.original_image:
             return
+        element_data = self.table_model.element(row_id)  # Dados completos do elemento
+        try:
+            x, y = float(element_data['x']), float(element_data['y'])
+            w, h = float(element_data['width']), float(element_data['height'])
+        except (KeyError, TypeError, ValueError):
+            self.canvas.clear_highlight()
+            return
+        self.canvas.highlight(x, y, w, h, element_type(element_data))
 
-        canvas_width = max(self.canvas.winfo_width(), 100)
-        canvas_height = max(self.canvas.winfo_height(), 100)
-
-        img = self.original_image.copy()
-        img.thumbnail((canvas_width, canvas_height), Image.Resampling.LANCZOS)
-        self.image_tk = ImageTk.PhotoImage(img)
-
-        self.canvas.create_image(canvas_width // 2, canvas_height // 2, anchor="center", image=self.image_tk)
-        self._image_scale = (
-            self.original_image.width / img.width,
-            self.original_image.height / img.height
-        )
-
-    def resize_image(self, event):
-        self.display_image()
-
-    def on_table_click(self, event):
-        """Destaca o elemento clicado na imagem"""
-        selected_item = self.element_table.selection()
-        if not selected_item:
+    def on_canvas_click(self, event):
+        """Seleciona na tabela o elemento mais específico sob o clique na imagem"""
+        point = self.canvas.to_image(event.x, event.y)
+        if point is None:
             return
-        item = self.element_table.item(selected_item[0])
-        element_data = item['tags'][0]  # Dados completos do elemento
-
-        x, y, w, h = element_data['x'], element_data['y'], element_data['width'], element_data['height']
-
-        # Converter coordenadas para a imagem redimensionada
-        scale_x, scale_y = self._image_scale
-        x_img = x / scale_x
-        y_img = y / scale_y
-        w_img = w / scale_x
-        h_img = h / scale_y
-
-        # Redesenha a imagem e destaca o retângulo
-        self.display_image()  # Redesenha imagem base
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        img_width = self.original_image.width / scale_x
-        img_height = self.original_image.height / scale_y
-
-        # Posição central da imagem
-        pad_x = (canvas_width - img_width) // 2
-        pad_y = (canvas_height - img_height) // 2
-
-        # Desenha o retângulo destacado
-        self.canvas.create_rectangle(
-            pad_x + x_img, pad_y + y_img,
-            pad_x + x_img + w_img, pad_y + y_img + h_img,
-            outline="red", width=3, dash=(4, 2)
-        )
-        self.canvas.create_text(
-            pad_x + x_img, pad_y + y_img - 10,
-            text=f"{element_data['type']}",
-            fill="red", font=("Arial", 10, "bold"),
-            anchor="nw"
-        )
+        hits = self.spatial_index.at_point(*point)
+        if hits:
+            self.element_table.select_row(hits[0])
 
     def export_table(self):
         """Exporta a tabela atual para CSV"""
-        if not self.current_elements:
+        if not len(self.table_model):
             messagebox.showwarning("Aviso", "Nenhum dado para exportar.")
             return
 
@@ -253,11 +188,12 @@ class LocalizacaoDashboard:
                 writer = csv.writer(f)
                 # Cabeçalho
                 writer.writerow(["ID", "Tipo", "Texto/Valor", "X", "Y", "Largura", "Altura", "XPath"])
-                # Dados
-                for el in self.current_elements:
+                # Dados, na ordem e com o filtro da tabela
+                for row_id in self.table_model.order:
+                    el = self.table_model.element(row_id)
                     writer.writerow([
                         el.get("index", ""),
-                        el.get("type", "unknown"),
+                        element_type(el),
                         (el.get("text", "") or el.get("value", "")),
                         el.get("x", ""),
                         el.get("y", ""),
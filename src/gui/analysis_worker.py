@@ -0,0 +1,176 @@
+# src/gui/analysis_worker.py
+"""Thread de análise da GUI: fila de URLs, um Chrome de vida longa e eventos de progresso.
+
+A GUI nunca toca no driver; ela lê os eventos de `events` (queue.Queue) com
+root.after. Cada evento é uma tupla (tipo, job, dados):
+    ("queued", job, None)       URL entrou na fila
+    ("started", job, None)      análise começou
+    ("progress", job, etapa)    início de uma etapa de ANALYSIS_STAGES
+    ("done", job, resumo)       resumo do analyze_url
+    ("error", job, mensagem)
+    ("cancelled", job, None)
+"""
+import itertools
+import queue
+import shutil
+import threading
+from collections import deque
+from selenium.common.exceptions import WebDriverException
+from src.core.config import Config
+from src.core.logger import logger
+from src.automation.browser_manager import BrowserPool, get_shared_pool
+from src.analyzer.scraper import analyze_url, make_output_dir
+
+# Espera (s) pelo fim da thread em close() antes de fechar o navegador por fora
+CLOSE_TIMEOUT = 2.0
+
+class AnalysisCancelled(Exception):
+    pass
+
+class AnalysisJob:
+    _ids = itertools.count(1)
+
+    def __init__(self, url):
+        self.id = next(AnalysisJob._ids)
+        self.url = url
+        self.output_dir = None
+        self.stage = None
+        self.cancelled = threading.Event()
+
+class AnalysisWorker(threading.Thread):
+    """Executa as análises enfileiradas, uma por vez, no mesmo navegador.
+
+    O Chrome vem do pool compartilhado (get_shared_pool) na primeira análise
+    e fica com a thread; se travar, volta ao pool como quebrado e outro é
+    emprestado na próxima. O cancelamento vale a partir da
+    próxima etapa da análise em andamento (o carregamento da página em
+    curso não é interrompido).
+    """
+    def __init__(self, headless=None, pool=None, **analyze_options):
+        super().__init__(daemon=True, name="wca-analysis")
+        # headless diferente do Config pede um navegador próprio, fora do pool compartilhado
+        if pool is None and headless is not None and headless != Config.CHROME_HEADLESS:
+            pool = BrowserPool(size=1, headless=headless, prelaunch=False)
+        self.pool = pool or get_shared_pool()
+        self.analyze_options = analyze_options
+        self.events = queue.Queue()
+        self.current = None
+        self._pending = deque()
+        self._lock = threading.Condition()
+        self._stopping = False
+        self._driver = None
+
+    def enqueue(self, url):
+        job = AnalysisJob(url)
+        with self._lock:
+            self._pending.append(job)
+            self._lock.notify()
+        self.events.put(("queued", job, None))
+        return job
+
+    def pending(self):
+        with self._lock:
+            return list(self._pending)
+
+    def cancel(self, job_id=None):
+        """Cancela a análise em andamento (sem job_id) ou a de job_id, na fila ou em andamento."""
+        with self._lock:
+            current = self.current
+            if job_id is None or (current is not None and current.id == job_id):
+                if current is not None:
+                    current.cancelled.set()
+                return current is not None
+            for job in self._pending:
+                if job.id == job_id:
+                    self._pending.remove(job)
+                    self.events.put(("cancelled", job, None))
+                    return True
+        return False
+
+    def clear(self):
+        """Remove todas as URLs pendentes (a análise em andamento continua)."""
+        with self._lock:
+            removed = list(self._pending)
+            self._pending.clear()
+        for job in removed:
+            self.events.put(("cancelled", job, None))
+        return len(removed)
+
+    def stop(self):
+        """Cancela tudo e encerra a thread (o navegador é fechado por ela)."""
+        self.clear()
+        with self._lock:
+            self._stopping = True
+            if self.current is not None:
+                self.current.cancelled.set()
+            self._lock.notify()
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """stop() e espera a thread; se ela seguir presa no navegador, fecha o Chrome daqui.
+
+        Nesse caso o pool também é encerrado (é o fim do processo), para não
+        subir um navegador de reposição.
+        """
+        self.stop()
+        if self.is_alive():
+            self.join(timeout)
+        if self.is_alive():
+            logger.warning("Análise não terminou a tempo; fechando o navegador.")
+            self.pool.close()
+            self._release_driver(broken=True)
+
+    def _next_job(self):
+        with self._lock:
+            while not self._pending and not self._stopping:
+                self._lock.wait()
+            if self._stopping:
+                return None
+            self.current = self._pending.popleft()
+            return self.current
+
+    def _release_driver(self, broken=False):
+        # Pode ser chamado pela GUI (close) enquanto a thread ainda usa o driver
+        driver, self._driver = self._driver, None
+        if driver is not None:
+            self.pool.release(driver, broken=broken)
+
+    def _run_job(self, job):
+        def progress(stage):
+            if job.cancelled.is_set() and stage != "done":
+                raise AnalysisCancelled()
+            job.stage = stage
+            self.events.put(("progress", job, stage))
+
+        self.events.put(("started", job, None))
+        try:
+            if job.cancelled.is_set():
+                raise AnalysisCancelled()
+            if self._driver is None:
+                self._driver = self.pool.acquire()
+            job.output_dir = make_output_dir(job.url)
+            summary = analyze_url(self._driver, job.url, job.output_dir, progress=progress, **self.analyze_options)
+            self.events.put(("done", job, summary))
+        except AnalysisCancelled:
+            logger.info(f"Análise cancelada: {job.url}")
+            if job.output_dir:
+                shutil.rmtree(job.output_dir, ignore_errors=True)
+            self.events.put(("cancelled", job, None))
+        except WebDriverException as e:
+            # Navegador travou: o pool o substitui e o próximo job pega outro
+            self._release_driver(broken=True)
+            self.events.put(("error", job, str(e).split("\n")[0]))
+        except Exception as e:
+            logger.error(f"Falha na análise de {job.url}: {e}")
+            self.events.put(("error", job, str(e).split("\n")[0]))
+
+    def run(self):
+        try:
+            while True:
+                job = self._next_job()
+                if job is None:
+                    break
+                self._run_job(job)
+                with self._lock:
+                    self.current = None
+        finally:
+            self._release_driver()
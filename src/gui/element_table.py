@@ -0,0 +1,265 @@
+# src/gui/element_table.py
+"""Tabela virtualizada de elementos para o dashboard.
+
+O modelo guarda as colunas em arrays (numpy) e os registros completos em uma
+lista Python indexada pelo ID da linha; ordenação e filtro mudam só a ordem
+de exibição do modelo. O Treeview tem apenas as linhas visíveis, que são
+reaproveitadas (só os valores mudam) conforme a rolagem.
+"""
+from tkinter import ttk
+import numpy as np
+
+# (coluna, título, largura, alinhamento)
+COLUMNS = (
+    ("index", "ID", 50, "center"),
+    ("type", "Tipo", 100, "w"),
+    ("text", "Texto/Valor", 180, "w"),
+    ("x", "X", 60, "center"),
+    ("y", "Y", 60, "center"),
+    ("width", "Largura", 80, "center"),
+    ("height", "Altura", 80, "center"),
+    ("xpath", "XPath", 300, "w"),
+)
+NUMERIC_COLUMNS = ("index", "x", "y", "width", "height")
+TEXT_PREVIEW = 50
+
+def element_type(el):
+    return el.get("type") or el.get("tag") or "unknown"
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def _present(value):
+    return value if isinstance(value, str) and value else None
+
+def _record_columns(elements):
+    columns = {}
+    for name in NUMERIC_COLUMNS:
+        columns[name] = np.array([_number(el.get(name)) for el in elements], np.float64)
+    columns["type"] = np.array([element_type(el) for el in elements], dtype=str)
+    columns["text"] = np.array([str(el.get("text") or el.get("value") or "") for el in elements], dtype=str)
+    columns["xpath"] = np.array([str(el.get("xpath") or "") for el in elements], dtype=str)
+    return columns
+
+def _frame_columns(frame):
+    """As mesmas colunas, lidas direto do DataFrame (estrutura.parquet) sem montar os dicts."""
+    columns = {name: frame[name].to_numpy(np.float64) for name in NUMERIC_COLUMNS}
+    types = frame["type"].tolist() if "type" in frame.columns else [None] * len(frame)
+    columns["type"] = np.array([_present(kind) or _present(tag) or "unknown"
+                                for kind, tag in zip(types, frame["tag"].tolist())], dtype=str)
+    columns["text"] = np.array([str(text or value or "") for text, value in
+                                zip(frame["text"].tolist(), frame["value"].tolist())], dtype=str)
+    columns["xpath"] = np.array([str(xpath or "") for xpath in frame["xpath"].tolist()], dtype=str)
+    return columns
+
+class ElementTableModel:
+    """Colunas dos elementos + ordem de exibição (IDs de linha após filtro e ordenação).
+
+    Com uma estrutura colunar (ColumnarStructure, atributo .frame) as colunas
+    vêm do DataFrame e só os dicts das linhas exibidas são montados.
+    """
+    def __init__(self, elements):
+        self.elements = elements
+        frame = getattr(elements, "frame", None)
+        self.columns = _record_columns(elements) if frame is None else _frame_columns(frame)
+        # Texto de busca em minúsculas (tipo, texto e xpath)
+        rows = zip(self.columns["type"].tolist(), self.columns["text"].tolist(), self.columns["xpath"].tolist())
+        self._search = np.array(["\n".join(row).lower() for row in rows], dtype=str)
+        self.order = np.arange(len(elements))
+        self.sort_column = None
+        self.descending = False
+        self.query = ""
+
+    def __len__(self):
+        return len(self.order)
+
+    def element(self, row_id):
+        """Registro completo da linha (o mesmo dict do estrutura.json)."""
+        return self.elements[row_id]
+
+    def _visible_ids(self):
+        if not self.query:
+            return np.arange(len(self.elements))
+        return np.flatnonzero(np.char.find(self._search, self.query) >= 0)
+
+    def _apply(self):
+        ids = self._visible_ids()
+        if self.sort_column is not None and len(ids):
+            keys = self.columns[self.sort_column][ids]
+            if self.sort_column in NUMERIC_COLUMNS:
+                # Valores ausentes (NaN) ficam no fim nos dois sentidos
+                ids = ids[np.argsort(-keys if self.descending else keys, kind="stable")]
+            else:
+                ids = ids[np.argsort(keys, kind="stable")]
+                if self.descending:
+                    ids = ids[::-1]
+        self.order = ids
+
+    def sort(self, column, descending=None):
+        """Ordena pela coluna; sem descending, clicar de novo na mesma coluna inverte."""
+        if descending is None:
+            descending = not self.descending if column == self.sort_column else False
+        self.sort_column, self.descending = column, descending
+        self._apply()
+
+    def filter(self, query):
+        self.query = (query or "").strip().lower()
+        self._apply()
+
+    def position(self, row_id):
+        """Posição da linha na exibição atual (None se filtrada)."""
+        found = np.flatnonzero(self.order == row_id)
+        return int(found[0]) if len(found) else None
+
+    def values(self, position):
+        row = self.order[position]
+        el = self.elements[row]
+        return (el.get("index", ""), str(self.columns["type"][row]), str(self.columns["text"][row][:TEXT_PREVIEW]),
+                el.get("x", ""), el.get("y", ""), el.get("width", ""), el.get("height", ""),
+                str(self.columns["xpath"][row]))
+
+class VirtualTable(ttk.Frame):
+    """Treeview com só as linhas visíveis de um ElementTableModel.
+
+    on_select(row_id) é chamado quando o usuário seleciona uma linha.
+    """
+    def __init__(self, master, on_select=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.on_select = on_select
+        self.model = ElementTableModel([])
+        self.first = 0
+        self.visible = 1
+        self.selected = None
+        self._slots = []
+        self._filling = False
+
+        style = ttk.Style()
+        self.row_height = int(style.lookup("Treeview", "rowheight") or 20)
+
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in COLUMNS], show="headings",
+                                 selectmode="browse", height=1)
+        for name, title, width, anchor in COLUMNS:
+            self.tree.heading(name, text=title, command=lambda c=name: self.sort(c))
+            self.tree.column(name, width=width, anchor=anchor)
+        self.v_scroll = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        h_scroll = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(xscrollcommand=h_scroll.set)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.v_scroll.grid(row=0, column=1, sticky="ns")
+        h_scroll.grid(row=1, column=0, sticky="ew")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, "units", 3))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1, "units", 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1, "units", 3))
+        self.tree.bind("<Up>", lambda e: self.move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self.move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self.move_selection(-self.visible))
+        self.tree.bind("<Next>", lambda e: self.move_selection(self.visible))
+
+    def set_model(self, model):
+        self.model = model
+        self.first = 0
+        self.selected = None
+        self.refresh()
+
+    def sort(self, column):
+        self.model.sort(column)
+        for name, title, _, _ in COLUMNS:
+            arrow = (" ▼" if self.model.descending else " ▲") if name == column else ""
+            self.tree.heading(name, text=title + arrow)
+        self.first = 0
+        self.refresh()
+
+    def filter(self, query):
+        self.model.filter(query)
+        self.first = 0
+        self.refresh()
+
+    def _on_resize(self, event):
+        # Cabeçalho ocupa cerca de uma linha
+        visible = max(1, event.height // self.row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.refresh()
+
+    def _max_first(self):
+        return max(0, len(self.model) - self.visible)
+
+    def scroll(self, amount, what="units", step=1):
+        delta = amount * (self.visible if what == "pages" else step)
+        self.first = min(max(0, self.first + delta), self._max_first())
+        self.refresh()
+        return "break"
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.first = min(max(0, int(float(args[0]) * len(self.model))), self._max_first())
+            self.refresh()
+        elif action == "scroll":
+            self.scroll(int(args[0]), args[1])
+
+    def move_selection(self, delta):
+        if not len(self.model):
+            return "break"
+        position = self.model.position(self.selected) if self.selected is not None else None
+        position = 0 if position is None else min(max(0, position + delta), len(self.model) - 1)
+        self.select_row(int(self.model.order[position]))
+        return "break"
+
+    def select_row(self, row_id, notify=True):
+        """Seleciona a linha (rolando até ela) e avisa on_select."""
+        self.selected = row_id
+        position = self.model.position(row_id)
+        if position is not None and not (self.first <= position < self.first + self.visible):
+            self.first = min(max(0, position - self.visible // 2), self._max_first())
+        self.refresh()
+        if notify and self.on_select:
+            self.on_select(row_id)
+
+    def refresh(self):
+        """Materializa as linhas visíveis a partir do modelo, reaproveitando os itens."""
+        self._filling = True
+        try:
+            count = max(0, min(self.visible, len(self.model) - self.first))
+            while len(self._slots) < count:
+                self._slots.append(self.tree.insert("", "end", values=()))
+            while len(self._slots) > count:
+                self.tree.delete(self._slots.pop())
+            selected_slot = None
+            for slot, iid in enumerate(self._slots):
+                position = self.first + slot
+                self.tree.item(iid, values=self.model.values(position))
+                if self.model.order[position] == self.selected:
+                    selected_slot = iid
+            # A seleção programática gera <<TreeviewSelect>>, ignorado por ser a linha já selecionada
+            if selected_slot:
+                self.tree.selection_set(selected_slot)
+            else:
+                self.tree.selection_set(())
+            total = len(self.model)
+            if total:
+                self.v_scroll.set(self.first / total, min(1.0, (self.first + count) / total))
+            else:
+                self.v_scroll.set(0, 1)
+        finally:
+            self._filling = False
+
+    def _on_tree_select(self, event):
+        if self._filling:
+            return
+        selection = self.tree.selection()
+        if not selection or selection[0] not in self._slots:
+            return
+        row_id = int(self.model.order[self.first + self._slots.index(selection[0])])
+        if row_id != self.selected:
+            self.selected = row_id
+            if self.on_select:
+                self.on_select(row_id)
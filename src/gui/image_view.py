@@ -0,0 +1,155 @@
+# src/gui/image_view.py
+"""Canvas de imagem do dashboard: pirâmide de resoluções, cache por tamanho e destaque sobreposto.
+
+A pirâmide é montada uma vez por análise (cada nível tem metade do anterior);
+para um tamanho de canvas, a imagem ajustada sai do menor nível que ainda
+é maior que o alvo, então o LANCZOS trabalha sobre poucos pixels. Os
+PhotoImage ficam em cache por tamanho; o destaque é um item à parte do
+canvas, movido com coords() sem redesenhar a imagem base.
+"""
+import tkinter as tk
+from collections import OrderedDict
+from PIL import Image, ImageTk
+
+MIN_LEVEL_SIZE = 256
+RESIZE_DEBOUNCE_MS = 120
+PHOTO_CACHE_SIZE = 4
+
+class ImagePyramid:
+    """Níveis da imagem original (nível 0) reduzidos pela metade até MIN_LEVEL_SIZE."""
+    def __init__(self, image):
+        self.levels = [image]
+        while min(self.levels[-1].size) // 2 >= MIN_LEVEL_SIZE:
+            self.levels.append(self.levels[-1].reduce(2))
+
+    @property
+    def size(self):
+        return self.levels[0].size
+
+    def fit_size(self, width, height):
+        """Tamanho da imagem ajustada ao retângulo (sem ampliar, como thumbnail)."""
+        orig_w, orig_h = self.size
+        scale = min(1.0, width / orig_w, height / orig_h)
+        return max(1, round(orig_w * scale)), max(1, round(orig_h * scale))
+
+    def fitted(self, width, height):
+        """Imagem ajustada a width x height a partir do nível mais próximo."""
+        target = self.fit_size(width, height)
+        source = self.levels[0]
+        for level in self.levels[1:]:
+            if level.width < target[0] or level.height < target[1]:
+                break
+            source = level
+        if source.size == target:
+            return source
+        return source.resize(target, Image.Resampling.LANCZOS)
+
+class ImageCanvas(tk.Canvas):
+    """Canvas que mostra uma imagem centralizada e um retângulo de destaque.
+
+    Coordenadas do destaque são as da imagem original (as do estrutura.json).
+    """
+    def __init__(self, master, **kwargs):
+        kwargs.setdefault("bg", "lightgray")
+        super().__init__(master, **kwargs)
+        self.pyramid = None
+        self._photos = OrderedDict()
+        self._photo_size = None
+        self._highlight = None
+        self._resize_job = None
+        self._image_item = self.create_image(0, 0, anchor="center")
+        self._rect_item = self.create_rectangle(0, 0, 0, 0, outline="red", width=3, dash=(4, 2), state="hidden")
+        self._label_item = self.create_text(0, 0, text="", fill="red", font=("Arial", 10, "bold"),
+                                            anchor="sw", state="hidden")
+        self._message_item = self.create_text(100, 50, text="", fill="red", anchor="nw")
+        self.bind("<Configure>", self._on_configure)
+
+    def set_image(self, image):
+        """Troca a imagem (PIL) e descarta pirâmide, cache e destaque anteriores."""
+        self.pyramid = ImagePyramid(image) if image is not None else None
+        self._photos.clear()
+        self._photo_size = None
+        self.itemconfigure(self._message_item, text="")
+        self.clear_highlight()
+        self.redraw()
+
+    def show_message(self, text):
+        self.set_image(None)
+        self.itemconfigure(self._message_item, text=text)
+
+    def _canvas_size(self):
+        return max(self.winfo_width(), 100), max(self.winfo_height(), 100)
+
+    def _on_configure(self, event):
+        # Espera o redimensionamento assentar antes de gerar outra escala
+        if self._resize_job is not None:
+            self.after_cancel(self._resize_job)
+        self._resize_job = self.after(RESIZE_DEBOUNCE_MS, self._apply_resize)
+
+    def _apply_resize(self):
+        self._resize_job = None
+        self.redraw()
+
+    def _photo(self, size):
+        photo = self._photos.get(size)
+        if photo is None:
+            photo = ImageTk.PhotoImage(self.pyramid.fitted(*size))
+            self._photos[size] = photo
+            while len(self._photos) > PHOTO_CACHE_SIZE:
+                self._photos.popitem(last=False)
+        else:
+            self._photos.move_to_end(size)
+        return photo
+
+    def redraw(self):
+        """Reposiciona a imagem base (gerando a escala só se o tamanho mudou) e o destaque."""
+        if self.pyramid is None:
+            self.itemconfigure(self._image_item, image="")
+            return
+        canvas_w, canvas_h = self._canvas_size()
+        size = self.pyramid.fit_size(canvas_w, canvas_h)
+        if size != self._photo_size:
+            self.itemconfigure(self._image_item, image=self._photo(size))
+            self._photo_size = size
+        self.coords(self._image_item, canvas_w // 2, canvas_h // 2)
+        self._place_highlight()
+
+    def _image_box(self):
+        """(deslocamento x, deslocamento y, escala) da imagem mostrada no canvas."""
+        canvas_w, canvas_h = self._canvas_size()
+        width, height = self._photo_size
+        return (canvas_w // 2 - width / 2, canvas_h // 2 - height / 2, width / self.pyramid.size[0])
+
+    def to_image(self, x, y):
+        """Ponto do canvas em coordenadas da imagem original (None fora da imagem)."""
+        if self.pyramid is None or self._photo_size is None:
+            return None
+        left, top, scale = self._image_box()
+        image_x, image_y = (x - left) / scale, (y - top) / scale
+        width, height = self.pyramid.size
+        if not (0 <= image_x <= width and 0 <= image_y <= height):
+            return None
+        return image_x, image_y
+
+    def highlight(self, x, y, width, height, label=""):
+        """Destaca o retângulo (coordenadas da imagem original)."""
+        self._highlight = (x, y, width, height, label)
+        self._place_highlight()
+
+    def clear_highlight(self):
+        self._highlight = None
+        self.itemconfigure(self._rect_item, state="hidden")
+        self.itemconfigure(self._label_item, state="hidden")
+
+    def _place_highlight(self):
+        if self._highlight is None or self._photo_size is None:
+            return
+        x, y, width, height, label = self._highlight
+        left, top, scale = self._image_box()
+        x0, y0 = left + x * scale, top + y * scale
+        self.coords(self._rect_item, x0, y0, x0 + width * scale, y0 + height * scale)
+        self.coords(self._label_item, x0, y0 - 2)
+        self.itemconfigure(self._label_item, text=label, state="normal")
+        self.itemconfigure(self._rect_item, state="normal")
+        self.tag_raise(self._rect_item)
+        self.tag_raise(self._label_item)
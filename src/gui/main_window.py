@@ -2,17 +2,19 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
-import subprocess
+import queue
 import os
-import sys
-from urllib.parse import urlparse
-from datetime import datetime
-import json
-from pathlib import Path
 
 # --- CONFIGURAÇÃO DE LOGGING ---
 import logging
 from src.core.logger import logger
+from src.core.config import Config
+from src.core.analysis_index import AnalysisIndex
+from src.analyzer.scraper import ANALYSIS_STAGES
+from src.gui.analysis_worker import AnalysisWorker
+
+# Intervalo (ms) da leitura dos eventos da thread de análise
+POLL_INTERVAL_MS = 100
 
 class WebAnalyzerGUI:
     def __init__(self, root):
@@ -20,9 +22,15 @@ class WebAnalyzerGUI:
         self.root.title("🌐 Analisador Web Adaptativo")
         self.root.geometry("1000x700")
         self.root.minsize(800, 600)
+        self.analysis_index = AnalysisIndex()
         self.setup_styles()
         self.create_widgets()
         self.load_analyses()
+        # Análises no próprio processo, em uma thread com Chrome de vida longa
+        self.worker = AnalysisWorker()
+        self.worker.start()
+        self.root.after(POLL_INTERVAL_MS, self.poll_worker_events)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         logger.info("GUI iniciada.")
 
     def setup_styles(self):
@@ -45,6 +53,9 @@ class WebAnalyzerGUI:
         self.analyze_btn = ttk.Button(top_frame, text="▶ Analisar", command=self.start_analysis, width=12)
         self.analyze_btn.pack(side="left", padx=2)
 
+        self.cancel_btn = ttk.Button(top_frame, text="■ Cancelar", command=self.cancel_analysis, width=12, state="disabled")
+        self.cancel_btn.pack(side="left", padx=2)
+
         self.login_btn = ttk.Button(top_frame, text="⚡ Login Rápido", command=self.quick_login, width=15)
         self.login_btn.pack(side="left", padx=2)
 
@@ -83,6 +94,15 @@ class WebAnalyzerGUI:
         self.progress_label = ttk.Label(self.tab_current, text="Pronto para análise.", font=("Helvetica", 10))
         self.progress_label.pack()
 
+        # Fila de URLs aguardando a análise em andamento
+        ttk.Label(self.tab_current, text="Fila:", font=("Helvetica", 10, "bold")).pack(anchor="w", padx=5, pady=(20, 0))
+        self.queue_list = tk.Listbox(self.tab_current, height=8)
+        self.queue_list.pack(fill="both", expand=True, padx=5, pady=5)
+        queue_btns = ttk.Frame(self.tab_current)
+        queue_btns.pack(fill="x", padx=5)
+        ttk.Button(queue_btns, text="Remover da fila", command=self.remove_queued).pack(side="left")
+        ttk.Button(queue_btns, text="Limpar fila", command=self.clear_queue).pack(side="left", padx=5)
+
         # === Status Bar ===
         self.status_var = tk.StringVar(value="Pronto.")
         self.status_bar = ttk.Label(self.root, textvariable=self.status_var, relief="sunken", font=("Helvetica", 9), foreground="gray")
@@ -91,34 +111,23 @@ class WebAnalyzerGUI:
         # === Variáveis de Estado ===
         self.current_output_dir = None
         self.selected_analysis_path = None
+        self.active_job = None
         self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
 
     def load_analyses(self):
-        """Carrega todas as análises do diretório analyses/"""
+        """Carrega as análises a partir do índice SQLite (sem varrer diretórios)."""
         for item in self.tree.get_children():
             self.tree.delete(item)
 
-        if not os.path.exists("data/analyses"):
-            return
-
-        for domain in os.listdir("data/analyses"):
-            domain_path = os.path.join("data/analyses", domain)
-            if os.path.isdir(domain_path):
-                parent = self.tree.insert("", "end", text=domain, open=False)
-                timestamps = sorted([t for t in os.listdir(domain_path) if os.path.isdir(os.path.join(domain_path, t))], reverse=True)
-                for ts in timestamps:
-                    json_path = os.path.join(domain_path, ts, "context.json")
-                    url = "Desconhecida"
-                    if os.path.exists(json_path):
-                        try:
-                            with open(json_path, "r", encoding="utf-8") as f:
-                                data = json.load(f)
-                                # Tenta extrair uma URL base do contexto (opcional)
-                                pass
-                        except:
-                            pass
-                    ts_display = ts.replace("_", " ").replace("-", ":")
-                    self.tree.insert(parent, "end", text="", values=(ts_display, url), tags=(os.path.join(domain_path, ts),))
+        self.analysis_index.ensure_populated(Config.ANALYSES_DIR)
+        parents = {}
+        for row in self.analysis_index.list_analyses():
+            domain = row["domain"]
+            if domain not in parents:
+                parents[domain] = self.tree.insert("", "end", text=domain, open=False)
+            ts_display = row["timestamp"].replace("_", " ").replace("-", ":")
+            url = row["url"] or "Desconhecida"
+            self.tree.insert(parents[domain], "end", text="", values=(ts_display, url), tags=(row["path"],))
 
     def on_tree_select(self, event):
         selection = self.tree.selection()
@@ -155,145 +164,77 @@ class WebAnalyzerGUI:
         if not url.startswith(("http://", "https://")):
             messagebox.showerror("Erro", "URL inválida.")
             return
+        self.worker.enqueue(url)
+        self.tab_control.select(self.tab_current)
 
-        parsed = urlparse(url)
-        domain = parsed.netloc.replace("www.", "")
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        base_dir = os.path.join("data/analyses", domain)
-        output_dir = os.path.join(base_dir, timestamp)
-
-        self.current_output_dir = output_dir
-        self.open_btn.config(state="disabled")
-        self.view_btn.config(state="disabled")
-        self.analyze_btn.config(state="disabled")
-        self.progress["value"] = 0
-        self.progress_label.config(text="Iniciando análise...")
-        self.status_var.set(f"Analisando: {url}")
-
-        thread = threading.Thread(target=self.run_analysis_in_thread, args=(url, output_dir), daemon=True)
-        thread.start()
-
-    def run_analysis_in_thread(self, url, output_dir):
-        """Executa a análise em uma thread separada."""
-        def update_progress(value):
-            self.progress["value"] = value
-            self.progress_label.config(text=f"Progresso: {int(value)}%")
+    def cancel_analysis(self):
+        if self.worker.cancel():
+            self.progress_label.config(text="Cancelando (ao fim da etapa atual)...")
 
-        def finish(success, message):
-            self.analyze_btn.config(state="normal")
-            if success:
-                self.progress_label.config(text="✅ Concluído!")
-                self.open_btn.config(state="normal")
-            else:
-                self.progress_label.config(text="❌ Falha")
-            messagebox.showinfo("Resultado", message) if success else messagebox.showerror("Erro", message)
-            self.load_analyses()
+    def remove_queued(self):
+        selection = self.queue_list.curselection()
+        if not selection:
+            return
+        pending = self.worker.pending()
+        if selection[0] < len(pending):
+            self.worker.cancel(pending[selection[0]].id)
 
-        try:
-            update_progress(20)
-
-            # --- DEPURAÇÃO INTENSIVA ---
-            project_root = Path(__file__).parent.parent
-            main_script = project_root / "main.py"
-
-            # Logs de depuração
-            logger.info(f"[DEPURAÇÃO] __file__ = {__file__}")
-            logger.info(f"[DEPURAÇÃO] project_root = {project_root}")
-            logger.info(f"[DEPURAÇÃO] main_script = {main_script}")
-            logger.info(f"[DEPURAÇÃO] main_script.exists() = {main_script.exists()}")
-            logger.info(f"[DEPURAÇÃO] main_script.absolute() = {main_script.absolute()}")
-            logger.info(f"[DEPURAÇÃO] main_script.is_file() = {main_script.is_file()}")
-
-            if not main_script.exists() or not main_script.is_file():
-                raise FileNotFoundError(f"Arquivo main.py não encontrado ou não é um arquivo em: {main_script.absolute()}")
-
-            cmd = [
-                sys.executable,
-                str(main_script),
-                "--url", url,
-                "--output-dir", output_dir
-            ]
-
-            logger.info(f"Executando comando: {' '.join(cmd)}")
-
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300, cwd=project_root)
-
-            if result.stdout:
-                logger.info("STDOUT:\n" + result.stdout)
-            if result.stderr:
-                logger.error("STDERR:\n" + result.stderr)
-
-            if result.returncode != 0:
-                raise Exception(result.stderr or "Erro desconhecido")
-
-            update_progress(100)
-            logger.info(f"Sucesso: {output_dir}")
-            finish(True, f"✅ Sucesso!\n{output_dir}")
-
-        except Exception as e:
-            error_msg = str(e).split('\n')[0]
-            logger.error(f"Falha: {error_msg}")
-            finish(False, f"❌ Erro:\n{error_msg}")
-        """Executa a análise em uma thread separada."""
-        def update_progress(value):
-            self.progress["value"] = value
-            self.progress_label.config(text=f"Progresso: {int(value)}%")
+    def clear_queue(self):
+        self.worker.clear()
 
-        def finish(success, message):
-            self.analyze_btn.config(state="normal")
-            if success:
-                self.progress_label.config(text="✅ Concluído!")
-                self.open_btn.config(state="normal")
-            else:
-                self.progress_label.config(text="❌ Falha")
-            messagebox.showinfo("Resultado", message) if success else messagebox.showerror("Erro", message)
-            self.load_analyses()  # Atualiza a lista
+    def refresh_queue(self):
+        self.queue_list.delete(0, "end")
+        for job in self.worker.pending():
+            self.queue_list.insert("end", job.url)
 
+    def poll_worker_events(self):
+        """Aplica os eventos da thread de análise (único ponto em que ela afeta a interface)."""
         try:
-            update_progress(20)
-
-            # --- CORREÇÃO DE CAMINHO ---
-            # O __file__ está em src/gui/main_window.py
-            # Precisamos subir três níveis: gui -> src -> raiz
-            project_root = Path(__file__).parent.parent.parent  # ✅ Corrigido
-            main_script = project_root / "main.py"
-
-            # Logs de depuração
-            logger.info(f"[DEPURAÇÃO] __file__ = {__file__}")
-            logger.info(f"[DEPURAÇÃO] project_root = {project_root}")
-            logger.info(f"[DEPURAÇÃO] main_script = {main_script}")
-            logger.info(f"[DEPURAÇÃO] main_script.exists() = {main_script.exists()}")
-
-            if not main_script.exists() or not main_script.is_file():
-                raise FileNotFoundError(f"Arquivo main.py não encontrado ou não é um arquivo em: {main_script.absolute()}")
-
-            cmd = [
-                sys.executable,
-                str(main_script),
-                "--url", url,
-                "--output-dir", output_dir
-            ]
-
-            logger.info(f"Executando comando: {' '.join(cmd)}")
-
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300, cwd=project_root)
-
-            if result.stdout:
-                logger.info("STDOUT:\n" + result.stdout)
-            if result.stderr:
-                logger.error("STDERR:\n" + result.stderr)
-
-            if result.returncode != 0:
-                raise Exception(result.stderr or "Erro desconhecido")
-
-            update_progress(100)
-            logger.info(f"Sucesso: {output_dir}")
-            finish(True, f"✅ Sucesso!\n{output_dir}")
-
-        except Exception as e:
-            error_msg = str(e).split('\n')[0]
-            logger.error(f"Falha: {error_msg}")
-            finish(False, f"❌ Erro:\n{error_msg}")
+            while True:
+                kind, job, data = self.worker.events.get_nowait()
+                self.handle_worker_event(kind, job, data)
+        except queue.Empty:
+            pass
+        self.root.after(POLL_INTERVAL_MS, self.poll_worker_events)
+
+    def handle_worker_event(self, kind, job, data):
+        if kind == "started":
+            self.active_job = job
+            self.current_output_dir = None
+            self.progress["value"] = 0
+            self.progress_label.config(text="Iniciando análise...")
+            self.status_var.set(f"Analisando: {job.url}")
+            self.cancel_btn.config(state="normal")
+        elif kind == "progress":
+            value, label = ANALYSIS_STAGES[data]
+            self.progress["value"] = value
+            self.progress_label.config(text=f"{label}... ({value}%)")
+        elif kind == "done":
+            self.current_output_dir = job.output_dir
+            self.progress["value"] = 100
+            timings = data["timings"]
+            self.progress_label.config(text=f"✅ Concluído: {data['elements']} elementos em {timings['total_ms'] / 1000:.1f}s")
+            self.status_var.set(f"Concluído: {job.url}")
+            logger.info(f"Sucesso: {job.output_dir}")
+            self.load_analyses()
+        elif kind == "error":
+            self.progress_label.config(text=f"❌ Falha: {data}")
+            self.status_var.set(f"Falha: {job.url}")
+            messagebox.showerror("Erro", f"❌ Erro em {job.url}:\n{data}")
+        elif kind == "cancelled" and job is self.active_job:
+            self.progress["value"] = 0
+            self.progress_label.config(text="Análise cancelada.")
+            self.status_var.set(f"Cancelada: {job.url}")
+        if kind in ("done", "error", "cancelled") and job is self.active_job:
+            self.cancel_btn.config(state="disabled")
+        self.refresh_queue()
+
+    def on_close(self):
+        # Cancela a análise, espera a thread e fecha o Chrome antes de destruir a janela
+        self.status_var.set("Encerrando...")
+        self.root.update_idletasks()
+        self.worker.close()
+        self.root.destroy()
 
     def quick_login(self):
         """Executa o login rápido adaptativo em uma thread separada"""
@@ -0,0 +1,49 @@
+# tests/test_blob_store.py
+"""BlobStore: hardlinks, coleta de órfãos e a janela de GC_GRACE_SECONDS."""
+import os
+import time
+from src.core import blob_store
+from src.core.blob_store import BlobStore
+
+def _age(path, seconds):
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+def test_gc_keeps_recent_orphans(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    dest = tmp_path / "pagina.png"
+    digest = store.put_bytes(b"png", str(dest))
+    assert os.path.samefile(dest, store.blob_path(digest))
+
+    dest.unlink()
+    assert store.gc() == (0, 0)
+    _age(store.blob_path(digest), blob_store.GC_GRACE_SECONDS + 60)
+    assert store.gc() == (1, 3)
+    assert not os.path.exists(store.blob_path(digest))
+
+def test_put_bytes_survives_blob_collected_before_link(tmp_path, monkeypatch):
+    store = BlobStore(tmp_path / "blobs")
+    digest = store.put_bytes(b"html", str(tmp_path / "a.html"))
+    reuse = store._reuse
+
+    def collected_after_check(found):
+        # gc roda entre a verificação do blob e o hardlink
+        result = reuse(found)
+        os.remove(store.blob_path(found))
+        return result
+
+    monkeypatch.setattr(store, "_reuse", collected_after_check)
+    dest = tmp_path / "b.html"
+    store.put_bytes(b"html", str(dest))
+    assert dest.read_bytes() == b"html"
+    assert os.path.samefile(dest, store.blob_path(digest))
+
+def test_put_file_keeps_content_when_blob_disappears(tmp_path, monkeypatch):
+    store = BlobStore(tmp_path / "blobs")
+    store.put_bytes(b"img", str(tmp_path / "a.png"))
+    path = tmp_path / "b.png"
+    path.write_bytes(b"img")
+    monkeypatch.setattr(store, "_link", lambda digest, dest: False)
+    digest = store.put_file(str(path))
+    assert path.read_bytes() == b"img"
+    assert os.path.exists(store.blob_path(digest))
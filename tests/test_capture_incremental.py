@@ -0,0 +1,47 @@
+# tests/test_capture_incremental.py
+"""capture_page em NDJSON com análise incremental (sem navegador)."""
+import cv2
+import numpy as np
+from src.core.config import Config
+from src.analyzer import scraper
+from src.analyzer.storage import load_structure, save_structure
+
+def _elements(count, tag):
+    return [{"index": i, "tag": tag, "text": f"{tag} {i}", "x": 10, "y": 20 * i, "width": 50, "height": 15,
+             "xpath": f"/html/body/{tag}[{i + 1}]"} for i in range(count)]
+
+class FakeDriver:
+    def get_screenshot_as_png(self):
+        return cv2.imencode(".png", np.full((600, 400, 3), 255, np.uint8))[1].tobytes()
+
+def test_ndjson_full_change_keeps_streamed_structure(tmp_path, monkeypatch):
+    previous_dir = tmp_path / "anterior"
+    previous_dir.mkdir()
+    save_structure(_elements(40, "div"), str(previous_dir), "json")
+    current = _elements(40, "span")
+
+    def fake_extract(driver, url, writer=None, **kwargs):
+        for el in reversed(current):
+            writer.write(el)
+        return writer.close(), "Página"
+
+    class FakeIndex:
+        def latest_for_url(self, url):
+            return {"path": str(previous_dir), "timestamp": "anterior"}
+
+        def record(self, *args, **kwargs):
+            pass
+
+    monkeypatch.setattr(scraper, "extract_structure", fake_extract)
+    monkeypatch.setattr(scraper, "AnalysisIndex", FakeIndex)
+    monkeypatch.setattr(Config, "BLOB_STORE", False)
+
+    output_dir = tmp_path / "atual"
+    capture = scraper.capture_page(FakeDriver(), "https://exemplo.com", str(output_dir),
+                                   storage_format="ndjson", screenshot_mode="viewport", incremental=True)
+    assert capture["change"] == "full"
+    assert list(capture["structure"]) == current
+
+    summary = scraper.finish_analysis(capture)
+    assert summary["elements"] == len(current)
+    assert list(load_structure(str(output_dir))) == current
@@ -0,0 +1,31 @@
+# tests/test_login_detector.py
+"""Agrupamento dos candidatos pelo <form>, inclusive com XPaths de id."""
+from src.automation.login_detector import _form_key, _forms, detect_login_form
+
+def _el(tag, xpath, y, height=40, **attributes):
+    return {"tag": tag, "text": "", "value": "", "attributes": attributes, "x": 100, "y": y,
+            "width": 300, "height": height, "xpath": xpath}
+
+def test_id_xpaths_get_the_enclosing_form():
+    structure = [
+        _el("form", "body/DIV[1]/FORM[1]", 0, height=60),
+        _el("input", '//*[@id="busca"]', 10, type="text", name="login"),
+        _el("form", '//*[@id="entrar"]', 300, height=200),
+        _el("input", '//*[@id="email"]', 310, type="email"),
+        _el("div", '//*[@id="campo-senha"]', 360, height=60),
+        _el("input", '//*[@id="campo-senha"]/INPUT[1]', 370, type="password"),
+        _el("button", '//*[@id="entrar"]/BUTTON[1]', 440, type="submit"),
+        _el("input", "body/DIV[2]/INPUT[1]", 330, type="email"),
+    ]
+    forms = _forms(structure)
+    keys = {el["xpath"]: _form_key(el, forms) for el in structure if el["tag"] != "form"}
+    assert keys['//*[@id="email"]'] == '//*[@id="entrar"]'
+    assert keys['//*[@id="campo-senha"]/INPUT[1]'] == '//*[@id="entrar"]'
+    assert keys['//*[@id="entrar"]/BUTTON[1]'] == '//*[@id="entrar"]'
+    assert keys['//*[@id="busca"]'] == "body/div[1]/form[1]"
+    # Caminho completo sem form: o elemento não está em nenhum
+    assert keys["body/DIV[2]/INPUT[1]"] is None
+
+    detected = detect_login_form(structure)
+    assert detected["form"] == '//*[@id="entrar"]'
+    assert detected["email"][0]["element"]["xpath"] == '//*[@id="email"]'
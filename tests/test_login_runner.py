@@ -0,0 +1,69 @@
+# tests/test_login_runner.py
+"""Escalonamento por domínio do login em lote (sem navegador)."""
+import threading
+import time
+from src.automation import login_runner
+
+class FakePool:
+    def __init__(self, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def acquire(self):
+        return object()
+
+    def release(self, driver, broken=False):
+        pass
+
+class FakeIndex:
+    def ensure_populated(self, base_dir):
+        pass
+
+    def latest(self, domain):
+        return {"domain": domain}
+
+class FakePlans:
+    def resolve(self, analysis):
+        return {"domain": analysis["domain"], "url": f"https://{analysis['domain']}"}
+
+class FakeSessions:
+    def restore(self, *args):
+        return False
+
+    def save(self, *args):
+        pass
+
+def test_per_domain_limit_does_not_idle_workers(tmp_path, monkeypatch):
+    lock = threading.Lock()
+    active, peak = {}, {}
+
+    def fake_execute(driver, plan, account):
+        domain = plan["domain"]
+        with lock:
+            active[domain] = active.get(domain, 0) + 1
+            peak[domain] = max(peak.get(domain, 0), active[domain])
+        time.sleep(0.1 if domain == "lento.com" else 0.02)
+        with lock:
+            active[domain] -= 1
+        return {"ok": True, "signal": "url", "latency_ms": 1, "url": plan["url"], "error": None}
+
+    monkeypatch.setattr(login_runner, "BrowserPool", FakePool)
+    monkeypatch.setattr(login_runner, "AnalysisIndex", FakeIndex)
+    monkeypatch.setattr(login_runner, "LoginPlanStore", FakePlans)
+    monkeypatch.setattr(login_runner, "SessionStore", FakeSessions)
+    monkeypatch.setattr(login_runner, "execute_plan", fake_execute)
+
+    accounts = [{"email": f"{name}{i}@x.com", "password": "p", "domain": f"{name}.com"}
+                for name in ("lento", "rapido") for i in range(6)]
+    summary, _ = login_runner.run_logins(accounts, workers=4, per_domain=2, out_dir=tmp_path)
+
+    assert summary["succeeded"] == len(accounts)
+    assert peak == {"lento.com": 2, "rapido.com": 2}
+    # As contas do domínio rápido não esperam atrás das do lento
+    rapido = [r for r in summary["results"] if r["domain"] == "rapido.com"]
+    assert max(r["wall_ms"] for r in rapido) < 250
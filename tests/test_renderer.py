@@ -0,0 +1,33 @@
+# tests/test_renderer.py
+"""annotate e annotate_bands devem reproduzir annotate_legacy pixel a pixel."""
+import random
+import numpy as np
+import pytest
+from src.analyzer import renderer
+
+def _page(seed, height=600, width=320, count=250):
+    rng = random.Random(seed)
+    img = np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    structure = [{
+        "tag": rng.choice(["a", "div", "span", "button", "h3", "label"]),
+        # Caixas e rótulos saindo pelas quatro bordas, inclusive com tamanho negativo
+        "x": rng.uniform(-60, width + 10),
+        "y": rng.uniform(-30, height + 30),
+        "width": rng.uniform(-20, width),
+        "height": rng.uniform(-10, 80),
+    } for _ in range(count)]
+    return img, structure
+
+@pytest.mark.parametrize("fraction", [0, renderer.DENSE_OUTLINE_FRACTION, 10])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_annotate_matches_legacy(seed, fraction, monkeypatch):
+    monkeypatch.setattr(renderer, "DENSE_OUTLINE_FRACTION", fraction)
+    img, structure = _page(seed)
+    expected = renderer.annotate_legacy(img.copy(), structure)
+    assert np.array_equal(renderer.annotate(img.copy(), structure), expected)
+
+    banded = img.copy()
+    rows = 70
+    renderer.annotate_bands([(top, banded[top:top + rows]) for top in range(0, len(banded), rows)],
+                            structure, len(banded))
+    assert np.array_equal(banded, expected)
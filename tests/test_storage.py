@@ -0,0 +1,43 @@
+# tests/test_storage.py
+"""Estrutura colunar (estrutura.parquet) lida sem montar os dicts."""
+import numpy as np
+from src.analyzer.spatial import SpatialIndex
+from src.analyzer.storage import ColumnarStructure, load_structure, save_structure
+from src.gui.element_table import ElementTableModel
+
+def _structure():
+    structure = []
+    for i, tag in enumerate(["form", "input", "input", "button", "div", "a"] * 5):
+        structure.append({"index": i, "tag": tag, "text": f"texto {i}" if i % 3 else "", "value": "v" if i % 4 == 0 else "",
+                          "attributes": {"id": f"e{i}", "type": "password"} if tag == "input" else {},
+                          "x": i * 7, "y": 12.5 * i, "width": 40, "height": 10 + i % 2,
+                          "xpath": f"/html/body/{tag}[{i + 1}]"})
+    structure[4]["type"] = "link"
+    return structure
+
+def test_parquet_loads_as_columnar_sequence(tmp_path):
+    structure = _structure()
+    save_structure(structure, str(tmp_path), "parquet")
+    loaded = load_structure(str(tmp_path))
+    assert isinstance(loaded, ColumnarStructure)
+    assert loaded == structure and list(loaded) == structure
+    assert loaded[3] == structure[3] and loaded[-1] == structure[-1] and loaded[2:5] == structure[2:5]
+
+def test_tags_filter_keeps_page_order(tmp_path):
+    structure = _structure()
+    expected = [el for el in structure if el["tag"] in ("form", "input")]
+    for fmt in ("json", "parquet"):
+        (tmp_path / fmt).mkdir()
+        save_structure(structure, str(tmp_path / fmt), fmt)
+        assert list(load_structure(str(tmp_path / fmt), tags=("form", "input"))) == expected
+
+def test_table_and_spatial_index_read_frame_columns(tmp_path):
+    structure = _structure()
+    save_structure(structure, str(tmp_path), "parquet")
+    loaded = load_structure(str(tmp_path))
+    from_frame, from_records = ElementTableModel(loaded), ElementTableModel(structure)
+    for name, column in from_records.columns.items():
+        np.testing.assert_array_equal(from_frame.columns[name], column)
+    np.testing.assert_array_equal(from_frame._search, from_records._search)
+    assert from_frame.values(3) == from_records.values(3)
+    assert SpatialIndex(loaded).rects == SpatialIndex(structure).rects